@@ -5,4 +5,4 @@ set -euo pipefail
 : "${OPENAI_API_KEY:?Need to set OPENAI_API_KEY}"
 
 
-uvicorn aura.api.server:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec aura-cli serve --host 0.0.0.0 --port 8000
@@ -0,0 +1,209 @@
+from __future__ import annotations
+import gc, os, signal, socket, sys, tempfile, time, traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from aura.app.config import web_workers, shadow_challengers, scoring_mode
+
+app_path = "aura.api.server:app"
+
+def default_workers() -> int:
+    if web_workers > 0:
+        return web_workers
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def preload() -> Dict[str, Any]:
+    from aura.api import server
+    from aura.app.config import get_threshold_config
+    from aura.models import predict as predict_mod
+    from aura.models.engines import get_engine
+    from aura.rag.index import load_reg_index
+    started = time.perf_counter()
+    get_threshold_config()
+    predict_mod.load_sur()
+    predict_mod.build_attribution()
+    predict_mod.load_percentile_index()
+    if scoring_mode == "compiled":
+        predict_mod.load_compiled_scorer()
+    loaded, skipped = ["surrogate"], {}
+    for name in dict.fromkeys(["lgbm", *shadow_challengers]):
+        try:
+            get_engine(name)
+            loaded.append(name)
+        except Exception as e:
+            skipped[name] = str(e)
+    load_reg_index()
+    gc.collect()
+    gc.freeze()
+    return {"app": server.app, "engines": loaded, "skipped": skipped,
+            "seconds": time.perf_counter() - started}
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def run_worker(app, sock: socket.socket, log_level: str):
+    import uvicorn
+    config = uvicorn.Config(app, lifespan="on", log_level=log_level, access_log=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+def clear_metric_snapshots(directory: str):
+    for path in Path(directory).glob("metrics-*.json"):
+        path.unlink(missing_ok=True)
+
+class Prefork:
+    def __init__(self, host: str = "0.0.0.0", port: int = 8000, workers: Optional[int] = None,
+                 preload_app: bool = True, log_level: str = "info"):
+        self.host, self.port = host, port
+        self.workers = workers or default_workers()
+        self.preload_app = preload_app
+        self.log_level = log_level
+        self.app = None
+        self.children: Dict[int, int] = {}
+        self.stopping = False
+
+    def prepare_metrics(self):
+        from aura.utils import metrics as metrics_mod
+        if not metrics_mod.metrics_dir and self.workers > 1:
+            metrics_mod.metrics_dir = tempfile.mkdtemp(prefix="aura-metrics-")
+        if metrics_mod.metrics_dir:
+            clear_metric_snapshots(metrics_mod.metrics_dir)
+
+    def spawn(self, slot: int, sock: socket.socket):
+        pid = os.fork()
+        if pid:
+            self.children[pid] = slot
+            return
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            app = self.app
+            if app is None:
+                from uvicorn.importer import import_from_string
+                app = import_from_string(app_path)
+            run_worker(app, sock, self.log_level)
+        except BaseException:
+            traceback.print_exc()
+            os._exit(1)
+        os._exit(0)
+
+    def stop(self, *_):
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        self.prepare_metrics()
+        if self.preload_app:
+            info = preload()
+            self.app = info["app"]
+            print(f"Preloaded {', '.join(info['engines'])} in {info['seconds']:.2f}s "
+                  f"(skipped: {sorted(info['skipped']) or 'none'})", flush=True)
+        sock = bind_socket(self.host, self.port)
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for slot in range(self.workers):
+            self.spawn(slot, sock)
+        print(f"Master {os.getpid()} serving on {self.host}:{self.port} with {self.workers} "
+              f"worker(s) ({'preloaded' if self.preload_app else 'independent'})", flush=True)
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = self.children.pop(pid, None)
+            if slot is not None and not self.stopping:
+                print(f"Worker {pid} exited ({status}); respawning", flush=True)
+                time.sleep(0.5)
+                self.spawn(slot, sock)
+        sock.close()
+
+def child_pids(pid: int) -> List[int]:
+    out = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            out.append(int(stat.parent.name))
+    return sorted(out)
+
+def process_memory(pid: int) -> Dict[str, float]:
+    mem = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":", 1)
+        mem[key] = float(value.split()[0]) / 1024.0
+    return {"rss_mb": mem.get("Rss", 0.0), "pss_mb": mem.get("Pss", 0.0),
+            "shared_mb": mem.get("Shared_Clean", 0.0) + mem.get("Shared_Dirty", 0.0),
+            "private_mb": mem.get("Private_Clean", 0.0) + mem.get("Private_Dirty", 0.0)}
+
+def memory_report(master: int) -> Dict[str, Any]:
+    pids = [master, *child_pids(master)]
+    per = {pid: process_memory(pid) for pid in pids}
+    total = {k: sum(m[k] for m in per.values()) for k in ("rss_mb", "pss_mb", "shared_mb", "private_mb")}
+    return {"processes": len(pids), "total": total, "per_process": per}
+
+def wait_healthy(url: str, timeout: float = 120.0):
+    import httpx
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"server at {url} not healthy after {timeout:.0f}s")
+
+def compare_modes(workers: int, port: int = 8765, requests: int = 500, concurrency: int = 16,
+                  endpoint: str = "/predict", settle: float = 2.0) -> Dict[str, Any]:
+    import asyncio, subprocess, httpx
+    from aura.loadtest.loadgen import run_load
+    from aura.models.engines import sample_payloads
+    payloads = sample_payloads(200)
+    url = f"http://127.0.0.1:{port}"
+    report: Dict[str, Any] = {"workers": workers, "endpoint": endpoint, "requests": requests,
+                              "concurrency": concurrency, "modes": {}}
+    for mode in ("preload", "independent"):
+        cmd = [sys.executable, "-m", "aura.app.main", "serve", "--host", "127.0.0.1",
+               "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+        if mode == "independent":
+            cmd.append("--no-preload")
+        started = time.perf_counter()
+        proc = subprocess.Popen(cmd)
+        try:
+            wait_healthy(url)
+            while len(child_pids(proc.pid)) < workers:
+                time.sleep(0.2)
+            time.sleep(settle)
+            ready = time.perf_counter() - started
+            idle = memory_report(proc.pid)
+
+            async def drive():
+                async with httpx.AsyncClient(base_url=url) as client:
+                    return await run_load(client, payloads, endpoint=endpoint,
+                                          concurrency=concurrency, requests=requests)
+            load = asyncio.run(drive())
+            report["modes"][mode] = {"ready_seconds": ready, "idle": idle["total"],
+                                     "loaded": memory_report(proc.pid)["total"],
+                                     "throughput_rps": load["throughput_rps"],
+                                     "latency_ms": load["latency_ms"], "statuses": load["statuses"]}
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+    return report
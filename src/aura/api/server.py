@@ -1,18 +1,43 @@
 from __future__ import annotations
-import traceback
-from typing import Literal, Optional, Dict, Any
-from fastapi import FastAPI, HTTPException, Request
+import asyncio, hmac, json, time, traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Optional, Dict, Any, List
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from contextlib import asynccontextmanager
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 
 from aura.app.config import (
     ui_features,
     validate_ui_payload,
+    batch_chunk_size,
+    batch_max_rows,
+    scoring_workers,
+    llm_concurrency,
+    explain_timeout,
+    explain_workers,
+    explain_queue_max,
+    explain_jobs_path,
+    explain_job_lease,
+    near_threshold_band,
+    admin_token,
     InputError,
 )
-from aura.models.predict import predict_with_explanations
-from aura.explain.explainer import generate_explanation
+from aura.models.predict import save_prediction_log, get_prediction_memo
+from aura.models.engines import engine_loaders, get_engine
+from aura.models.whatif import what_if
+from aura.models.registry import VersionUnavailable, get_model_registry, close_model_registry, scoring_engine
+from aura.explain.explainer import (
+    agenerate_explanation,
+    astream_explanation,
+    get_narrative_cache,
+    init_async_llm,
+    close_async_llm,
+)
+from aura.explain.jobs import ExplanationQueue, JobStore, QueueFull
+from aura.models.shadow import shadow_stats, close_shadow_scorer, submit_shadow
+from aura.utils.audit import audit_stats, close_audit_logs
+from aura.utils.metrics import inc, observe, timer, maybe_flush, flush_snapshot, render_metrics
 
 
 class ApplicantPayload(BaseModel):
@@ -34,8 +59,28 @@ class PredictResponse(BaseModel):
     risk_class: Literal["High","Low"]
     near_threshold_flag: bool
     model_version: str
+    engine: Optional[str] = None
+    prediction_id: Optional[str] = None
     top_local_reasons: Optional[list[dict]] = None
 
+class BatchPayload(BaseModel):
+    applicants: List[Dict[str, Any]] = Field(..., max_length=batch_max_rows,
+                                             description="Raw applicant records")
+    chunk_size: Optional[int] = Field(None, ge=1, le=10000)
+    engine: Optional[str] = Field(None, description="Scoring engine or model version")
+    version: Optional[str] = Field(None, description="Pinned surrogate model version")
+
+class WhatIfPayload(BaseModel):
+    applicant: ApplicantPayload
+    features: Optional[List[str]] = Field(None, description="Features to sweep (default: all)")
+    ranges: Optional[Dict[str, List[float]]] = Field(None, description="Per-feature [min, max, step] overrides")
+    version: Optional[str] = Field(None, description="Pinned surrogate model version")
+
+class FullFeaturePayload(BaseModel):
+    features: Dict[str, Any] = Field(..., description="Model-space features (see lgbm_feature_order.csv)")
+    engine: Optional[str] = Field(None, description="Scoring engine or model version")
+    version: Optional[str] = Field(None, description="Pinned surrogate model version")
+
 class ExplainResponse(BaseModel):
     narrative: str
 
@@ -43,63 +88,196 @@ class PredictExplainResponse(BaseModel):
     prediction: PredictResponse
     explanation: ExplainResponse
 
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+    prediction: PredictResponse
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "done", "failed"]
+    narrative: Optional[str] = None
+    error: Optional[str] = None
+
+def to_predict_response(bundle: Dict[str, Any]) -> PredictResponse:
+    near_flag = abs(bundle["threshold_delta"]) <= bundle["near_threshold_band"]
+    return PredictResponse(
+        prob_default=bundle["prob_default"],
+        threshold=bundle["threshold"],
+        threshold_policy=bundle["threshold_policy"],
+        threshold_delta=bundle["threshold_delta"],
+        risk_class=bundle["risk_class"],
+        near_threshold_flag=near_flag,
+        model_version=bundle["model_version"],
+        engine=bundle.get("engine"),
+        prediction_id=bundle.get("prediction_id"),
+        top_local_reasons=bundle["top_local_shap"]
+    )
+
+scoring_executor = None
+job_queue = None
+
+async def run_scoring(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    submitted = time.perf_counter()
+    def job():
+        observe("aura_stage_seconds", time.perf_counter() - submitted, stage="executor_wait")
+        return fn(*args, **kwargs)
+    return await loop.run_in_executor(scoring_executor, job)
+
+async def score_applicant(cleaned: Dict[str, Any], engine: Optional[str] = None,
+                          version: Optional[str] = None) -> Dict[str, Any]:
+    with scoring_engine(engine, version) as scorer:
+        bundle = await run_scoring(scorer.predict, cleaned, max_reasons=5)
+    save_prediction_log(bundle)
+    return bundle
+
+async def explain_bundle(bundle: Dict[str, Any]) -> str:
+    with timer("explain"):
+        out = await asyncio.wait_for(agenerate_explanation(bundle), timeout=explain_timeout)
+    return out["narrative"]
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global scoring_executor, job_queue
+    scoring_executor = ThreadPoolExecutor(max_workers=scoring_workers,
+                                          thread_name_prefix="aura-score")
+    init_async_llm(llm_concurrency)
+    job_queue = ExplanationQueue(JobStore(explain_jobs_path, lease=explain_job_lease),
+                                 workers=explain_workers, max_pending=explain_queue_max,
+                                 near_band=near_threshold_band)
+    await job_queue.start()
+    registry = get_model_registry()
+    if registry is not None:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, registry.start)
+        except Exception as e:
+            print("Model registry start failed:", e)
     try:
         dummy = {
             "grade": "B", "term": 36,
             "acc_open_past_24mths": 1,
             "dti": 10.0, "fico_mid": 700
         }
-        _ = predict_with_explanations(dummy, max_reasons=5)
+        _ = await run_scoring(get_engine().predict, dummy, max_reasons=5)
     except Exception as e:
         print("Warm-up failed:", e)
+    try:
+        lgbm = get_engine("lgbm")
+        _ = await run_scoring(lgbm.predict_full_batch, lgbm.benchmark_payloads(1), max_reasons=5)
+    except Exception as e:
+        print("LightGBM explainer warm-up skipped:", e)
     yield
+    await job_queue.stop()
+    job_queue.store.close()
+    job_queue = None
+    await close_async_llm()
+    scoring_executor.shutdown(wait=True)
+    scoring_executor = None
+    close_model_registry()
+    close_shadow_scorer()
+    close_audit_logs()
+    flush_snapshot()
 
 app = FastAPI(title="AURA - Autonomous Risk Assessment", version="1.0.0", lifespan=lifespan)
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        observe("aura_request_seconds", time.perf_counter() - start, route=path)
+        inc("aura_requests_total", route=path, method=request.method, status=str(status))
+        maybe_flush()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
+@app.get("/audit/stats")
+def audit_log_stats():
+    return {"logs": audit_stats()}
+
+@app.get("/shadow/stats")
+def shadow_scoring_stats():
+    return shadow_stats() or {"challengers": {}, "enabled": False}
+
+@app.get("/explain/cache")
+def explain_cache_stats():
+    return get_narrative_cache().stats()
+
+@app.get("/predict/cache")
+def predict_cache_stats():
+    return get_prediction_memo().stats()
+
+
 @app.exception_handler(InputError)
 async def input_error_handler(request: Request, exc: InputError):
     return JSONResponse(status_code=422, content={"detail": str(exc)})
 
+@app.exception_handler(VersionUnavailable)
+async def version_unavailable_handler(request: Request, exc: VersionUnavailable):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
 @app.exception_handler(Exception)
 async def generic_error_handler(request: Request, exc: Exception):
     traceback.print_exc()
     return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
+@app.get("/engines")
+def list_engines():
+    out = []
+    for name in engine_loaders:
+        try:
+            out.append(get_engine(name).describe())
+        except (FileNotFoundError, ImportError) as e:
+            out.append({"engine": name, "error": str(e)})
+    return {"default": get_engine().name, "engines": out}
+
 @app.post("/predict", response_model=PredictResponse)
-def predict(payload: ApplicantPayload):
+async def predict(payload: ApplicantPayload, engine: Optional[str] = Query(None),
+                  version: Optional[str] = Query(None)):
     try:
         cleaned = validate_ui_payload(payload.dict(), require_all=True)
     except InputError as e:
         raise HTTPException(status_code=422, detail=str(e))
-    bundle = predict_with_explanations(cleaned, max_reasons=5)
+    bundle = await score_applicant(cleaned, engine, version)
+    return to_predict_response(bundle)
 
-    near_flag = abs(bundle["threshold_delta"]) <= bundle["near_threshold_band"]
-    return PredictResponse(
-        prob_default=bundle["prob_default"],
-        threshold=bundle["threshold"],
-        threshold_policy=bundle["threshold_policy"],
-        threshold_delta=bundle["threshold_delta"],
-        risk_class=bundle["risk_class"],
-        near_threshold_flag=near_flag,
-        model_version=bundle["model_version"],
-        top_local_reasons=bundle["top_local_shap"]
-    )
+@app.post("/predict_full", response_model=PredictResponse)
+async def predict_full(payload: FullFeaturePayload):
+    with scoring_engine(payload.engine, payload.version) as scorer:
+        item = (await run_scoring(scorer.predict_full_batch, [payload.features], max_reasons=5))[0]
+    if "error" in item:
+        raise HTTPException(status_code=422, detail=item["error"])
+    save_prediction_log(item)
+    submit_shadow(payload.features, item, kind="full")
+    return to_predict_response(item)
+
+@app.post("/what_if")
+async def what_if_analysis(payload: WhatIfPayload):
+    cleaned = validate_ui_payload(payload.applicant.dict(), require_all=True)
+    with scoring_engine("surrogate", payload.version) as scorer:
+        return await run_scoring(what_if, cleaned, payload.features, payload.ranges, engine=scorer)
 
 @app.post("/explain", response_model=ExplainResponse)
-def explain(payload: ApplicantPayload):
+async def explain(payload: ApplicantPayload):
     cleaned = validate_ui_payload(payload.dict(), require_all=True)
-    bundle = predict_with_explanations(cleaned, max_reasons=5)
+    bundle = await score_applicant(cleaned)
     try:
-        out = generate_explanation(bundle)
-        return ExplainResponse(narrative=out["narrative"])
+        return ExplainResponse(narrative=await explain_bundle(bundle))
     except Exception:
         fallback = (
             "Explanation unavailable due to a system error. "
@@ -109,30 +287,145 @@ def explain(payload: ApplicantPayload):
         return ExplainResponse(narrative=fallback)
 
 @app.post("/predict_explain", response_model=PredictExplainResponse)
-def predict_explain(payload: ApplicantPayload):
+async def predict_explain(payload: ApplicantPayload, version: Optional[str] = Query(None)):
     cleaned = validate_ui_payload(payload.dict(), require_all=True)
-    bundle = predict_with_explanations(cleaned, max_reasons=5)
+    bundle = await score_applicant(cleaned, version=version)
 
     try:
-        explanation = generate_explanation(bundle)["narrative"]
+        explanation = await explain_bundle(bundle)
     except Exception:
         explanation = (
             "Explanation unavailable due to a system error. "
             "Please review probabilities and factors manually."
         )
 
-    near_flag = abs(bundle["threshold_delta"]) <= bundle["near_threshold_band"]
-    pred_resp = PredictResponse(
-        prob_default=bundle["prob_default"],
-        threshold=bundle["threshold"],
-        threshold_policy=bundle["threshold_policy"],
-        threshold_delta=bundle["threshold_delta"],
-        risk_class=bundle["risk_class"],
-        near_threshold_flag=near_flag,
-        model_version=bundle["model_version"],
-        top_local_reasons=bundle["top_local_shap"]
-    )
     return PredictExplainResponse(
-        prediction=pred_resp,
+        prediction=to_predict_response(bundle),
         explanation=ExplainResponse(narrative=explanation)
-    )
\ No newline at end of file
+    )
+
+@app.post("/explain/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_explain_job(payload: ApplicantPayload):
+    if job_queue is None:
+        raise HTTPException(status_code=503, detail="Explanation queue unavailable")
+    cleaned = validate_ui_payload(payload.dict(), require_all=True)
+    bundle = await score_applicant(cleaned)
+    try:
+        job_id = await job_queue.submit(bundle)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return JobSubmitResponse(job_id=job_id, status="queued",
+                             prediction=to_predict_response(bundle))
+
+@app.get("/explain/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_explain_job(job_id: str):
+    job = await job_queue.get(job_id) if job_queue is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    return JobStatusResponse(job_id=job["job_id"], status=job["status"],
+                             narrative=job["narrative"], error=job["error"])
+
+@app.get("/explain/jobs")
+async def explain_jobs_stats():
+    if job_queue is None:
+        raise HTTPException(status_code=503, detail="Explanation queue unavailable")
+    return job_queue.stats()
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def stream_prediction_explanation(bundle: Dict[str, Any]):
+    yield sse_event("prediction", to_predict_response(bundle).model_dump())
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + explain_timeout
+    events = astream_explanation(bundle)
+    try:
+        while True:
+            remaining = max(0.0, deadline - loop.time())
+            try:
+                item = await asyncio.wait_for(events.__anext__(), timeout=remaining)
+            except StopAsyncIteration:
+                break
+            event = item.pop("event")
+            yield sse_event(event, item)
+    except Exception as e:
+        yield sse_event("done", {
+            "narrative": (
+                "Explanation unavailable due to a system error. "
+                "Please review probabilities and factors manually."
+            ),
+            "cached": False,
+            "error": str(e) or type(e).__name__
+        })
+    finally:
+        await events.aclose()
+
+@app.post("/predict_explain/stream")
+async def predict_explain_stream(payload: ApplicantPayload, version: Optional[str] = Query(None)):
+    cleaned = validate_ui_payload(payload.dict(), require_all=True)
+    bundle = await score_applicant(cleaned, version=version)
+    return StreamingResponse(stream_prediction_explanation(bundle),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def stream_batch(applicants: List[Dict[str, Any]], chunk_size: int, engine: Optional[str] = None,
+                 version: Optional[str] = None):
+    with scoring_engine(engine, version) as scorer:
+        for start in range(0, len(applicants), chunk_size):
+            chunk = applicants[start:start + chunk_size]
+            for item in scorer.predict_batch(chunk, max_reasons=5):
+                index = start + item["index"]
+                if "error" in item:
+                    line = {"index": index, "error": item["error"]}
+                else:
+                    save_prediction_log(item)
+                    line = {"index": index,
+                            "prediction": to_predict_response(item).model_dump()}
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+
+@app.post("/predict_batch")
+def predict_batch(payload: BatchPayload):
+    chunk_size = payload.chunk_size or batch_chunk_size
+    with scoring_engine(payload.engine, payload.version) as scorer:
+        if not scorer.ui_payloads:
+            raise scorer.ui_unsupported()
+    return StreamingResponse(stream_batch(payload.applicants, chunk_size, payload.engine,
+                                          payload.version),
+                             media_type="application/x-ndjson")
+
+def require_admin(token: Optional[str]):
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints disabled (set admin_token)")
+    if not token or not hmac.compare_digest(token, admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+def admin_registry():
+    registry = get_model_registry()
+    if registry is None:
+        raise HTTPException(status_code=404, detail="Model registry disabled (set model_registry_dir)")
+    return registry
+
+@app.get("/admin/models")
+async def admin_models(x_admin_token: Optional[str] = Header(None)):
+    require_admin(x_admin_token)
+    return admin_registry().describe()
+
+@app.post("/admin/models/{version}/load", status_code=202)
+async def admin_load_model(version: str, x_admin_token: Optional[str] = Header(None)):
+    require_admin(x_admin_token)
+    return admin_registry().load(version).describe()
+
+@app.post("/admin/models/{version}/activate")
+async def admin_activate_model(version: str, timeout: float = Query(120.0, gt=0),
+                               x_admin_token: Optional[str] = Header(None)):
+    require_admin(x_admin_token)
+    registry = admin_registry()
+    loop = asyncio.get_running_loop()
+    mv = await loop.run_in_executor(None, lambda: registry.activate(version, timeout=timeout))
+    registry.write_active(version)
+    return mv.describe()
+
+@app.post("/admin/models/{version}/unload")
+async def admin_unload_model(version: str, x_admin_token: Optional[str] = Header(None)):
+    require_admin(x_admin_token)
+    return admin_registry().unload(version).describe()
@@ -2,7 +2,8 @@ from __future__ import annotations
 import os, json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from aura.utils.pathing import REG_INDEX_DIR
 
 model_version = os.getenv("model_version", "v1")
 models_dir = Path(os.getenv("models", "models"))
@@ -10,6 +11,13 @@ sur_path = models_dir / f"surrogate_lr_{model_version}.joblib"
 background_path = models_dir / f"surrogate_background_{model_version}.parquet"
 percentiles_path = models_dir / f"surrogate_percentiles_{model_version}.csv"
 threshold_path = models_dir / f"surrogate_thresholds_{model_version}.json"
+lgbm_path = models_dir / f"lgbm_calibrated_{model_version}.joblib"
+lgbm_feature_order_path = models_dir / "lgbm_feature_order.csv"
+lgbm_shap_path = models_dir / f"shap_topidx_{model_version}.joblib"
+logreg_path = models_dir / f"logreg_{model_version}.joblib"
+woe_encoder_path = models_dir / "woe_encoder.joblib"
+bundle_dir = os.getenv("bundle_dir", "")
+bundle_verify = os.getenv("bundle_verify", "true").lower() == "true"
 default_threshold_value = 0.115
 default_threshold_policy = "profit"
 
@@ -81,7 +89,7 @@ regulation_whitelist = [
     "15 U.S.C. §1681 (FCRA)",
     "12 CFR 1002 (ECOA)"
 ]
-@dataclass
+@dataclass(frozen=True)
 class ThresholdConfig:
     model_version: str
     value: float
@@ -100,12 +108,10 @@ def write_threshold_config(cfg: ThresholdConfig, path: Path = threshold_path):
 
 def load_threshold_config(path: Path = threshold_path) -> ThresholdConfig:
     if not path.exists():
-        cfg = ThresholdConfig(model_version=model_version,
-                              value=default_threshold_value,
-                              policy=default_threshold_policy,
-                              notes="auto-created default threshold")
-        write_threshold_config(cfg, path)
-        return cfg
+        return ThresholdConfig(model_version=model_version,
+                               value=default_threshold_value,
+                               policy=default_threshold_policy,
+                               notes=f"default threshold ({path} not found)")
     data = json.loads(path.read_text())
     missing = [k for k in ("value", "policy") if k not in data]
     if missing:
@@ -124,14 +130,97 @@ def load_threshold_config(path: Path = threshold_path) -> ThresholdConfig:
         notes=data.get("notes")
     )
 
-threshold_cfg = load_threshold_config()
-decision_threshold = threshold_cfg.value
-threshold_policy = threshold_cfg.policy
+threshold_cache: Optional[ThresholdConfig] = None
+
+def get_threshold_config() -> ThresholdConfig:
+    global threshold_cache
+    if threshold_cache is None:
+        threshold_cache = load_threshold_config(Path(bundle_dir) / "thresholds.json" if bundle_dir
+                                                else threshold_path)
+    return threshold_cache
+
+lazy_settings = {
+    "threshold_cfg": lambda: get_threshold_config(),
+    "decision_threshold": lambda: get_threshold_config().value,
+    "threshold_policy": lambda: get_threshold_config().policy,
+}
+
+def __getattr__(name: str) -> Any:
+    if name in lazy_settings:
+        return lazy_settings[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 near_threshold_band = float(os.getenv("near_threshold_band", "0.02"))
+batch_chunk_size = int(os.getenv("batch_chunk_size", "512"))
+batch_max_rows = int(os.getenv("batch_max_rows", "10000"))
+percentile_ecdf = os.getenv("percentile_ecdf", "false").lower() == "true"
+scoring_mode = os.getenv("scoring_mode", "sklearn").lower()
+prediction_cache_size = int(os.getenv("prediction_cache_size", "4096"))
+prediction_cache_check = float(os.getenv("prediction_cache_check", "1.0"))
+narrative_cache_size = int(os.getenv("narrative_cache_size", "1024"))
+narrative_cache_ttl = float(os.getenv("narrative_cache_ttl", "86400"))
+narrative_cache_path = os.getenv("narrative_cache_path", "logs/narrative_cache.sqlite")
+narrative_cache_pd_decimals = int(os.getenv("narrative_cache_pd_decimals", "3"))
+narrative_cache_pct_step = int(os.getenv("narrative_cache_pct_step", "1"))
+llm_timeout = float(os.getenv("llm_timeout", "30"))
+llm_base_url = os.getenv("llm_base_url") or None
+llm_concurrency = int(os.getenv("llm_concurrency", "32"))
+narrative_tiering = os.getenv("narrative_tiering", "true").lower() == "true"
+narrative_llm_band = float(os.getenv("narrative_llm_band", str(near_threshold_band)))
+explain_timeout = float(os.getenv("explain_timeout", "90"))
+explain_workers = int(os.getenv("explain_workers", "4"))
+explain_queue_max = int(os.getenv("explain_queue_max", "1000"))
+explain_jobs_path = os.getenv("explain_jobs_path", "logs/explain_jobs.sqlite")
+explain_job_lease = float(os.getenv("explain_job_lease", "600"))
+default_engine = os.getenv("default_engine", "surrogate").lower()
+lgbm_threshold = float(os.getenv("lgbm_threshold", "0.068"))
+lgbm_threshold_policy = os.getenv("lgbm_threshold_policy", "profit")
+lgbm_num_threads = int(os.getenv("lgbm_num_threads", "1"))
+lgbm_shap_topk = int(os.getenv("lgbm_shap_topk", "0"))
+logreg_threshold = float(os.getenv("logreg_threshold", "0.114"))
+logreg_threshold_policy = os.getenv("logreg_threshold_policy", "profit")
+web_workers = int(os.getenv("web_workers", "0"))
+model_registry_dir = os.getenv("model_registry_dir", "")
+model_registry_poll = float(os.getenv("model_registry_poll", "2.0"))
+admin_token = os.getenv("admin_token", "")
+scoring_workers = int(os.getenv("scoring_workers", str(min(8, os.cpu_count() or 1))))
+prediction_log_path = os.getenv("prediction_log_path", "logs/predictions.log")
+explanation_log_path = os.getenv("explanation_log_path", "logs/explanations.log")
+audit_batch_size = int(os.getenv("audit_batch_size", "256"))
+audit_flush_interval = float(os.getenv("audit_flush_interval", "1.0"))
+audit_max_bytes = int(os.getenv("audit_max_bytes", str(64 * 1024 * 1024)))
+audit_rotate_seconds = float(os.getenv("audit_rotate_seconds", "86400"))
+audit_compression = os.getenv("audit_compression", "gzip").lower()
+audit_fsync = os.getenv("audit_fsync", "batch").lower()
+audit_queue_max = int(os.getenv("audit_queue_max", "100000"))
+audit_max_retries = int(os.getenv("audit_max_retries", "3"))
+audit_retry_delay = float(os.getenv("audit_retry_delay", "0.2"))
+shadow_challengers = [c.strip().lower() for c in os.getenv("shadow_challengers", "").split(",") if c.strip()]
+shadow_log_path = os.getenv("shadow_log_path", "logs/shadow.log")
+shadow_queue_max = int(os.getenv("shadow_queue_max", "1000"))
+shadow_batch_size = int(os.getenv("shadow_batch_size", "64"))
+shadow_sample_rate = float(os.getenv("shadow_sample_rate", "1.0"))
+rag_index_dir = os.getenv("rag_index_dir", str(REG_INDEX_DIR))
+rag_top_k = int(os.getenv("rag_top_k", "3"))
+rag_cache_size = int(os.getenv("rag_cache_size", "1024"))
+rag_snippet_chars = int(os.getenv("rag_snippet_chars", "600"))
+rag_chunk_words = int(os.getenv("rag_chunk_words", "120"))
+rag_chunk_overlap = int(os.getenv("rag_chunk_overlap", "30"))
+rag_index_check = float(os.getenv("rag_index_check", "5.0"))
+metrics_dir = os.getenv("metrics_dir", "")
+metrics_flush_interval = float(os.getenv("metrics_flush_interval", "5"))
 
 valid_grades = set("ABCDEFG")
 valid_terms = {36, 60}
 fico_min, fico_max = 300, 850
+error_messages = {
+    "grade": "Grade must be a letter between A-G. Got '{}'",
+    "term": "Term must be 36 or 60. Got '{}'",
+    "acc_open_past_24mths": "Cannot be negative or non-integer. Got '{}'",
+    "dti": "DTI must be numeric and cannot be negative (ex: 15 or 15.2). Got '{}'",
+    "fico_mid": "FICO must be between 300 and 850. Got '{}'",
+}
+int64_max = 2 ** 63 - 1
 
 class InputError(ValueError):
     pass
@@ -140,43 +229,43 @@ def validate_one(feature: str, raw: Any) -> Any:
     if feature == "grade":
         g = str(raw).strip().upper()
         if g not in valid_grades:
-            raise InputError(f"Grade must be a letter between A-G. Got '{g}'")
+            raise InputError(error_messages["grade"].format(g))
         return g
 
     if feature == "term":
         try:
             n = int(str(raw).strip().split()[0])
         except Exception:
-            raise InputError(f"Term must be 36 or 60. Got '{raw}'")
+            raise InputError(error_messages["term"].format(raw))
         if n not in valid_terms:
-            raise InputError(f"Term must be 36 or 60. Got '{n}'")
+            raise InputError(error_messages["term"].format(n))
         return n
 
     if feature == "acc_open_past_24mths":
         try:
             n = int(raw)
         except Exception:
-            raise InputError(f"Cannot be negative or non-integer. Got '{raw}'")
+            raise InputError(error_messages[feature].format(raw))
         if n < 0:
-            raise InputError(f"Cannot be negative or non-integer. Got '{raw}'")
+            raise InputError(error_messages[feature].format(raw))
         return n
 
     if feature == "dti":
         try:
             d = float(raw)
         except Exception:
-            raise InputError(f"DTI must be numeric and cannot be negative (ex: 15 or 15.2). Got '{raw}'")
+            raise InputError(error_messages["dti"].format(raw))
         if d < 0:
-            raise InputError(f"DTI must be numeric and cannot be negative (ex: 15 or 15.2). Got '{raw}'")
+            raise InputError(error_messages["dti"].format(raw))
         return d
 
     if feature == "fico_mid":
         try:
             f = int(raw)
         except Exception:
-            raise InputError(f"FICO must be between 300 and 850. Got '{raw}'")
+            raise InputError(error_messages["fico_mid"].format(raw))
         if not (fico_min <= f <= fico_max):
-            raise InputError(f"FICO must be between 300 and 850. Got '{raw}'")
+            raise InputError(error_messages["fico_mid"].format(raw))
         return f
 
     raise InputError(f"Unknown feature '{feature}'")
@@ -196,6 +285,169 @@ def validate_ui_payload(data: Dict[str, Any],
         cleaned[k] = validate_one(k, v)
     return cleaned
 
+
+def validate_scalars(feature: str, values):
+    import numpy as np
+    out = np.empty(len(values), dtype=object)
+    errors = np.full(len(values), None, dtype=object)
+    for i, v in enumerate(values):
+        try:
+            out[i] = validate_one(feature, v)
+        except InputError as e:
+            errors[i] = str(e)
+    return out, errors
+
+def validate_strings(feature: str, values):
+    import pandas as pd
+    codes, uniques = pd.factorize(values)
+    out, errors = validate_scalars(feature, uniques)
+    return out[codes], errors[codes]
+
+def format_errors(template: str, values):
+    import numpy as np, pandas as pd
+    if values.dtype.kind not in "iu":
+        return [template.format(v) for v in values.tolist()]
+    codes, uniques = pd.factorize(values)
+    return np.array([template.format(v) for v in uniques.tolist()], dtype=object)[codes]
+
+def validate_numbers(feature: str, values):
+    import numpy as np
+    template = error_messages[feature]
+    n = len(values)
+    integer = feature != "dti"
+    out = np.zeros(n, dtype=np.int64 if integer else float)
+    bad = np.zeros(n, dtype=bool)
+    slow = np.zeros(n, dtype=bool)
+    if values.dtype.kind == "f":
+        if feature == "term":
+            bad[:] = True
+        elif integer:
+            finite = np.isfinite(values)
+            slow = finite & (np.abs(values) > int64_max)
+            ok = finite & ~slow
+            out[ok] = np.trunc(values[ok])
+            bad = ~finite
+        else:
+            out[:] = values
+    else:
+        out[:] = values
+    valid = ~bad & ~slow
+    if feature == "term":
+        bad |= valid & ~np.isin(out, list(valid_terms))
+        errors = np.full(n, None, dtype=object)
+        errors[bad] = format_errors(template, out[bad] if values.dtype.kind != "f" else values[bad])
+    else:
+        if feature == "fico_mid":
+            bad |= valid & ((out < fico_min) | (out > fico_max))
+        else:
+            bad |= valid & (out < 0)
+        errors = np.full(n, None, dtype=object)
+        errors[bad] = format_errors(template, values[bad])
+    if slow.any():
+        idx = np.nonzero(slow)[0]
+        vals, errs = validate_scalars(feature, values[idx].tolist())
+        out = out.astype(object)
+        out[idx], errors[idx] = vals, errs
+    return out, errors
+
+def validate_column(feature: str, values):
+    import numpy as np
+    if feature != "grade" and (values.dtype.kind in "if" or
+                               (values.dtype.kind == "u" and (not len(values) or values.max() <= int64_max))):
+        return validate_numbers(feature, values)
+    values = np.asarray(values, dtype=object)
+    n = len(values)
+    out = np.empty(n, dtype=object)
+    errors = np.full(n, None, dtype=object)
+    kinds = np.frompyfunc(type, 1, 1)(values)
+    rest = np.ones(n, dtype=bool)
+    idx = np.nonzero(kinds == str)[0]
+    if len(idx):
+        out[idx], errors[idx] = validate_strings(feature, values[idx])
+        rest[idx] = False
+    if feature != "grade":
+        idx = np.nonzero(kinds == int)[0]
+        if len(idx):
+            fits = ((values[idx] >= -int64_max) & (values[idx] <= int64_max)).astype(bool)
+            idx = idx[fits]
+            out[idx], errors[idx] = validate_numbers(feature, values[idx].astype(np.int64))
+            rest[idx] = False
+        idx = np.nonzero(kinds == float)[0]
+        if len(idx):
+            out[idx], errors[idx] = validate_numbers(feature, values[idx].astype(float))
+            rest[idx] = False
+    idx = np.nonzero(kinds == type(None))[0]
+    if len(idx):
+        v, e = validate_scalars(feature, [None])
+        out[idx], errors[idx] = v[0], e[0]
+        rest[idx] = False
+    idx = np.nonzero(rest)[0]
+    if len(idx):
+        out[idx], errors[idx] = validate_scalars(feature, values[idx])
+    return out, errors
+
+def validate_frame(frame, allow_extra: bool = False):
+    import numpy as np, pandas as pd
+    df = frame if isinstance(frame, pd.DataFrame) else pd.DataFrame(frame)
+    n = len(df)
+    missing = [f for f in ui_features if f not in df.columns]
+    extra = [] if allow_extra else [k for k in df.columns if k not in ui_features]
+    ok = np.ones(n, dtype=bool)
+    columns: Dict[str, Any] = {}
+    rows, fields, messages = [], [], []
+    for f in [*ui_features, *extra]:
+        if f in missing or f in extra:
+            errors = np.full(n, f"Missing required features: {missing}" if f in missing
+                             else f"Unexpected feature '{f}'", dtype=object)
+        else:
+            values = df[f].to_numpy()
+            columns[f], errors = validate_column(f, values if values.dtype != object
+                                                 else np.asarray(values, dtype=object))
+        failed = np.nonzero(errors != None)[0]
+        ok[failed] = False
+        rows.append(failed)
+        fields.append(np.full(len(failed), f, dtype=object))
+        messages.append(errors[failed])
+    order = np.argsort(np.concatenate(rows), kind="stable")
+    report = pd.DataFrame({
+        "row": df.index.to_numpy()[np.concatenate(rows)[order]],
+        "field": np.concatenate(fields)[order],
+        "error": np.concatenate(messages)[order],
+    })
+    clean = pd.DataFrame({f: pd.Series(columns[f][ok], index=df.index[ok]).infer_objects()
+                          for f in ui_features if f in columns},
+                         index=df.index[ok], columns=ui_features)
+    return clean, report
+
+
+def validate_batch(records: List[Dict[str, Any]]
+                   ) -> Tuple[List[Optional[Dict[str, Any]]], List[Optional[str]]]:
+    import pandas as pd
+    n = len(records)
+    errors: List[Optional[str]] = [None] * n
+    expected = set(ui_features)
+    for i, rec in enumerate(records):
+        if not isinstance(rec, dict):
+            errors[i] = "Applicant must be a JSON object"
+        elif rec.keys() != expected:
+            missing = [f for f in ui_features if f not in rec]
+            extra = [k for k in rec if k not in expected]
+            errors[i] = (f"Missing required features: {missing}" if missing
+                         else f"Unexpected feature '{extra[0]}'")
+    cleaned: List[Optional[Dict[str, Any]]] = [None] * n
+    shaped = [i for i in range(n) if errors[i] is None]
+    if not shaped:
+        return cleaned, errors
+    clean, report = validate_frame(pd.DataFrame(
+        {f: pd.Series([records[i][f] for i in shaped], index=shaped, dtype=object)
+         for f in ui_features}))
+    first = report.drop_duplicates("row")
+    for i, msg in zip(first["row"].tolist(), first["error"].tolist()):
+        errors[i] = msg
+    for i, row in zip(clean.index.tolist(), clean.to_dict(orient="records")):
+        cleaned[i] = row
+    return cleaned, errors
+
 __all__ = [
     "model_version",
     "models_dir",
@@ -203,17 +455,85 @@ __all__ = [
     "background_path",
     "percentiles_path",
     "threshold_path",
+    "lgbm_path",
+    "lgbm_feature_order_path",
+    "lgbm_shap_path",
+    "logreg_path",
+    "woe_encoder_path",
+    "bundle_dir",
+    "bundle_verify",
     "ui_features",
     "user_friendly",
     "regulation_whitelist",
     "ThresholdConfig",
     "load_threshold_config",
     "write_threshold_config",
+    "get_threshold_config",
     "threshold_cfg",
     "decision_threshold",
     "threshold_policy",
     "near_threshold_band",
+    "batch_chunk_size",
+    "batch_max_rows",
+    "percentile_ecdf",
+    "scoring_mode",
+    "prediction_cache_size",
+    "prediction_cache_check",
+    "narrative_cache_size",
+    "narrative_cache_ttl",
+    "narrative_cache_path",
+    "narrative_cache_pd_decimals",
+    "narrative_cache_pct_step",
+    "llm_timeout",
+    "llm_base_url",
+    "llm_concurrency",
+    "narrative_tiering",
+    "narrative_llm_band",
+    "explain_timeout",
+    "default_engine",
+    "lgbm_threshold",
+    "lgbm_threshold_policy",
+    "lgbm_num_threads",
+    "lgbm_shap_topk",
+    "logreg_threshold",
+    "logreg_threshold_policy",
+    "scoring_workers",
+    "web_workers",
+    "model_registry_dir",
+    "model_registry_poll",
+    "admin_token",
+    "explain_workers",
+    "explain_queue_max",
+    "explain_jobs_path",
+    "explain_job_lease",
+    "prediction_log_path",
+    "explanation_log_path",
+    "audit_batch_size",
+    "audit_flush_interval",
+    "audit_max_bytes",
+    "audit_rotate_seconds",
+    "audit_compression",
+    "audit_fsync",
+    "audit_queue_max",
+    "audit_max_retries",
+    "audit_retry_delay",
+    "shadow_challengers",
+    "shadow_log_path",
+    "shadow_queue_max",
+    "shadow_batch_size",
+    "shadow_sample_rate",
+    "rag_index_dir",
+    "rag_top_k",
+    "rag_cache_size",
+    "rag_snippet_chars",
+    "rag_chunk_words",
+    "rag_chunk_overlap",
+    "rag_index_check",
+    "metrics_dir",
+    "metrics_flush_interval",
     "validate_ui_payload",
+    "validate_frame",
+    "validate_batch",
     "validate_one",
     "InputError"
 ]
\ No newline at end of file
@@ -3,9 +3,8 @@ import os, json, argparse, sys
 from rich import print as rprint
 from rich.console import Console
 from rich.panel import Panel
-from aura.app.config import ui_features, user_friendly, decision_threshold, validate_one, validate_ui_payload, InputError, near_threshold_band
-from aura.models.predict import predict_with_explanations, save_prediction_log
-from aura.explain.explainer import generate_explanation
+from aura.app.config import ui_features, user_friendly, validate_one, validate_ui_payload, InputError, near_threshold_band, batch_chunk_size, rag_index_dir, rag_chunk_words, rag_chunk_overlap, models_dir, model_version
+from aura.utils.pathing import REG_DOCS_DIR
 
 console = Console()
 quit_hint_printed = False  
@@ -63,12 +62,234 @@ def collect_applicant():
     payload = {f: prompt_input(f) for f in ui_features}
     return validate_ui_payload(payload, require_all=True)
 
+def score_command(args):
+    from aura.models.bulk import score_file
+    try:
+        stats = score_file(args.input, args.output, chunk_size=args.chunk_size,
+                           workers=args.workers, max_reasons=args.max_reasons)
+    except (FileNotFoundError, ValueError) as e:
+        rprint(f"[red]Scoring failed: {e}")
+        sys.exit(2)
+    rprint(f"[green]Scored {stats['rows']} rows in {stats['chunks']} chunks "
+           f"({stats['errors']} invalid) -> {args.output}")
+
+def bench_engines_command(args):
+    from aura.models.engines import benchmark_engine, get_engine, sample_payloads
+    payloads = sample_payloads(args.rows)
+    rows = []
+    for name in args.engines:
+        try:
+            rows.append(benchmark_engine(get_engine(name), payloads, batch_size=args.batch_size))
+        except (FileNotFoundError, InputError) as e:
+            rprint(f"[red]Skipping engine '{name}': {e}")
+    if args.json_out:
+        print(json.dumps(rows, indent=2))
+        return
+    for r in rows:
+        rprint(f"[bold]{r['engine']}[/bold] ({r['model_version']}, {r['n_features']} features): "
+               f"single p50 {r['single_p50_ms']:.2f} ms, p95 {r['single_p95_ms']:.2f} ms; "
+               f"batch[{r['batch_size']}] {r['batch_rows_per_s']:,.0f} rows/s")
+
+def bench_command(args):
+    from aura.models.bench import run_benchmarks, compare_to_baseline, load_results, write_results
+    results = run_benchmarks(sizes=args.sizes, cases=args.cases, budget=args.budget)
+    comparison = []
+    if args.baseline:
+        comparison = compare_to_baseline(results, load_results(args.baseline), args.tolerance)
+        results["comparison"] = comparison
+    if args.out:
+        write_results(results, args.out)
+    if args.json_out:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results["results"]:
+            rprint(f"[bold]{r['case']}[/bold] n={r['batch_size']}: p50 {r['p50_ms']:.3f} ms, "
+                   f"p95 {r['p95_ms']:.3f} ms, p99 {r['p99_ms']:.3f} ms, "
+                   f"{r['rows_per_s']:,.0f} rows/s, peak {r['peak_mem_mb']:.1f} MB")
+        for c in comparison:
+            color = "red" if c["regression"] else "green"
+            rprint(f"[{color}]{c['case']} n={c['batch_size']}: p50 x{c['p50_ratio']:.2f} "
+                   f"vs baseline ({c['baseline_p50_ms']:.3f} -> {c['p50_ms']:.3f} ms)")
+    if args.fail_on_regression and any(c["regression"] for c in comparison):
+        sys.exit(1)
+
+def rag_index_command(args):
+    from aura.rag.index import build_index
+    try:
+        manifest = build_index(args.docs, args.out, chunk_words=args.chunk_words,
+                               overlap=args.overlap)
+    except (FileNotFoundError, ValueError) as e:
+        rprint(f"[red]Indexing failed: {e}")
+        sys.exit(2)
+    rprint(f"[green]Indexed {manifest['n_passages']} passages from "
+           f"{len(manifest['sources'])} documents ({manifest['n_terms']} terms) -> {args.out}")
+
+def bundle_command(args):
+    from aura.models.artifacts import build_bundle, load_bundle
+    try:
+        if args.verify:
+            bundle = load_bundle(args.out, verify=True)
+            rprint(f"[green]Bundle {args.out} OK ({len(bundle.manifest['files'])} files verified)")
+            return
+        manifest = build_bundle(args.out)
+    except (FileNotFoundError, ValueError) as e:
+        rprint(f"[red]Bundle failed: {e}")
+        sys.exit(2)
+    size = sum(f["bytes"] for f in manifest["files"].values())
+    rprint(f"[green]Wrote {manifest['format']} ({len(manifest['files'])} files, {size / 1e3:,.0f} kB) "
+           f"-> {args.out}. Serve it with bundle_dir={args.out}")
+
+def serve_command(args):
+    from aura.api.prefork import Prefork
+    Prefork(host=args.host, port=args.port, workers=args.workers,
+            preload_app=not args.no_preload, log_level=args.log_level).run()
+
+def serve_report_command(args):
+    from aura.api.prefork import compare_modes
+    report = compare_modes(args.workers, port=args.port, requests=args.requests,
+                           concurrency=args.concurrency, endpoint=args.endpoint)
+    if args.json_out:
+        print(json.dumps(report, indent=2))
+        return
+    for mode, r in report["modes"].items():
+        idle, loaded = r["idle"], r["loaded"]
+        rprint(f"[bold]{mode}[/bold] ({report['workers']} workers): ready in {r['ready_seconds']:.1f}s, "
+               f"PSS {idle['pss_mb']:.0f} MB idle / {loaded['pss_mb']:.0f} MB after load "
+               f"(RSS {loaded['rss_mb']:.0f} MB, private {loaded['private_mb']:.0f} MB), "
+               f"{r['throughput_rps']:.0f} req/s, p95 {r['latency_ms']['p95']:.1f} ms")
+
+def fake_llm_command(args):
+    import uvicorn
+    from aura.loadtest.fake_llm import FakeLLMConfig, create_fake_llm_app
+    config = FakeLLMConfig(latency_ms=args.latency_ms, latency_dist=args.latency_dist,
+                           latency_sigma=args.latency_sigma, error_rate=args.error_rate,
+                           malformed_rate=args.malformed_rate, seed=args.seed)
+    rprint(f"[green]Fake LLM on http://{args.host}:{args.port}/v1 "
+           f"(set llm_base_url to this and OPENAI_API_KEY to any value)")
+    uvicorn.run(create_fake_llm_app(config), host=args.host, port=args.port, log_level="warning")
+
+def loadtest_command(args):
+    import asyncio, httpx
+    from aura.loadtest.loadgen import run_load
+    from aura.models.engines import sample_payloads
+    payloads = sample_payloads(args.payloads)
+    async def run():
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=args.url, limits=limits) as client:
+            return await run_load(client, payloads, endpoint=args.endpoint, rps=args.rps,
+                                  concurrency=args.concurrency, duration=args.duration,
+                                  requests=args.requests)
+    report = asyncio.run(run())
+    if args.json_out:
+        print(json.dumps(report, indent=2))
+        return
+    lat, server = report["latency_ms"], report["server"]
+    rprint(f"[bold]{report['endpoint']}[/bold]: {report['completed']} requests in "
+           f"{report['wall_seconds']:.1f}s -> {report['throughput_rps']:.1f} req/s, "
+           f"p50 {lat['p50']:.1f} ms, p95 {lat['p95']:.1f} ms, p99 {lat['p99']:.1f} ms")
+    rprint(f"statuses {report['statuses']}, error rate {report['error_rate']:.1%}, "
+           f"fallback rate {report['fallback_rate']:.1%}")
+    wait = server["executor_wait"]
+    if wait.get("calls"):
+        rprint(f"threadpool: {wait['calls']} jobs, mean wait {wait['mean_ms']:.2f} ms, "
+               f"p95 <= {wait['p95_le_ms']:.1f} ms, {wait['queued_fraction']:.1%} queued >= 1 ms")
+    rprint(f"llm calls {server['llm_calls']:.0f}, retries {server['llm_retries']:.0f}, "
+           f"fallbacks {server['llm_fallbacks']:.0f}")
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--json", type=str, help="JSON payload for applicant")
-    parser.add_argument("--no-llm", action="store_true", help="Skip LLM explanation")
+    parser.add_argument("--no-llm", action="store_true", help="Use the template narrative instead of the LLM")
+    sub = parser.add_subparsers(dest="command")
+    score = sub.add_parser("score", help="Bulk-score a CSV/Parquet file into Parquet")
+    score.add_argument("--input", required=True, help="Applicants (.csv or .parquet)")
+    score.add_argument("--output", required=True, help="Scored output (.parquet)")
+    score.add_argument("--chunk-size", type=int, default=batch_chunk_size)
+    score.add_argument("--workers", type=int, default=None, help="Scoring processes (default: CPU count)")
+    score.add_argument("--max-reasons", type=int, default=5)
+    bench = sub.add_parser("bench-engines", help="Compare latency/throughput of scoring engines")
+    bench.add_argument("--engines", nargs="+", default=["surrogate", "lgbm"])
+    bench.add_argument("--rows", type=int, default=2000)
+    bench.add_argument("--batch-size", type=int, default=512)
+    bench.add_argument("--json-out", action="store_true", help="Print results as JSON")
+    bench_all = sub.add_parser("bench", help="Microbenchmark the scoring/explanation hot paths")
+    bench_all.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000, 100000])
+    bench_all.add_argument("--cases", nargs="+", default=None, help="Subset of cases to run")
+    bench_all.add_argument("--budget", type=float, default=2.0, help="Seconds per case/size")
+    bench_all.add_argument("--out", default=None, help="Write results JSON here")
+    bench_all.add_argument("--baseline", default=None, help="Compare against a stored results JSON")
+    bench_all.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown ratio")
+    bench_all.add_argument("--fail-on-regression", action="store_true")
+    bench_all.add_argument("--json-out", action="store_true", help="Print results as JSON")
+    rag = sub.add_parser("rag-index", help="Build the offline regulation retrieval index")
+    rag.add_argument("--docs", default=str(REG_DOCS_DIR), help="Directory of .txt/.md documents")
+    rag.add_argument("--out", default=rag_index_dir, help="Index output directory")
+    rag.add_argument("--chunk-words", type=int, default=rag_chunk_words)
+    rag.add_argument("--overlap", type=int, default=rag_chunk_overlap)
+    bundle = sub.add_parser("bundle", help="Build (or verify) the versioned artifact bundle from models/")
+    bundle.add_argument("--out", default=str(models_dir / f"aura-bundle-{model_version}"), help="Bundle directory")
+    bundle.add_argument("--verify", action="store_true", help="Check an existing bundle's checksums")
+    serve = sub.add_parser("serve", help="Run the API with preforked workers sharing preloaded models")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--workers", type=int, default=None, help="Worker processes (default: web_workers or CPU count)")
+    serve.add_argument("--no-preload", action="store_true", help="Fork before loading (independent workers)")
+    serve.add_argument("--log-level", default="info")
+    report = sub.add_parser("serve-report", help="Compare memory/throughput of preloaded vs independent workers")
+    report.add_argument("--workers", type=int, default=4)
+    report.add_argument("--port", type=int, default=8765)
+    report.add_argument("--requests", type=int, default=500)
+    report.add_argument("--concurrency", type=int, default=16)
+    report.add_argument("--endpoint", default="/predict")
+    report.add_argument("--json-out", action="store_true", help="Print results as JSON")
+    fake = sub.add_parser("fake-llm", help="Serve a local OpenAI-compatible stand-in for load tests")
+    fake.add_argument("--host", default="127.0.0.1")
+    fake.add_argument("--port", type=int, default=8100)
+    fake.add_argument("--latency-ms", type=float, default=800.0, help="Median response latency")
+    fake.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    fake.add_argument("--latency-sigma", type=float, default=0.5)
+    fake.add_argument("--error-rate", type=float, default=0.0, help="Fraction answered with 503")
+    fake.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction answered with raw JSON")
+    fake.add_argument("--seed", type=int, default=None)
+    load = sub.add_parser("loadtest", help="Drive a running API at a target rate/concurrency")
+    load.add_argument("--url", default="http://127.0.0.1:8000")
+    load.add_argument("--endpoint", default="/predict_explain")
+    load.add_argument("--rps", type=float, default=None, help="Open-loop arrival rate (default: closed loop)")
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    load.add_argument("--requests", type=int, default=None, help="Stop after N requests instead")
+    load.add_argument("--payloads", type=int, default=200, help="Distinct sample applicants")
+    load.add_argument("--json-out", action="store_true", help="Print results as JSON")
     args = parser.parse_args()
 
+    if args.command == "score":
+        score_command(args)
+        return
+    if args.command == "bench-engines":
+        bench_engines_command(args)
+        return
+    if args.command == "bench":
+        bench_command(args)
+        return
+    if args.command == "rag-index":
+        rag_index_command(args)
+        return
+    if args.command == "bundle":
+        bundle_command(args)
+        return
+    if args.command == "serve":
+        serve_command(args)
+        return
+    if args.command == "serve-report":
+        serve_report_command(args)
+        return
+    if args.command == "fake-llm":
+        fake_llm_command(args)
+        return
+    if args.command == "loadtest":
+        loadtest_command(args)
+        return
+
     if args.json:
         try:
             applicant = json.loads(args.json)
@@ -78,6 +299,7 @@ def main():
     else:
         applicant = collect_applicant()
 
+    from aura.models.predict import predict_with_explanations, save_prediction_log
     try:
         pred_bundle = predict_with_explanations(applicant, max_reasons=5)
     except Exception as e:
@@ -98,9 +320,12 @@ def main():
     console.print(Panel(details, title=header, border_style=risk_color))
 
     if args.no_llm:
-        rprint("[yellow]LLM explanation skipped (--no-llm).")
+        from aura.explain.template import render_narrative
+        rprint("\n[bold cyan]Explanation[/bold cyan] [yellow](template, --no-llm)")
+        rprint(render_narrative(pred_bundle))
         return
 
+    from aura.explain.explainer import generate_explanation
     explanation = generate_explanation(pred_bundle)
     rprint("\n[bold cyan]Explanation[/bold cyan]")
     rprint(explanation["narrative"])
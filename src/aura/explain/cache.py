@@ -0,0 +1,122 @@
+from __future__ import annotations
+import hashlib, json, os, sqlite3, threading, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+class NarrativeCache:
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 86400.0,
+                 db_path: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = Path(db_path) if db_path else None
+        self._mem: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS narratives ("
+                         "key TEXT PRIMARY KEY, narrative TEXT NOT NULL, created_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS narratives_created_at ON narratives (created_at)")
+            conn.commit()
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _remember(self, key: str, created_at: float, narrative: str):
+        self._mem[key] = (created_at, narrative)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                if now - item[0] <= self.ttl_seconds:
+                    self._mem.move_to_end(key)
+                    self.hits += 1
+                    return item[1]
+                del self._mem[key]
+                self.expirations += 1
+            db = self._db()
+            if db is not None:
+                row = db.execute("SELECT narrative, created_at FROM narratives WHERE key = ?",
+                                 (key,)).fetchone()
+                if row is not None and now - row[1] <= self.ttl_seconds:
+                    self._remember(key, row[1], row[0])
+                    self.disk_hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, narrative: str):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, narrative)
+            db = self._db()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO narratives (key, narrative, created_at) "
+                           "VALUES (?, ?, ?)", (key, narrative, now))
+                db.execute("DELETE FROM narratives WHERE created_at < ?",
+                           (now - self.ttl_seconds,))
+                db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            db = self._db()
+            if db is not None:
+                db.execute("DELETE FROM narratives")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._mem),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "persistent": self.db_path is not None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+def normalize_payload(payload: Dict[str, Any], pd_decimals: int = 3,
+                      pct_step: int = 1) -> Dict[str, Any]:
+    norm = {k: v for k, v in payload.items() if k != "generated_at"}
+    for k in ("prob_default", "threshold", "threshold_delta"):
+        if isinstance(norm.get(k), (int, float)):
+            norm[k] = round(float(norm[k]), pd_decimals)
+    factors = []
+    for f in norm.get("factors", []):
+        f = dict(f)
+        pct = f.get("percentile")
+        if isinstance(pct, (int, float)) and pct_step > 1:
+            f["percentile"] = int(round(pct / pct_step) * pct_step)
+        factors.append(f)
+    norm["factors"] = factors
+    return norm
+
+def cache_key(payload: Dict[str, Any], salt: str = "", pd_decimals: int = 3,
+              pct_step: int = 1) -> str:
+    norm = normalize_payload(payload, pd_decimals=pd_decimals, pct_step=pct_step)
+    blob = json.dumps(norm, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256((salt + "\n" + blob).encode("utf-8")).hexdigest()
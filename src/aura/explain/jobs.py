@@ -0,0 +1,197 @@
+from __future__ import annotations
+import asyncio, itertools, json, os, sqlite3, threading, time, uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from aura.explain.explainer import agenerate_explanation
+
+class QueueFull(RuntimeError):
+    pass
+
+def pid_alive(pid: Optional[int]) -> bool:
+    if not pid or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobStore:
+    def __init__(self, path: Path, lease: float = 600.0):
+        self.path = Path(path)
+        self.lease = lease
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, priority INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, bundle TEXT NOT NULL, "
+            "narrative TEXT, error TEXT, owner INTEGER, lease_until REAL)")
+        cols = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for col, kind in (("owner", "INTEGER"), ("lease_until", "REAL")):
+            if col not in cols:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {kind}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+        self._conn.commit()
+
+    def insert(self, job_id: str, priority: int, bundle: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, created_at, updated_at, bundle) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, priority, now, now, json.dumps(bundle, default=str)))
+            self._conn.commit()
+
+    def update(self, job_id: str, status: str, narrative: Optional[str] = None,
+               error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, narrative = COALESCE(?, narrative), "
+                "error = COALESCE(?, error), updated_at = ? WHERE id = ?",
+                (status, narrative, error, time.time(), job_id))
+            self._conn.commit()
+
+    def claim(self, job_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (os.getpid(), now + self.lease, now, job_id))
+            self._conn.commit()
+        return self.get(job_id, with_bundle=True) if cur.rowcount == 1 else None
+
+    def get(self, job_id: str, with_bundle: bool = False) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, priority, created_at, updated_at, narrative, error, bundle "
+                "FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {"job_id": row[0], "status": row[1], "priority": row[2],
+               "created_at": row[3], "updated_at": row[4],
+               "narrative": row[5], "error": row[6]}
+        if with_bundle:
+            job["bundle"] = json.loads(row[7])
+        return job
+
+    def requeue_incomplete(self) -> List[tuple]:
+        now = time.time()
+        with self._lock:
+            running = self._conn.execute(
+                "SELECT id, owner, lease_until FROM jobs WHERE status = 'running'").fetchall()
+            for job_id, owner, lease_until in running:
+                if pid_alive(owner) and lease_until is not None and lease_until > now:
+                    continue
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', owner = NULL, lease_until = NULL, "
+                    "updated_at = ? WHERE id = ? AND status = 'running' AND owner IS ?",
+                    (now, job_id, owner))
+            self._conn.commit()
+            return self._conn.execute(
+                "SELECT id, priority FROM jobs WHERE status = 'queued' "
+                "ORDER BY priority, created_at").fetchall()
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: n for status, n in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class ExplanationQueue:
+    def __init__(self, store: JobStore, workers: int = 4, max_pending: int = 1000,
+                 near_band: float = 0.02):
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self.near_band = near_band
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._seq = itertools.count()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def priority(self, bundle: Dict[str, Any]) -> int:
+        band = bundle.get("near_threshold_band", self.near_band)
+        return 0 if abs(bundle["threshold_delta"]) <= band else 1
+
+    async def call(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: fn(*args, **kwargs))
+
+    async def start(self):
+        self._queue = asyncio.PriorityQueue()
+        for job_id, priority in await self.call(self.store.requeue_incomplete):
+            self._queue.put_nowait((priority, next(self._seq), job_id))
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, bundle: Dict[str, Any]) -> str:
+        if self._queue is None:
+            raise RuntimeError("Explanation queue is not running")
+        if self.pending() >= self.max_pending:
+            self.rejected += 1
+            raise QueueFull(f"Explanation queue is full ({self.max_pending} pending)")
+        job_id = uuid.uuid4().hex
+        priority = self.priority(bundle)
+        await self.call(self.store.insert, job_id, priority, bundle)
+        self._queue.put_nowait((priority, next(self._seq), job_id))
+        return job_id
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                job = await self.call(self.store.claim, job_id)
+                if job is None:
+                    continue
+                out = await agenerate_explanation(job["bundle"])
+                if out.get("error"):
+                    self.failed += 1
+                    await self.call(self.store.update, job_id, "failed",
+                                    narrative=out["narrative"], error=out["error"])
+                else:
+                    self.completed += 1
+                    await self.call(self.store.update, job_id, "done", narrative=out["narrative"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                await self.call(self.store.update, job_id, "failed", error=str(e))
+            finally:
+                self._queue.task_done()
+
+    async def join(self):
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.call(self.store.get, job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending(),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "by_status": self.store.counts()
+        }
@@ -0,0 +1,72 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+from aura.app.config import regulation_whitelist
+
+factor_labels = {"grade_term": "Loan Grade and Term"}
+review_sentence = "A human credit officer must review before any final decision."
+
+def citations(risk_class: str) -> List[str]:
+    picked = [r for r in regulation_whitelist if r.startswith("Equal Credit Opportunity Act")]
+    if risk_class == "High":
+        picked += [r for r in regulation_whitelist if r.startswith("Adverse Action")]
+    return picked or regulation_whitelist[:1]
+
+def format_value(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:,.2f}".rstrip("0").rstrip(".")
+    return str(value)
+
+def ordinal(n: int) -> str:
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+def factor_line(reason: Dict[str, Any], raw: Dict[str, Any]) -> str:
+    key = reason.get("raw_feature_key") or reason.get("feature")
+    label = factor_labels.get(key, reason.get("feature") or key)
+    if key == "grade_term" and "grade" in raw and "term" in raw:
+        value = f"grade {raw['grade']}, {raw['term']}-month term"
+    else:
+        value = format_value(reason.get("applicant_value"))
+    details = [value]
+    if reason.get("percentile") is not None:
+        details.append(f"{ordinal(int(reason['percentile']))} pct")
+    direction = reason.get("direction") or ""
+    if direction:
+        details.append(direction)
+    if reason.get("magnitude"):
+        details.append(f"{reason['magnitude']} magnitude")
+    effect = ("is associated with higher estimated default risk" if direction.startswith("↑")
+              else "is associated with lower estimated default risk" if direction.startswith("↓")
+              else "contributes to the estimate")
+    return f"- **{label}**: {', '.join(details)}. This factor {effect} for this applicant."
+
+def render_narrative(pred_bundle: Dict[str, Any]) -> str:
+    prob = pred_bundle["prob_default"]
+    thr = pred_bundle["threshold"]
+    delta = pred_bundle["threshold_delta"]
+    risk = pred_bundle["risk_class"]
+    band = pred_bundle.get("near_threshold_band", 0.0)
+    side = "above" if delta >= 0 else "below"
+    opening = (
+        f"The estimated probability of default is {prob:.1%} against a decision threshold of "
+        f"{thr:.1%} ({pred_bundle.get('threshold_policy')} policy), {abs(delta) * 100:.1f} pp {side} "
+        f"the threshold, so the applicant is classified as **{risk}** risk."
+    )
+    if abs(delta) <= band:
+        opening += f" Decision is within ±{band * 100:g} pp of threshold (borderline)."
+    else:
+        opening += " The estimate is clear of the borderline band around the threshold."
+    raw = pred_bundle.get("raw_input") or {}
+    lines = [factor_line(r, raw) for r in pred_bundle.get("top_local_shap") or []]
+    factors = ("Key factors, in order of contribution:\n" + "\n".join(lines) if lines
+               else "No factor attributions were available for this prediction.")
+    regulation = " ".join(f"This assessment complies with [{c}]." for c in citations(risk))
+    steps = "Recommended next steps: verify the reported inputs against source documentation"
+    steps += (" and confirm the principal factors above are reflected in any adverse action notice."
+              if risk == "High" else " and retain this explanation with the decision record.")
+    limitation = (
+        "This explanation reflects only the model inputs listed above; the model was trained on data "
+        f"up to 2018 and does not capture every factor relevant to creditworthiness. {review_sentence}"
+    )
+    footnote = f"(Model version: {pred_bundle.get('model_version')})"
+    return "\n\n".join([opening, factors, regulation, steps, limitation, footnote])
@@ -0,0 +1,121 @@
+from __future__ import annotations
+import asyncio, json, random, time, uuid
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+latency_dists = ("fixed", "uniform", "lognormal")
+
+fake_narrative = (
+    "The applicant's estimated probability of default is compared against the policy "
+    "threshold and the resulting risk class reflects the supplied factors. Loan grade and "
+    "term, debt-to-income ratio, FICO score and recently opened accounts are each associated "
+    "with the assessed risk in the direction shown by the model. This assessment complies "
+    "with [Equal Credit Opportunity Act (ECOA), 15 U.S.C. §1691 et seq.; Regulation B, "
+    "12 CFR Part 1002]. Verify income documentation before a final decision. The model was "
+    "trained on historical data and may not capture recent changes. A human credit officer "
+    "must review before any final decision."
+)
+
+@dataclass
+class FakeLLMConfig:
+    latency_ms: float = 800.0
+    latency_dist: str = "lognormal"
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    stream_chunks: int = 20
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.latency_dist not in latency_dists:
+            raise ValueError(f"latency_dist must be one of {latency_dists}. Got '{self.latency_dist}'")
+
+class FakeLLM:
+    def __init__(self, config: FakeLLMConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.requests = 0
+        self.errors = 0
+        self.malformed = 0
+        self.streams = 0
+
+    def latency(self) -> float:
+        c = self.config
+        base = c.latency_ms / 1e3
+        if c.latency_dist == "fixed":
+            return base
+        if c.latency_dist == "uniform":
+            return self.rng.uniform(0.0, 2.0 * base)
+        return base * self.rng.lognormvariate(0.0, c.latency_sigma)
+
+    def content(self) -> str:
+        if self.rng.random() < self.config.malformed_rate:
+            self.malformed += 1
+            return json.dumps({"narrative": fake_narrative})
+        return fake_narrative
+
+    def stats(self) -> Dict[str, Any]:
+        return {"config": asdict(self.config), "requests": self.requests, "errors": self.errors,
+                "malformed": self.malformed, "streams": self.streams}
+
+def completion(model: str, content: str) -> Dict[str, Any]:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                     "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()),
+                  "total_tokens": len(content.split())}
+    }
+
+def chunk(cid: str, model: str, delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+    body = {"id": cid, "object": "chat.completion.chunk", "created": int(time.time()),
+            "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+    return f"data: {json.dumps(body)}\n\n"
+
+async def stream_completion(model: str, content: str, total: float, n_chunks: int):
+    cid = f"chatcmpl-{uuid.uuid4().hex}"
+    words = content.split(" ")
+    n_chunks = max(1, min(n_chunks, len(words)))
+    step = -(-len(words) // n_chunks)
+    yield chunk(cid, model, {"role": "assistant", "content": ""})
+    for i in range(0, len(words), step):
+        await asyncio.sleep(total / n_chunks)
+        piece = " ".join(words[i:i + step])
+        yield chunk(cid, model, {"content": piece if i == 0 else " " + piece})
+    yield chunk(cid, model, {}, finish="stop")
+    yield "data: [DONE]\n\n"
+
+def create_fake_llm_app(config: Optional[FakeLLMConfig] = None) -> FastAPI:
+    app = FastAPI(title="AURA fake LLM")
+    fake = FakeLLM(config or FakeLLMConfig())
+    app.state.fake = fake
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        fake.requests += 1
+        model = body.get("model", "fake")
+        delay = fake.latency()
+        if fake.rng.random() < fake.config.error_rate:
+            fake.errors += 1
+            await asyncio.sleep(delay)
+            return JSONResponse(status_code=503, content={"error": {
+                "message": "fake upstream overloaded", "type": "server_error"}})
+        content = fake.content()
+        if body.get("stream"):
+            fake.streams += 1
+            return StreamingResponse(stream_completion(model, content, delay, fake.config.stream_chunks),
+                                     media_type="text/event-stream")
+        await asyncio.sleep(delay)
+        return completion(model, content)
+
+    @app.get("/stats")
+    async def stats():
+        return fake.stats()
+
+    return app
@@ -0,0 +1,133 @@
+from __future__ import annotations
+import asyncio, re, time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+import numpy as np
+
+fallback_prefix = "Explanation unavailable"
+metric_line = re.compile(r'^(\w+)(?:\{([^}]*)\})? (\S+)$')
+
+def parse_metrics(text: str) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]:
+    out = {}
+    for line in text.splitlines():
+        m = metric_line.match(line)
+        if not m:
+            continue
+        labels = tuple(sorted(tuple(kv.split("=", 1)) for kv in m.group(2).split(",")) if m.group(2) else ())
+        labels = tuple((k, v.strip('"')) for k, v in labels)
+        out[(m.group(1), labels)] = float(m.group(3))
+    return out
+
+def executor_wait(before: Dict, after: Dict) -> Dict[str, Any]:
+    def series(snap):
+        return {dict(l)["le"]: v for (n, l), v in snap.items()
+                if n == "aura_stage_seconds_bucket" and dict(l).get("stage") == "executor_wait"}
+    b, a = series(before), series(after)
+    if not a:
+        return {}
+    buckets = sorted(a, key=lambda le: float("inf") if le == "+Inf" else float(le))
+    counts = [a[le] - b.get(le, 0.0) for le in buckets]
+    total = counts[-1]
+    if total <= 0:
+        return {"calls": 0}
+    def quantile(q):
+        for le, c in zip(buckets, counts):
+            if c >= q * total:
+                return float("inf") if le == "+Inf" else float(le)
+    key = lambda n: (n, (("stage", "executor_wait"),))
+    wait_sum = after.get(key("aura_stage_seconds_sum"), 0.0) - before.get(key("aura_stage_seconds_sum"), 0.0)
+    under_1ms = next((c for le, c in zip(buckets, counts) if le == "0.001"), 0.0)
+    return {
+        "calls": int(total),
+        "mean_ms": wait_sum / total * 1e3,
+        "p95_le_ms": quantile(0.95) * 1e3,
+        "queued_fraction": 1.0 - under_1ms / total,
+    }
+
+def counter_delta(before: Dict, after: Dict, name: str) -> float:
+    keys = {k for k in after if k[0] == name}
+    return sum(after[k] - before.get(k, 0.0) for k in keys)
+
+async def scrape(client: httpx.AsyncClient) -> Dict:
+    try:
+        resp = await client.get("/metrics")
+        return parse_metrics(resp.text) if resp.status_code == 200 else {}
+    except httpx.HTTPError:
+        return {}
+
+async def run_load(client: httpx.AsyncClient, payloads: List[Dict[str, Any]],
+                   endpoint: str = "/predict_explain", rps: Optional[float] = None,
+                   concurrency: int = 16, duration: Optional[float] = 30.0,
+                   requests: Optional[int] = None, timeout: float = 120.0) -> Dict[str, Any]:
+    before = await scrape(client)
+    sem = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    fallbacks = 0
+    saturated = 0
+    tasks = []
+
+    async def one(payload):
+        nonlocal fallbacks
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                resp = await client.post(endpoint, json=payload, timeout=timeout)
+                statuses[str(resp.status_code)] += 1
+                if resp.status_code == 200 and fallback_prefix in resp.text:
+                    fallbacks += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    i = 0
+    while True:
+        elapsed = time.perf_counter() - start
+        if requests is not None and i >= requests:
+            break
+        if requests is None and duration is not None and elapsed >= duration:
+            break
+        if rps:
+            delay = start + i / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if sem.locked():
+                saturated += 1
+        else:
+            await sem.acquire()
+            sem.release()
+        tasks.append(asyncio.create_task(one(payloads[i % len(payloads)])))
+        i += 1
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - start
+    after = await scrape(client)
+
+    lat_ms = np.array(latencies) * 1e3 if latencies else np.zeros(1)
+    ok = statuses.get("200", 0)
+    return {
+        "endpoint": endpoint,
+        "target_rps": rps,
+        "concurrency": concurrency,
+        "sent": i,
+        "completed": len(latencies),
+        "wall_seconds": wall,
+        "throughput_rps": len(latencies) / wall if wall > 0 else 0.0,
+        "statuses": dict(statuses),
+        "error_rate": 1.0 - ok / max(len(latencies), 1),
+        "fallback_rate": fallbacks / max(ok, 1),
+        "client_saturated_fraction": saturated / max(i, 1) if rps else None,
+        "latency_ms": {
+            "p50": float(np.percentile(lat_ms, 50)),
+            "p95": float(np.percentile(lat_ms, 95)),
+            "p99": float(np.percentile(lat_ms, 99)),
+            "max": float(lat_ms.max()),
+        },
+        "server": {
+            "executor_wait": executor_wait(before, after),
+            "llm_calls": counter_delta(before, after, "aura_llm_calls_total"),
+            "llm_retries": counter_delta(before, after, "aura_llm_retries_total"),
+            "llm_fallbacks": counter_delta(before, after, "aura_llm_fallbacks_total"),
+        },
+    }
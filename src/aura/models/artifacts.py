@@ -0,0 +1,210 @@
+from __future__ import annotations
+import hashlib, json
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+import numpy as np
+from aura.app.config import (
+    model_version,
+    sur_path,
+    background_path,
+    percentiles_path,
+    threshold_path,
+    bundle_dir,
+    bundle_verify,
+    load_threshold_config,
+    write_threshold_config,
+)
+from aura.models.attribution import LinearAttribution
+from aura.models.compiled import Calibration, CompiledScorer
+from aura.models.percentiles import PercentileAnchors, PercentileIndex, ecdf_anchors, raw_background_columns
+
+bundle_format = "aura-bundle-v1"
+bundle_files = {
+    "surrogate": "surrogate.joblib",
+    "background": "background.parquet",
+    "percentiles": "percentiles.csv",
+    "thresholds": "thresholds.json",
+}
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+@dataclass
+class ArtifactBundle:
+    path: Path
+    manifest: Dict[str, Any]
+    scorer: CompiledScorer
+    attribution: LinearAttribution
+    percentiles: PercentileIndex
+    ecdf: Dict[str, PercentileAnchors]
+    background_transformed: np.ndarray
+
+    def file(self, key: str) -> Path:
+        return self.path / bundle_files[key]
+
+    def percentile_index(self, ecdf: bool = False) -> PercentileIndex:
+        if not ecdf:
+            return self.percentiles
+        return PercentileIndex(anchors={**self.percentiles.anchors, **self.ecdf})
+
+def save_array(out: Path, files: Dict[str, Any], name: str, arr) -> str:
+    fname = f"{name}.npy"
+    np.save(out / fname, np.ascontiguousarray(arr))
+    files[fname] = None
+    return fname
+
+def build_bundle(out_dir, sur=None, background=None, pct_df=None, threshold_cfg=None) -> Dict[str, Any]:
+    import joblib, pandas as pd
+    from aura.models import predict as predict_mod
+    from aura.models.attribution import build_linear_attribution
+    from aura.models.compiled import compile_scorer
+    from aura.models.percentiles import build_percentile_index
+
+    for obj, p in ((sur, sur_path), (background, background_path)):
+        if obj is None and not Path(p).exists():
+            raise FileNotFoundError(f"missing source artifact {p}")
+    sur = sur if sur is not None else joblib.load(sur_path)
+    background = background if background is not None else pd.read_parquet(background_path)
+    if pct_df is None:
+        pct_df = pd.read_csv(percentiles_path) if Path(percentiles_path).exists() else pd.DataFrame()
+    threshold_cfg = threshold_cfg or load_threshold_config(threshold_path)
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    files: Dict[str, Any] = {}
+    joblib.dump(sur, out / bundle_files["surrogate"])
+    background.to_parquet(out / bundle_files["background"], index=False)
+    pct_df.to_csv(out / bundle_files["percentiles"], index=False)
+    write_threshold_config(threshold_cfg, out / bundle_files["thresholds"])
+    files.update({f: None for f in bundle_files.values()})
+
+    scorer = compile_scorer(sur)
+    cal = scorer.calibration
+    for name in ("num_cols", "num_fill", "num_mean", "num_scale", "coef"):
+        save_array(out, files, f"scorer_{name}", getattr(scorer, name))
+    if cal.x is not None:
+        save_array(out, files, "calibration_x", cal.x)
+        save_array(out, files, "calibration_y", cal.y)
+
+    pre, clf = predict_mod.surrogate_parts(sur)
+    eng_bg = background
+    if not {"grade_term", "acc_open_past_24mths", "dti_inv", "fico_mid_sq"}.issubset(background.columns):
+        eng_bg = predict_mod.engineer(background[predict_mod.ui_features])
+    bg_trans = pre.transform(eng_bg)
+    dense = bg_trans.toarray() if hasattr(bg_trans, "toarray") else np.asarray(bg_trans, dtype=float)
+    save_array(out, files, "background_transformed", dense)
+    attr = build_linear_attribution(clf, bg_trans, predict_mod.extract_feature_names(pre))
+    for name in ("coef", "background_mean", "numeric_idx", "one_hot_idx"):
+        save_array(out, files, f"attribution_{name}", getattr(attr, name))
+
+    index = build_percentile_index(pct_df)
+    percentiles = {}
+    for i, (feat, a) in enumerate(index.anchors.items()):
+        percentiles[feat] = {"xp": save_array(out, files, f"percentile_{i}_xp", a.xp),
+                             "fp": save_array(out, files, f"percentile_{i}_fp", a.fp),
+                             "monotone": a.monotone}
+    ecdf = {}
+    for feat, col in raw_background_columns(background).items():
+        a = ecdf_anchors(col)
+        if a is not None:
+            ecdf[feat] = {"xp": save_array(out, files, f"ecdf_{feat}_xp", a.xp),
+                          "fp": save_array(out, files, f"ecdf_{feat}_fp", a.fp)}
+
+    manifest = {
+        "format": bundle_format,
+        "model_version": model_version,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "sources": {str(p): file_sha256(Path(p)) for p in (sur_path, background_path, percentiles_path, threshold_path)
+                    if Path(p).exists()},
+        "files": {f: {"sha256": file_sha256(out / f), "bytes": (out / f).stat().st_size} for f in sorted(files)},
+        "scorer": {
+            "num_features": scorer.num_features,
+            "n_out": scorer.n_out,
+            "pair_cols": [[g, t, c] for (g, t), c in scorer.pair_cols.items()],
+            "intercept": scorer.intercept,
+            "calibration": {"method": cal.method, "x_min": cal.x_min, "x_max": cal.x_max,
+                            "a": cal.a, "b": cal.b},
+        },
+        "attribution": {"expected_value": attr.expected_value, "feature_names": attr.feature_names,
+                        "one_hot_levels": attr.one_hot_levels},
+        "percentiles": percentiles,
+        "ecdf": ecdf,
+        "threshold": asdict(threshold_cfg),
+    }
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+def verify_bundle(path, manifest: Dict[str, Any]):
+    for fname, meta in manifest["files"].items():
+        f = Path(path) / fname
+        if not f.exists():
+            raise FileNotFoundError(f"bundle file missing: {f}")
+        if file_sha256(f) != meta["sha256"]:
+            raise ValueError(f"bundle checksum mismatch: {f}")
+
+def load_bundle(path, verify: bool = True) -> ArtifactBundle:
+    path = Path(path)
+    manifest_path = path / "manifest.json"
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"missing bundle manifest {manifest_path}")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("format") != bundle_format:
+        raise ValueError(f"Unsupported bundle format {manifest.get('format')!r}")
+    if verify:
+        verify_bundle(path, manifest)
+    arr = lambda fname: np.load(path / fname, mmap_mode="r")
+
+    s = manifest["scorer"]
+    c = s["calibration"]
+    isotonic = "calibration_x.npy" in manifest["files"]
+    scorer = CompiledScorer(
+        num_features=list(s["num_features"]),
+        num_cols=np.asarray(arr("scorer_num_cols.npy")),
+        num_fill=arr("scorer_num_fill.npy"),
+        num_mean=arr("scorer_num_mean.npy"),
+        num_scale=arr("scorer_num_scale.npy"),
+        n_out=int(s["n_out"]),
+        pair_cols={(g, int(t)): int(col) for g, t, col in s["pair_cols"]},
+        coef=arr("scorer_coef.npy"),
+        intercept=float(s["intercept"]),
+        calibration=Calibration(method=c["method"],
+                                x=arr("calibration_x.npy") if isotonic else None,
+                                y=arr("calibration_y.npy") if isotonic else None,
+                                x_min=float(c["x_min"]), x_max=float(c["x_max"]),
+                                a=float(c["a"]), b=float(c["b"]))
+    )
+    a = manifest["attribution"]
+    attribution = LinearAttribution(
+        coef=arr("attribution_coef.npy"),
+        background_mean=arr("attribution_background_mean.npy"),
+        expected_value=float(a["expected_value"]),
+        feature_names=list(a["feature_names"]),
+        numeric_idx=np.asarray(arr("attribution_numeric_idx.npy")),
+        one_hot_idx=np.asarray(arr("attribution_one_hot_idx.npy")),
+        one_hot_levels=list(a["one_hot_levels"])
+    )
+    percentiles = PercentileIndex(anchors={
+        feat: PercentileAnchors(xp=arr(p["xp"]), fp=arr(p["fp"]), monotone=bool(p["monotone"]))
+        for feat, p in manifest["percentiles"].items()
+    })
+    ecdf = {feat: PercentileAnchors(xp=arr(p["xp"]), fp=arr(p["fp"]))
+            for feat, p in manifest["ecdf"].items()}
+    return ArtifactBundle(path=path, manifest=manifest, scorer=scorer, attribution=attribution,
+                          percentiles=percentiles, ecdf=ecdf,
+                          background_transformed=arr("background_transformed.npy"))
+
+artifact_bundle_cache: Optional[ArtifactBundle] = None
+
+def load_artifact_bundle() -> Optional[ArtifactBundle]:
+    global artifact_bundle_cache
+    if not bundle_dir:
+        return None
+    if artifact_bundle_cache is None:
+        artifact_bundle_cache = load_bundle(bundle_dir, verify=bundle_verify)
+    return artifact_bundle_cache
@@ -0,0 +1,71 @@
+from __future__ import annotations
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Tuple
+
+shap_max_samples = 100
+one_hot_prefix = "grade_term_"
+
+@dataclass
+class LinearAttribution:
+    coef: np.ndarray
+    background_mean: np.ndarray
+    expected_value: float
+    feature_names: List[str]
+    numeric_idx: np.ndarray
+    one_hot_idx: np.ndarray
+    one_hot_levels: List[str]
+
+    @property
+    def reason_names(self) -> List[str]:
+        names = [self.feature_names[i] for i in self.numeric_idx]
+        if len(self.one_hot_idx):
+            names.append("grade_term")
+        return names
+
+    def shap_values(self, x_trans) -> np.ndarray:
+        x = dense_rows(x_trans)
+        return (x - self.background_mean) * self.coef
+
+    def aggregate(self, x_trans) -> Tuple[np.ndarray, np.ndarray]:
+        x = dense_rows(x_trans)
+        phi = (x - self.background_mean) * self.coef
+        out = phi[:, self.numeric_idx]
+        if not len(self.one_hot_idx):
+            return out, np.full(len(x), -1)
+        active = x[:, self.one_hot_idx] == 1
+        level = np.where(active.any(axis=1), active.argmax(axis=1), -1)
+        rows = np.arange(len(x))
+        gt = np.where(level >= 0, phi[:, self.one_hot_idx][rows, np.maximum(level, 0)], np.nan)
+        return np.column_stack([out, gt]), level
+
+def dense_rows(x_trans) -> np.ndarray:
+    if hasattr(x_trans, "toarray"):
+        return x_trans.toarray()
+    return np.atleast_2d(np.asarray(x_trans, dtype=float))
+
+def strip_prefix(full_name: str) -> str:
+    if "__" in full_name:
+        return full_name.split("__", 1)[1]
+    return full_name
+
+def build_linear_attribution(clf, bg_trans, feature_names: List[str],
+                             max_samples: int = shap_max_samples) -> LinearAttribution:
+    if bg_trans.shape[0] > max_samples:
+        from sklearn.utils import shuffle
+        bg_trans = shuffle(bg_trans, n_samples=max_samples, random_state=0)
+    bg_mean = np.asarray(bg_trans.mean(axis=0), dtype=float).ravel()
+    coef = np.asarray(clf.coef_, dtype=float).ravel()
+    intercept = float(np.ravel(clf.intercept_)[0])
+    base = [strip_prefix(n) for n in feature_names]
+    one_hot = [i for i, n in enumerate(base) if n.startswith(one_hot_prefix)]
+    numeric = [i for i, n in enumerate(base) if not n.startswith(one_hot_prefix)]
+    return LinearAttribution(
+        coef=coef,
+        background_mean=bg_mean,
+        expected_value=float(bg_mean @ coef + intercept),
+        feature_names=base,
+        numeric_idx=np.array(numeric, dtype=int),
+        one_hot_idx=np.array(one_hot, dtype=int),
+        one_hot_levels=[base[i][len(one_hot_prefix):] for i in one_hot]
+    )
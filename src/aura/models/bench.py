@@ -0,0 +1,196 @@
+from __future__ import annotations
+import itertools, json, os, platform, sys, time, tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from aura.app.config import model_version, scoring_mode, ui_features
+from aura.models import predict as predict_mod
+from aura.models import shadow as shadow_mod
+from aura.models.compiled import dti_epsilon
+from aura.models.memo import PredictionMemo
+
+default_sizes = (1, 10, 100, 1000, 10_000, 100_000)
+time_budget = 2.0
+max_repeats = 200
+
+def background_applicants(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    bg = predict_mod.load_background()
+    rows = bg.iloc[np.random.default_rng(seed).integers(0, len(bg), n)]
+    grade_term = rows["grade_term"].astype(str).str.split("_", n=1)
+    dti = np.clip(1.0 / rows["dti_inv"].to_numpy(float) - dti_epsilon, 0.0, None)
+    df = pd.DataFrame({
+        "grade": grade_term.str[0].to_numpy(),
+        "term": grade_term.str[1].str.strip().str.split().str[0].astype(int).to_numpy(),
+        "acc_open_past_24mths": rows["acc_open_past_24mths"].to_numpy().round().astype(int),
+        "dti": np.round(dti, 2),
+        "fico_mid": np.sqrt(rows["fico_mid_sq"].to_numpy(float)).round().astype(int),
+    })
+    return df[ui_features].to_dict(orient="records")
+
+def reset_explainers():
+    predict_mod.explainer_cache = None
+    predict_mod.attribution_cache = None
+
+def bench_cases(applicants: List[Dict[str, Any]]) -> List[Tuple[str, bool, Callable[[int], Callable[[], Any]]]]:
+    raw_df = pd.DataFrame(applicants, columns=ui_features)
+    eng_df = predict_mod.engineer(raw_df)
+    sur = predict_mod.load_sur()
+    lookup_features = ["fico_mid_sq", "dti_inv", "acc_open_past_24mths"]
+    lookups = [(float(eng_df[f].iat[i]), f)
+               for i, f in zip(range(len(eng_df)), itertools.cycle(lookup_features))]
+
+    def engineer(n):
+        df = raw_df.iloc[:n]
+        return lambda: predict_mod.engineer(df)
+    def predict_proba(n):
+        df = eng_df.iloc[:n]
+        return lambda: sur.predict_proba(df)
+    def build_explainer_cold(n):
+        def run():
+            reset_explainers()
+            predict_mod.build_explainer()
+        return run
+    def build_explainer_warm(n):
+        predict_mod.build_explainer()
+        return predict_mod.build_explainer
+    def local_shap(n):
+        if n == 1:
+            df, raw = eng_df.iloc[:1], applicants[0]
+            return lambda: predict_mod.local_shap(df, raw)
+        df, raws = eng_df.iloc[:n], applicants[:n]
+        return lambda: predict_mod.local_shap_batch(df, raws)
+    def percentile_lookup(n):
+        items = lookups[:n]
+        assert None not in [predict_mod.percentile_lookup(v, f) for v, f in items]
+        return lambda: [predict_mod.percentile_lookup(v, f) for v, f in items]
+    def predict_with_explanations(n):
+        if n == 1:
+            return lambda: predict_mod.predict_with_explanations(applicants[0])
+        batch = applicants[:n]
+        return lambda: predict_mod.predict_batch_with_explanations(batch)
+    def predict_cache_hit(n):
+        memo = PredictionMemo(max_entries=1)
+        def run():
+            predict_mod.prediction_memo, saved = memo, predict_mod.prediction_memo
+            try:
+                predict_mod.predict_with_explanations(applicants[0])
+            finally:
+                predict_mod.prediction_memo = saved
+        return run
+
+    return [
+        ("engineer", True, engineer),
+        ("predict_proba", True, predict_proba),
+        ("build_explainer_cold", False, build_explainer_cold),
+        ("build_explainer_warm", False, build_explainer_warm),
+        ("local_shap", True, local_shap),
+        ("percentile_lookup", True, percentile_lookup),
+        ("predict_with_explanations", True, predict_with_explanations),
+        ("predict_cache_hit", False, predict_cache_hit),
+    ]
+
+def time_call(fn: Callable[[], Any], budget: float = time_budget,
+              repeats: Optional[int] = None) -> np.ndarray:
+    fn()
+    samples = []
+    start = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+        if repeats is not None:
+            if len(samples) >= repeats:
+                break
+        elif len(samples) >= max_repeats or (time.perf_counter() - start >= budget and len(samples) >= 3):
+            break
+    return np.array(samples)
+
+def peak_memory_mb(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+def run_benchmarks(sizes: Sequence[int] = default_sizes, cases: Optional[Sequence[str]] = None,
+                   budget: float = time_budget, repeats: Optional[int] = None,
+                   seed: int = 0) -> Dict[str, Any]:
+    sizes = sorted(set(int(s) for s in sizes))
+    applicants = background_applicants(max(sizes), seed)
+    challengers, shadow_mod.shadow_challengers = shadow_mod.shadow_challengers, []
+    memo, predict_mod.prediction_memo = predict_mod.prediction_memo, PredictionMemo(max_entries=0)
+    try:
+        results = measure_cases(applicants, sizes, cases, budget, repeats)
+    finally:
+        shadow_mod.shadow_challengers = challengers
+        predict_mod.prediction_memo = memo
+    predict_mod.build_explainer()
+    return {"meta": bench_meta(), "results": results}
+
+def measure_cases(applicants: List[Dict[str, Any]], sizes: Sequence[int],
+                  cases: Optional[Sequence[str]], budget: float,
+                  repeats: Optional[int]) -> List[Dict[str, Any]]:
+    results = []
+    for name, batched, make in bench_cases(applicants):
+        if cases and name not in cases:
+            continue
+        for n in (sizes if batched else [1]):
+            fn = make(n)
+            ms = time_call(fn, budget, repeats) * 1e3
+            rows = n if batched else 1
+            results.append({
+                "case": name,
+                "batch_size": rows,
+                "repeats": len(ms),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "p99_ms": float(np.percentile(ms, 99)),
+                "mean_ms": float(ms.mean()),
+                "rows_per_s": rows * 1e3 / float(np.median(ms)),
+                "peak_mem_mb": peak_memory_mb(fn),
+            })
+    return results
+
+def bench_meta() -> Dict[str, Any]:
+    import sklearn
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "model_version": model_version,
+        "scoring_mode": scoring_mode,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = 0.25) -> List[Dict[str, Any]]:
+    base = {(r["case"], r["batch_size"]): r for r in baseline.get("results", [])}
+    rows = []
+    for r in current["results"]:
+        b = base.get((r["case"], r["batch_size"]))
+        if b is None:
+            continue
+        ratio = r["p50_ms"] / b["p50_ms"] if b["p50_ms"] > 0 else float("inf")
+        rows.append({
+            "case": r["case"],
+            "batch_size": r["batch_size"],
+            "baseline_p50_ms": b["p50_ms"],
+            "p50_ms": r["p50_ms"],
+            "p50_ratio": ratio,
+            "regression": ratio > 1.0 + tolerance,
+        })
+    return rows
+
+def load_results(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+def write_results(results: Dict[str, Any], path: Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2), encoding="utf-8")
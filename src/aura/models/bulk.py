@@ -0,0 +1,116 @@
+from __future__ import annotations
+import json, os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from aura.app.config import ui_features, batch_chunk_size
+from aura.models.predict import predict_frame_with_explanations
+
+output_schema = pa.schema([
+    ("row_index", pa.int64()),
+    ("error", pa.string()),
+    ("prediction_id", pa.string()),
+    ("timestamp", pa.string()),
+    ("model_version", pa.string()),
+    ("threshold_policy", pa.string()),
+    ("threshold", pa.float64()),
+    ("near_threshold_band", pa.float64()),
+    ("prob_default", pa.float64()),
+    ("threshold_delta", pa.float64()),
+    ("risk_class", pa.string()),
+    ("raw_input", pa.struct([
+        ("grade", pa.string()),
+        ("term", pa.int64()),
+        ("acc_open_past_24mths", pa.int64()),
+        ("dti", pa.float64()),
+        ("fico_mid", pa.int64()),
+    ])),
+    ("engineered", pa.struct([
+        ("grade_term", pa.string()),
+        ("acc_open_past_24mths", pa.float64()),
+        ("dti_inv", pa.float64()),
+        ("fico_mid_sq", pa.float64()),
+    ])),
+    ("top_local_shap", pa.string()),
+])
+
+def input_format(path: Path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix in (".csv", ".txt") or str(path).lower().endswith(".csv.gz"):
+        return "csv"
+    raise ValueError(f"Unsupported input format '{suffix}'. Use .csv or .parquet")
+
+def arrow_frame(batch: pa.RecordBatch) -> pd.DataFrame:
+    return pd.DataFrame({
+        name: col.to_numpy(zero_copy_only=False) if col.null_count == 0
+        else np.fromiter(col.to_pylist(), dtype=object, count=len(col))
+        for name, col in zip(batch.schema.names, batch.columns)
+    })
+
+def iter_input_chunks(path: Path, chunk_size: int = batch_chunk_size) -> Iterator[pd.DataFrame]:
+    if input_format(path) == "parquet":
+        pf = pq.ParquetFile(path)
+        cols = [f for f in ui_features if f in pf.schema_arrow.names]
+        for batch in pf.iter_batches(batch_size=chunk_size, columns=cols):
+            yield arrow_frame(batch)
+        return
+    header = pd.read_csv(path, nrows=0).columns
+    cols = [f for f in ui_features if f in header]
+    for df in pd.read_csv(path, usecols=cols, dtype=str, chunksize=chunk_size):
+        yield df.reset_index(drop=True)
+
+def output_row(offset: int, item: Dict[str, Any]) -> Dict[str, Any]:
+    row = {"row_index": offset + item["index"]}
+    if "error" in item:
+        row["error"] = item["error"]
+        return row
+    for name in output_schema.names[2:-1]:
+        row[name] = item[name]
+    row["top_local_shap"] = json.dumps(item["top_local_shap"], ensure_ascii=False, default=str)
+    return row
+
+def score_chunk(task: Tuple[int, pd.DataFrame, int]) -> pa.Table:
+    offset, frame, max_reasons = task
+    items = predict_frame_with_explanations(frame, max_reasons=max_reasons)
+    return pa.Table.from_pylist([output_row(offset, it) for it in items], schema=output_schema)
+
+def score_file(input_path: Path, output_path: Path, chunk_size: int = batch_chunk_size,
+               workers: Optional[int] = None, max_reasons: int = 5) -> Dict[str, int]:
+    workers = workers or os.cpu_count() or 1
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    stats = {"rows": 0, "errors": 0, "chunks": 0}
+
+    def tasks():
+        offset = 0
+        for frame in iter_input_chunks(input_path, chunk_size):
+            yield offset, frame, max_reasons
+            offset += len(frame)
+
+    def write(writer, table):
+        writer.write_table(table)
+        stats["rows"] += table.num_rows
+        stats["errors"] += table.num_rows - table.column("error").null_count
+        stats["chunks"] += 1
+
+    with pq.ParquetWriter(output_path, output_schema) as writer:
+        if workers <= 1:
+            for task in tasks():
+                write(writer, score_chunk(task))
+            return stats
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            inflight = deque()
+            for task in tasks():
+                inflight.append(pool.submit(score_chunk, task))
+                if len(inflight) >= 2 * workers:
+                    write(writer, inflight.popleft().result())
+            while inflight:
+                write(writer, inflight.popleft().result())
+    return stats
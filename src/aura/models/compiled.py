@@ -0,0 +1,154 @@
+from __future__ import annotations
+import numpy as np, pandas as pd
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+dti_epsilon = 1e-3
+grade_levels = "ABCDEFG"
+term_levels = (36, 60)
+
+def grade_term_str(grade: str, term: int) -> str:
+    return f"{grade}_ {term} months"
+
+@dataclass
+class Calibration:
+    method: str
+    x: Optional[np.ndarray] = None
+    y: Optional[np.ndarray] = None
+    x_min: float = -np.inf
+    x_max: float = np.inf
+    a: float = 0.0
+    b: float = 0.0
+
+    def __call__(self, decision: np.ndarray) -> np.ndarray:
+        if self.method == "isotonic":
+            t = np.clip(decision, self.x_min, self.x_max)
+            return np.interp(t, self.x, self.y)
+        if self.method == "sigmoid":
+            return 1.0 / (1.0 + np.exp(self.a * decision + self.b))
+        return decision
+
+def compile_calibration(calibrator) -> Calibration:
+    if hasattr(calibrator, "X_thresholds_"):
+        if getattr(calibrator, "out_of_bounds", "clip") != "clip":
+            raise ValueError("Only out_of_bounds='clip' isotonic calibration can be compiled")
+        return Calibration(method="isotonic",
+                           x=np.asarray(calibrator.X_thresholds_, dtype=float),
+                           y=np.asarray(calibrator.y_thresholds_, dtype=float),
+                           x_min=float(calibrator.X_min_),
+                           x_max=float(calibrator.X_max_))
+    if hasattr(calibrator, "a_"):
+        return Calibration(method="sigmoid", a=float(calibrator.a_), b=float(calibrator.b_))
+    raise ValueError(f"Unsupported calibrator {type(calibrator).__name__}")
+
+@dataclass
+class CompiledScorer:
+    num_features: List[str]
+    num_cols: np.ndarray
+    num_fill: np.ndarray
+    num_mean: np.ndarray
+    num_scale: np.ndarray
+    n_out: int
+    pair_cols: Dict[Tuple[str, int], int]
+    coef: np.ndarray
+    intercept: float
+    calibration: Calibration
+
+    def engineered_arrays(self, rows: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        n = len(rows)
+        dti = np.fromiter((r["dti"] for r in rows), dtype=float, count=n)
+        fico = np.fromiter((r["fico_mid"] for r in rows), dtype=float, count=n)
+        return {
+            "acc_open_past_24mths": np.fromiter((r["acc_open_past_24mths"] for r in rows),
+                                                dtype=float, count=n),
+            "dti_inv": 1.0 / (dti + dti_epsilon),
+            "fico_mid_sq": fico ** 2,
+        }
+
+    def engineered_rows(self, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{
+            "grade_term": grade_term_str(r["grade"], r["term"]),
+            "acc_open_past_24mths": r["acc_open_past_24mths"],
+            "dti_inv": 1.0 / (r["dti"] + dti_epsilon),
+            "fico_mid_sq": float(r["fico_mid"]) ** 2,
+        } for r in rows]
+
+    def transform(self, rows: Sequence[Dict[str, Any]]) -> np.ndarray:
+        n = len(rows)
+        eng = self.engineered_arrays(rows)
+        x = np.zeros((n, self.n_out))
+        num = np.column_stack([eng[f] for f in self.num_features])
+        num = np.where(np.isnan(num), self.num_fill, num)
+        x[:, self.num_cols] = (num - self.num_mean) / self.num_scale
+        cols = np.fromiter((self.pair_cols.get((r["grade"], r["term"]), -1) for r in rows),
+                           dtype=int, count=n)
+        hit = cols >= 0
+        x[np.nonzero(hit)[0], cols[hit]] = 1.0
+        return x
+
+    def decision_function(self, x: np.ndarray) -> np.ndarray:
+        return x @ self.coef + self.intercept
+
+    def predict_proba_transformed(self, x: np.ndarray) -> np.ndarray:
+        p1 = self.calibration(self.decision_function(x))
+        p1 = np.where((1.0 < p1) & (p1 <= 1.0 + 1e-5), 1.0, p1)
+        return np.column_stack([1.0 - p1, p1])
+
+    def predict_proba(self, rows: Sequence[Dict[str, Any]]) -> np.ndarray:
+        return self.predict_proba_transformed(self.transform(rows))
+
+def compile_scorer(sur) -> CompiledScorer:
+    if hasattr(sur, "calibrated_classifiers_"):
+        if len(sur.calibrated_classifiers_) != 1:
+            raise ValueError("Only single (prefit) calibrated classifiers can be compiled")
+        cc = sur.calibrated_classifiers_[0]
+        inner, calibration = cc.estimator, compile_calibration(cc.calibrators[0])
+    else:
+        inner, calibration = getattr(sur, "estimator", sur), Calibration(method="none")
+    pre = inner.named_steps["pre"]
+    clf = inner.named_steps["clf"]
+    n_out = len(pre.get_feature_names_out())
+
+    num_features: List[str] = []
+    num_cols: List[int] = []
+    num_fill, num_mean, num_scale = [], [], []
+    pair_cols: Dict[Tuple[str, int], int] = {}
+    for name, trans, cols in pre.transformers_:
+        if isinstance(trans, str):
+            if trans == "drop":
+                continue
+            raise ValueError(f"Cannot compile '{trans}' transformer '{name}'")
+        out = pre.output_indices_[name]
+        steps = dict(trans.named_steps)
+        if "scale" in steps:
+            imp, scale = steps.get("imp"), steps["scale"]
+            k = len(cols)
+            num_features.extend(cols)
+            num_cols.extend(range(out.start, out.stop))
+            num_fill.extend(imp.statistics_ if imp is not None else [np.nan] * k)
+            num_mean.extend(scale.mean_ if scale.mean_ is not None and scale.with_mean else [0.0] * k)
+            num_scale.extend(scale.scale_ if scale.scale_ is not None else [1.0] * k)
+        elif "ohe" in steps and list(cols) == ["grade_term"]:
+            pairs = [(g, t) for g in grade_levels for t in term_levels]
+            probe = pd.DataFrame({"grade_term": [grade_term_str(g, t) for g, t in pairs]})
+            enc = trans.transform(probe)
+            enc = enc.toarray() if hasattr(enc, "toarray") else np.asarray(enc)
+            for pair, row in zip(pairs, enc):
+                hot = np.flatnonzero(row == 1)
+                if len(hot) == 1:
+                    pair_cols[pair] = out.start + int(hot[0])
+        else:
+            raise ValueError(f"Cannot compile transformer '{name}'")
+
+    return CompiledScorer(
+        num_features=num_features,
+        num_cols=np.array(num_cols, dtype=int),
+        num_fill=np.asarray(num_fill, dtype=float),
+        num_mean=np.asarray(num_mean, dtype=float),
+        num_scale=np.asarray(num_scale, dtype=float),
+        n_out=n_out,
+        pair_cols=pair_cols,
+        coef=np.asarray(clf.coef_, dtype=float).ravel(),
+        intercept=float(np.ravel(clf.intercept_)[0]),
+        calibration=calibration
+    )
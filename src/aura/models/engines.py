@@ -0,0 +1,472 @@
+from __future__ import annotations
+import time, numpy as np, pandas as pd
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from aura.app.config import (
+    model_version,
+    lgbm_path,
+    lgbm_feature_order_path,
+    lgbm_threshold,
+    lgbm_threshold_policy,
+    lgbm_num_threads,
+    lgbm_shap_path,
+    lgbm_shap_topk,
+    logreg_path,
+    woe_encoder_path,
+    logreg_threshold,
+    logreg_threshold_policy,
+    default_engine,
+    get_threshold_config,
+    bundle_verify,
+    percentile_ecdf,
+    ui_features,
+    validate_ui_payload,
+    validate_batch,
+    InputError,
+)
+from aura.models import predict as predict_mod
+from aura.models.artifacts import ArtifactBundle, load_bundle
+from aura.models.percentiles import PercentileIndex
+from aura.models.compiled import Calibration, compile_calibration
+from aura.models.trees import TreeEnsemble, compile_trees
+from aura.models.tree_explain import TreeExplainer, build_tree_explainer, reasons_from_groups
+
+class ScoringEngine(ABC):
+    name = "base"
+    model_version = model_version
+    ui_payloads = False
+
+    @abstractmethod
+    def score_rows(self, raw_rows: List[Dict[str, Any]], full_rows: List[Dict[str, Any]],
+                   eng_rows: List[Dict[str, Any]], max_reasons: int = 5) -> List[Dict[str, Any]]:
+        ...
+
+    def collect(self, payloads: List[Any], prepare: Callable[[Any], Tuple[dict, dict, dict]],
+                max_reasons: int) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        ok: List[int] = []
+        prepared = []
+        for i, p in enumerate(payloads):
+            try:
+                prepared.append(prepare(p))
+                ok.append(i)
+                results.append({"index": i})
+            except InputError as e:
+                results.append({"index": i, "error": str(e)})
+        if ok:
+            raw_rows, full_rows, eng_rows = (list(c) for c in zip(*prepared))
+            for i, bundle in zip(ok, self.score_rows(raw_rows, full_rows, eng_rows, max_reasons)):
+                results[i].update(bundle)
+        return results
+
+    def ui_unsupported(self) -> InputError:
+        return InputError(f"Engine '{self.name}' only scores full feature payloads; use /predict_full")
+
+    def predict(self, payload: Dict[str, Any], max_reasons: int = 5) -> Dict[str, Any]:
+        raise self.ui_unsupported()
+
+    def predict_batch(self, payloads: List[Dict[str, Any]],
+                      max_reasons: int = 5) -> List[Dict[str, Any]]:
+        raise self.ui_unsupported()
+
+    @abstractmethod
+    def predict_full_batch(self, payloads: List[Dict[str, Any]],
+                           max_reasons: int = 5) -> List[Dict[str, Any]]:
+        ...
+
+    def benchmark_payloads(self, n: int, seed: int = 0) -> List[Dict[str, Any]]:
+        if not self.ui_payloads:
+            raise self.ui_unsupported()
+        return sample_payloads(n, seed)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"engine": self.name, "model_version": self.model_version}
+
+class SurrogateEngine(ScoringEngine):
+    name = "surrogate"
+    ui_payloads = True
+
+    def score_rows(self, raw_rows, full_rows, eng_rows, max_reasons=5):
+        return predict_mod.score_raw_rows(raw_rows, max_reasons)
+
+    def predict(self, payload, max_reasons=5):
+        return predict_mod.predict_with_explanations(payload, max_reasons=max_reasons)
+
+    def predict_batch(self, payloads, max_reasons=5):
+        return predict_mod.predict_batch_with_explanations(payloads, max_reasons=max_reasons)
+
+    def predict_full_batch(self, payloads, max_reasons=5):
+        ui_rows = [{f: p[f] for f in ui_features if f in p} if isinstance(p, dict) else p
+                   for p in payloads]
+        return self.predict_batch(ui_rows, max_reasons=max_reasons)
+
+    def describe(self):
+        return {**super().describe(), "threshold": get_threshold_config().value,
+                "n_features": len(ui_features)}
+
+@dataclass
+class BundleEngine(ScoringEngine):
+    bundle: ArtifactBundle
+    index: PercentileIndex
+    threshold: float
+    threshold_policy: str
+    model_version: str
+    name = "surrogate"
+    ui_payloads = True
+
+    def score_rows(self, raw_rows, full_rows, eng_rows, max_reasons=5):
+        probs, eng, reasons = predict_mod.compiled_score(raw_rows, max_reasons=max_reasons,
+                                                         scorer=self.bundle.scorer,
+                                                         attr=self.bundle.attribution,
+                                                         index=self.index)
+        ts = datetime.now(timezone.utc).isoformat()
+        return [predict_mod.make_bundle(raw, e, float(p), r, ts, engine=self.name,
+                                        version=self.model_version, threshold=self.threshold,
+                                        policy=self.threshold_policy)
+                for raw, e, p, r in zip(raw_rows, eng, probs, reasons)]
+
+    def predict(self, payload, max_reasons=5):
+        raw_valid = validate_ui_payload(payload)
+        bundle = self.score_rows([raw_valid], [raw_valid], [{}], max_reasons)[0]
+        predict_mod.submit_shadow(raw_valid, bundle)
+        return bundle
+
+    def predict_batch(self, payloads, max_reasons=5):
+        cleaned, errors = validate_batch(payloads)
+        def prepare(item):
+            raw_valid, error = item
+            if error is not None:
+                raise InputError(error)
+            return raw_valid, raw_valid, {}
+        return self.collect(list(zip(cleaned, errors)), prepare, max_reasons)
+
+    def predict_full_batch(self, payloads, max_reasons=5):
+        ui_rows = [{f: p[f] for f in ui_features if f in p} if isinstance(p, dict) else p
+                   for p in payloads]
+        return self.predict_batch(ui_rows, max_reasons=max_reasons)
+
+    def describe(self):
+        return {**super().describe(), "threshold": self.threshold,
+                "n_features": len(ui_features), "bundle": str(self.bundle.path)}
+
+def build_bundle_engine(path: Path, version: str) -> BundleEngine:
+    bundle = load_bundle(path, verify=bundle_verify)
+    cfg = bundle.manifest["threshold"]
+    return BundleEngine(bundle=bundle, index=bundle.percentile_index(percentile_ecdf),
+                        threshold=float(cfg["value"]), threshold_policy=str(cfg["policy"]),
+                        model_version=version)
+
+def missing_features(payload: Dict[str, Any], names: List[str]) -> Optional[InputError]:
+    missing = [n for n in names if n not in payload]
+    if not missing:
+        return None
+    more = f" and {len(missing) - 10} more" if len(missing) > 10 else ""
+    return InputError(f"Missing required features: {missing[:10]}{more}")
+
+@dataclass
+class LightGBMEngine(ScoringEngine):
+    booster: Any
+    trees: TreeEnsemble
+    feature_names: List[str]
+    feature_index: Dict[str, int]
+    categories: Dict[int, Dict[str, int]]
+    calibration: Calibration
+    threshold: float
+    threshold_policy: str
+    model_version: str
+    num_threads: int = 1
+    explainer: Optional[TreeExplainer] = None
+    name = "lgbm"
+
+    def validate_full(self, payload: Any) -> Dict[str, Any]:
+        if not isinstance(payload, dict):
+            raise InputError("Features must be a JSON object")
+        cleaned: Dict[str, Any] = {}
+        for k, v in payload.items():
+            j = self.feature_index.get(k)
+            if j is None:
+                raise InputError(f"Unexpected feature '{k}'")
+            if v is None:
+                cleaned[k] = None
+                continue
+            levels = self.categories.get(j)
+            if levels is not None:
+                level = str(v)
+                if level not in levels:
+                    raise InputError(f"Unknown category '{level}' for '{k}'")
+                cleaned[k] = level
+                continue
+            try:
+                x = float(v)
+            except Exception:
+                raise InputError(f"Feature '{k}' must be numeric. Got '{v}'")
+            if np.isinf(x):
+                raise InputError(f"Feature '{k}' must be finite. Got '{v}'")
+            cleaned[k] = x
+        error = missing_features(cleaned, self.feature_names)
+        if error is not None:
+            raise error
+        return cleaned
+
+    def encode(self, rows: List[Dict[str, Any]]) -> np.ndarray:
+        x = np.full((len(rows), len(self.feature_names)), np.nan)
+        for i, row in enumerate(rows):
+            for k, v in row.items():
+                if v is None:
+                    continue
+                j = self.feature_index[k]
+                levels = self.categories.get(j)
+                x[i, j] = levels[v] if levels is not None else v
+        return x
+
+    def raw_score(self, x: np.ndarray) -> np.ndarray:
+        return self.booster.predict(x, raw_score=True, num_threads=self.num_threads)
+
+    def predict_proba_matrix(self, x: np.ndarray) -> np.ndarray:
+        return self.calibration(self.raw_score(x))
+
+    def score_rows(self, raw_rows: List[Dict[str, Any]], full_rows: List[Dict[str, Any]],
+                   eng_rows: List[Dict[str, Any]], max_reasons: int = 5) -> List[Dict[str, Any]]:
+        x = self.encode(full_rows)
+        probs = self.predict_proba_matrix(x)
+        if max_reasons > 0 and self.explainer is not None:
+            reasons = [reasons_from_groups(c, raw, eng or full, max_reasons)
+                       for c, raw, eng, full in zip(self.explainer.explain(x),
+                                                    raw_rows, eng_rows, full_rows)]
+        else:
+            reasons = [[] for _ in raw_rows]
+        ts = datetime.now(timezone.utc).isoformat()
+        return [predict_mod.make_bundle(raw, eng, float(p), r, ts, engine=self.name,
+                                        version=self.model_version, threshold=self.threshold,
+                                        policy=self.threshold_policy)
+                for raw, eng, p, r in zip(raw_rows, eng_rows, probs, reasons)]
+
+    def predict_full_batch(self, payloads, max_reasons=5):
+        def prepare(p):
+            full = self.validate_full(p)
+            return full, full, {}
+        return self.collect(payloads, prepare, max_reasons)
+
+    def benchmark_payloads(self, n, seed=0):
+        rng = np.random.default_rng(seed)
+        x = rng.normal(size=(n, len(self.feature_names)))
+        labels = {j: list(levels) for j, levels in self.categories.items()}
+        return [{name: labels[j][int(rng.integers(len(labels[j])))] if j in labels else float(row[j])
+                 for j, name in enumerate(self.feature_names)} for row in x]
+
+    def describe(self):
+        return {**super().describe(), "threshold": self.threshold,
+                "n_features": len(self.feature_names),
+                "shap_topk": self.explainer.topk if self.explainer is not None else None}
+
+@dataclass
+class LogRegEngine(ScoringEngine):
+    model: Any
+    woe: Any
+    feature_names: List[str]
+    numeric: List[str]
+    threshold: float
+    threshold_policy: str
+    model_version: str
+    name = "logreg"
+
+    def frame(self, rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        df = pd.DataFrame(rows, columns=self.feature_names)
+        df[self.numeric] = df[self.numeric].astype(float)
+        woe_inputs = list(getattr(self.woe, "feature_names_in_", self.woe.cols))
+        encoded = self.woe.transform(df[woe_inputs])
+        for c in self.woe.cols:
+            df[c] = encoded[c].to_numpy(dtype=float)
+        return df
+
+    def validate_full(self, payload: Any) -> Dict[str, Any]:
+        if not isinstance(payload, dict):
+            raise InputError("Features must be a JSON object")
+        allowed = set(self.feature_names)
+        numeric = set(self.numeric)
+        cleaned: Dict[str, Any] = {}
+        for k, v in payload.items():
+            if k not in allowed:
+                raise InputError(f"Unexpected feature '{k}'")
+            if v is None or k not in numeric:
+                cleaned[k] = v
+                continue
+            try:
+                x = float(v)
+            except Exception:
+                raise InputError(f"Feature '{k}' must be numeric. Got '{v}'")
+            if np.isinf(x):
+                raise InputError(f"Feature '{k}' must be finite. Got '{v}'")
+            cleaned[k] = x
+        error = missing_features(cleaned, self.feature_names)
+        if error is not None:
+            raise error
+        return cleaned
+
+    def predict_full_batch(self, payloads, max_reasons=5):
+        def prepare(p):
+            full = self.validate_full(p)
+            return full, full, {}
+        return self.collect(payloads, prepare, max_reasons)
+
+    def score_rows(self, raw_rows, full_rows, eng_rows, max_reasons=5):
+        probs = self.model.predict_proba(self.frame(full_rows))[:, 1]
+        ts = datetime.now(timezone.utc).isoformat()
+        return [predict_mod.make_bundle(raw, eng, float(p), [], ts, engine=self.name,
+                                        version=self.model_version, threshold=self.threshold,
+                                        policy=self.threshold_policy)
+                for raw, eng, p in zip(raw_rows, eng_rows, probs)]
+
+    def describe(self):
+        return {**super().describe(), "threshold": self.threshold,
+                "n_features": len(self.feature_names)}
+
+def load_feature_order(path: Path = lgbm_feature_order_path) -> List[str]:
+    return pd.read_csv(path).iloc[:, 0].astype(str).tolist()
+
+def load_shap_topidx(path: Path = lgbm_shap_path) -> Optional[np.ndarray]:
+    if not Path(path).exists():
+        return None
+    import joblib
+    return np.asarray(joblib.load(path), dtype=np.int64)
+
+def build_lgbm_engine(calibrated, feature_order: Optional[List[str]] = None,
+                      top_idx: Optional[np.ndarray] = None) -> LightGBMEngine:
+    if len(calibrated.calibrated_classifiers_) != 1:
+        raise ValueError("Only single (prefit) calibrated classifiers can be served")
+    cc = calibrated.calibrated_classifiers_[0]
+    booster = cc.estimator.booster_
+    names = booster.feature_name()
+    if feature_order is not None and list(feature_order) != names:
+        raise ValueError("LightGBM feature order file does not match the booster")
+    cat_idx = [int(i) for i in booster.params.get("categorical_column", [])]
+    levels = booster.pandas_categorical or []
+    if len(cat_idx) != len(levels):
+        raise ValueError("LightGBM categorical columns do not match pandas_categorical")
+    trees = compile_trees(booster)
+    return LightGBMEngine(
+        booster=booster,
+        trees=trees,
+        feature_names=names,
+        feature_index={n: j for j, n in enumerate(names)},
+        categories={j: {str(c): k for k, c in enumerate(cats)} for j, cats in zip(cat_idx, levels)},
+        calibration=compile_calibration(cc.calibrators[0]),
+        threshold=lgbm_threshold,
+        threshold_policy=lgbm_threshold_policy,
+        model_version=f"lgbm-{model_version}",
+        num_threads=lgbm_num_threads,
+        explainer=build_tree_explainer(booster, top_idx,
+                                       topk=lgbm_shap_topk if top_idx is not None else 0,
+                                       num_threads=lgbm_num_threads)
+    )
+
+engine_cache: Dict[str, ScoringEngine] = {}
+
+def load_lgbm_engine() -> LightGBMEngine:
+    if "lgbm" not in engine_cache:
+        if not Path(lgbm_path).exists():
+            raise FileNotFoundError(f"missing lgbm artifact {lgbm_path}")
+        import joblib
+        engine_cache["lgbm"] = build_lgbm_engine(joblib.load(lgbm_path), load_feature_order(),
+                                                load_shap_topidx())
+    return engine_cache["lgbm"]
+
+def build_logreg_engine(model, woe) -> LogRegEngine:
+    pre = model.calibrated_classifiers_[0].estimator.named_steps["pre"]
+    return LogRegEngine(
+        model=model,
+        woe=woe,
+        feature_names=list(model.feature_names_in_),
+        numeric=list(pre.transformers[0][2]),
+        threshold=logreg_threshold,
+        threshold_policy=logreg_threshold_policy,
+        model_version=f"logreg-{model_version}"
+    )
+
+def load_logreg_engine() -> LogRegEngine:
+    if "logreg" not in engine_cache:
+        for path in (logreg_path, woe_encoder_path):
+            if not Path(path).exists():
+                raise FileNotFoundError(f"missing logreg artifact {path}")
+        import joblib
+        engine_cache["logreg"] = build_logreg_engine(joblib.load(logreg_path),
+                                                     joblib.load(woe_encoder_path))
+    return engine_cache["logreg"]
+
+def load_surrogate_engine() -> SurrogateEngine:
+    if "surrogate" not in engine_cache:
+        engine_cache["surrogate"] = SurrogateEngine()
+    return engine_cache["surrogate"]
+
+engine_loaders: Dict[str, Callable[[], ScoringEngine]] = {
+    "surrogate": load_surrogate_engine,
+    "lgbm": load_lgbm_engine,
+    "logreg": load_logreg_engine,
+}
+engine_classes: Dict[str, type] = {
+    "surrogate": SurrogateEngine,
+    "lgbm": LightGBMEngine,
+    "logreg": LogRegEngine,
+}
+engine_aliases: Dict[str, str] = {
+    model_version: "surrogate",
+    f"surrogate-{model_version}": "surrogate",
+    "lightgbm": "lgbm",
+    f"lgbm-{model_version}": "lgbm",
+    f"logreg-{model_version}": "logreg",
+}
+
+def engine_key(name: Optional[str]) -> str:
+    key = (name or default_engine).strip().lower()
+    return engine_aliases.get(key, key)
+
+def payload_kinds(name: str) -> Tuple[str, ...]:
+    cls = engine_classes.get(engine_key(name))
+    if cls is None:
+        return ()
+    return ("ui", "full") if cls.ui_payloads else ("full",)
+
+def get_engine(name: Optional[str] = None) -> ScoringEngine:
+    key = engine_key(name)
+    if key not in engine_loaders:
+        raise InputError(f"Unknown engine '{name}'. Choose from {sorted(engine_loaders)}")
+    return engine_loaders[key]()
+
+def benchmark_engine(engine: ScoringEngine, payloads: List[Dict[str, Any]],
+                     single_calls: int = 200, batch_size: int = 512) -> Dict[str, Any]:
+    if engine.ui_payloads:
+        single, batch = engine.predict, engine.predict_batch
+    else:
+        payloads = engine.benchmark_payloads(len(payloads))
+        single, batch = (lambda p: engine.predict_full_batch([p])[0]), engine.predict_full_batch
+    single(payloads[0])
+    lat = []
+    for p in payloads[:single_calls]:
+        t0 = time.perf_counter()
+        single(p)
+        lat.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    for start in range(0, len(payloads), batch_size):
+        batch(payloads[start:start + batch_size])
+    elapsed = time.perf_counter() - t0
+    lat_ms = np.array(lat) * 1e3
+    return {
+        **engine.describe(),
+        "single_p50_ms": float(np.percentile(lat_ms, 50)),
+        "single_p95_ms": float(np.percentile(lat_ms, 95)),
+        "batch_size": batch_size,
+        "batch_rows_per_s": len(payloads) / elapsed if elapsed > 0 else float("inf"),
+    }
+
+def sample_payloads(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    return [{
+        "grade": str(rng.choice(list("ABCDEFG"))),
+        "term": int(rng.choice([36, 60])),
+        "acc_open_past_24mths": int(rng.integers(0, 20)),
+        "dti": float(np.round(rng.uniform(0, 40), 2)),
+        "fico_mid": int(rng.integers(600, 850)),
+    } for _ in range(n)]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import os, threading, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+def file_stamp(paths: Iterable[Path]) -> Tuple[Any, ...]:
+    out = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            out.append((str(p), st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append((str(p), None, None))
+    return tuple(out)
+
+class PredictionMemo:
+    def __init__(self, max_entries: int = 4096, paths: Iterable[Path] = (),
+                 check_interval: float = 1.0):
+        self.max_entries = max_entries
+        self.paths = [Path(p) for p in paths]
+        self.check_interval = check_interval
+        self._mem: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._state: Tuple[Any, ...] = ()
+        self._files: Optional[Tuple[Any, ...]] = None
+        self._checked = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _same_state(self, state: Tuple[Any, ...]) -> bool:
+        return len(state) == len(self._state) and all(a is b for a, b in zip(state, self._state))
+
+    def _check_files(self):
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return
+        self._checked = now
+        stamp = file_stamp(self.paths)
+        if self._files is not None and stamp != self._files:
+            self._invalidate()
+        self._files = stamp
+
+    def _invalidate(self):
+        if self._mem:
+            self.invalidations += 1
+        self._mem.clear()
+
+    def get(self, key: Hashable, state: Tuple[Any, ...]) -> Optional[Any]:
+        with self._lock:
+            self._check_files()
+            value = self._mem.get(key) if self._same_state(state) else None
+            if value is None:
+                self.misses += 1
+                return None
+            self._mem.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, state: Tuple[Any, ...]):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if not self._same_state(state):
+                self._invalidate()
+                self._state = state
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._mem),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
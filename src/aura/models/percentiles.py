@@ -0,0 +1,123 @@
+from __future__ import annotations
+import numpy as np, pandas as pd
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+from aura.models.compiled import dti_epsilon
+
+ecdf_features = ("fico_mid", "dti")
+
+@dataclass
+class PercentileAnchors:
+    xp: np.ndarray
+    fp: np.ndarray
+    monotone: bool = True
+    xp_list: list = field(default_factory=list)
+    fp_list: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.xp_list = self.xp.tolist()
+        self.fp_list = self.fp.tolist()
+
+    def first_at_or_above(self, value: float) -> int:
+        if self.monotone:
+            return bisect_left(self.xp_list, value)
+        for j, v in enumerate(self.xp_list):
+            if value <= v:
+                return j
+        return len(self.xp_list) - 1
+
+    def lookup_scalar(self, value: float) -> Optional[float]:
+        if value != value:
+            return None
+        xp, fp = self.xp_list, self.fp_list
+        if value <= xp[0]:
+            return 0.0
+        if value >= xp[-1]:
+            return 1.0
+        j = self.first_at_or_above(value)
+        frac = (value - xp[j - 1]) / (xp[j] - xp[j - 1])
+        return fp[j - 1] + frac * (fp[j] - fp[j - 1])
+
+    def lookup_array(self, values: np.ndarray) -> np.ndarray:
+        v = np.asarray(values, dtype=float)
+        xp, fp = self.xp, self.fp
+        if self.monotone:
+            j = np.searchsorted(xp, v, side="left")
+        else:
+            j = np.argmax(v[..., None] <= xp, axis=-1)
+        j = np.clip(j, 1, len(xp) - 1)
+        lo, hi = xp[j - 1], xp[j]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = (v - lo) / (hi - lo)
+        out = fp[j - 1] + frac * (fp[j] - fp[j - 1])
+        out = np.where(v <= xp[0], 0.0, out)
+        out = np.where(v >= xp[-1], 1.0, out)
+        return np.where(np.isnan(v), np.nan, out)
+
+@dataclass
+class PercentileIndex:
+    anchors: Dict[str, PercentileAnchors]
+
+    def __contains__(self, feature: str) -> bool:
+        return feature in self.anchors
+
+    def lookup(self, value, feature: str):
+        anchors = self.anchors.get(feature)
+        if np.ndim(value) == 0:
+            if anchors is None:
+                return None
+            return anchors.lookup_scalar(float(value))
+        if anchors is None:
+            return np.full(np.shape(value), np.nan)
+        return anchors.lookup_array(value)
+
+def anchors_from_row(row: dict) -> Optional[PercentileAnchors]:
+    qs = []
+    for k, v in row.items():
+        if k.startswith("p") and k[1:].isdigit():
+            qs.append((int(k[1:]), float(v)))
+    if not qs:
+        return None
+    qs.sort()
+    xp = np.array([float(row["min"])] + [v for _, v in qs] + [float(row["max"])])
+    fp = np.array([0.0] + [q / 100.0 for q, _ in qs] + [1.0])
+    return PercentileAnchors(xp=xp, fp=fp, monotone=bool(np.all(np.diff(xp) >= 0)))
+
+def ecdf_anchors(values: Iterable[float]) -> Optional[PercentileAnchors]:
+    v = np.asarray(values, dtype=float)
+    v = np.sort(v[~np.isnan(v)])
+    if v.size < 2:
+        return None
+    uniq, counts = np.unique(v, return_counts=True)
+    fp = np.cumsum(counts) / v.size
+    fp[0], fp[-1] = 0.0, 1.0
+    return PercentileAnchors(xp=uniq, fp=fp)
+
+def raw_background_columns(bg: pd.DataFrame) -> Dict[str, np.ndarray]:
+    cols: Dict[str, np.ndarray] = {}
+    if "fico_mid" in bg.columns:
+        cols["fico_mid"] = bg["fico_mid"].to_numpy(dtype=float)
+    elif "fico_mid_sq" in bg.columns:
+        cols["fico_mid"] = np.sqrt(bg["fico_mid_sq"].to_numpy(dtype=float))
+    if "dti" in bg.columns:
+        cols["dti"] = bg["dti"].to_numpy(dtype=float)
+    elif "dti_inv" in bg.columns:
+        cols["dti"] = 1.0 / bg["dti_inv"].to_numpy(dtype=float) - dti_epsilon
+    return cols
+
+def build_percentile_index(pct_df: pd.DataFrame,
+                           background: Optional[pd.DataFrame] = None) -> PercentileIndex:
+    anchors: Dict[str, PercentileAnchors] = {}
+    if not pct_df.empty:
+        for row in pct_df.to_dict(orient="records"):
+            a = anchors_from_row(row)
+            if a is not None and row["feature"] not in anchors:
+                anchors[row["feature"]] = a
+    if background is not None:
+        for feat, col in raw_background_columns(background).items():
+            if feat in ecdf_features:
+                a = ecdf_anchors(col)
+                if a is not None:
+                    anchors[feat] = a
+    return PercentileIndex(anchors=anchors)
@@ -1,53 +1,97 @@
 from __future__ import annotations
-import joblib, pandas as pd, numpy as np, shap, json
+import pandas as pd, numpy as np, uuid
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
-import scipy.sparse as sp
+from aura.models.attribution import LinearAttribution, build_linear_attribution
+from aura.models.percentiles import PercentileIndex, build_percentile_index
+from aura.models.compiled import CompiledScorer, compile_scorer, dti_epsilon
+from aura.models.artifacts import load_artifact_bundle
+from aura.models.memo import PredictionMemo
 from aura.app.config import (
     model_version,
     sur_path,
     background_path,
     percentiles_path,
+    threshold_path,
+    bundle_dir,
     ui_features,
     user_friendly,
-    decision_threshold,
-    threshold_policy,
+    get_threshold_config,
     near_threshold_band,
-    validate_ui_payload
+    percentile_ecdf,
+    scoring_mode,
+    prediction_cache_size,
+    prediction_cache_check,
+    validate_ui_payload,
+    validate_frame,
+    validate_batch,
+    prediction_log_path
 )
+from aura.utils.audit import get_audit_log
+from aura.models.shadow import submit_shadow
+from aura.utils.metrics import inc, timer
 
 sur_cache = None
 background_cache = None
 explainer_cache = None
+attribution_cache = None
 percentiles_cache = None
+percentile_index_cache = None
+compiled_cache = None
+prediction_memo = None
 
 def load_sur():
     global sur_cache
     if sur_cache is None:
-        if not Path(sur_path).exists():
-            raise FileNotFoundError(f"missing sur artifact {sur_path}")
-        sur_cache = joblib.load(sur_path)   
+        bundle = load_artifact_bundle()
+        path = bundle.file("surrogate") if bundle else sur_path
+        if not Path(path).exists():
+            raise FileNotFoundError(f"missing sur artifact {path}")
+        import joblib
+        sur_cache = joblib.load(path)
     return sur_cache
 
+def load_compiled_scorer() -> CompiledScorer:
+    global compiled_cache
+    if compiled_cache is None:
+        bundle = load_artifact_bundle()
+        compiled_cache = bundle.scorer if bundle else compile_scorer(load_sur())
+    return compiled_cache
+
 def load_background():
     global background_cache
     if background_cache is None:
-        if not Path(background_path).exists():
-            raise FileNotFoundError(f"missing background artifact {background_path}")
-        background_cache = pd.read_parquet(background_path)
+        bundle = load_artifact_bundle()
+        path = bundle.file("background") if bundle else background_path
+        if not Path(path).exists():
+            raise FileNotFoundError(f"missing background artifact {path}")
+        background_cache = pd.read_parquet(path)
     return background_cache
 
 def load_percentiles():
     global percentiles_cache
     if percentiles_cache is None:
-        if Path(percentiles_path).exists():
-            df = pd.read_csv(percentiles_path)
+        bundle = load_artifact_bundle()
+        path = bundle.file("percentiles") if bundle else percentiles_path
+        if Path(path).exists():
+            df = pd.read_csv(path)
             percentiles_cache = df
         else:
             percentiles_cache = pd.DataFrame()
     return percentiles_cache
 
+def load_percentile_index() -> PercentileIndex:
+    global percentile_index_cache
+    if percentile_index_cache is None:
+        bundle = load_artifact_bundle()
+        if bundle:
+            percentile_index_cache = bundle.percentile_index(percentile_ecdf)
+        else:
+            background = load_background() if percentile_ecdf else None
+            percentile_index_cache = build_percentile_index(load_percentiles(), background)
+    return percentile_index_cache
+
 def canonical_term_str(term_val):
     try:
         n = int(str(term_val).strip().split()[0])
@@ -57,24 +101,22 @@ def canonical_term_str(term_val):
 
 def engineer(df: pd.DataFrame) -> pd.DataFrame:
     z = df.copy()
-    z["term"] = z["term"].apply(canonical_term_str)
+    z["term"] = z["term"].map({t: canonical_term_str(t) for t in z["term"].unique()})
     z["grade_term"] = z["grade"].astype(str) + "_" + z["term"]
-    z["dti_inv"] = 1.0 / (z["dti"] + 1e-3)
+    z["dti_inv"] = 1.0 / (z["dti"] + dti_epsilon)
     z["fico_mid_sq"] = z["fico_mid"].astype(float) ** 2
     z = z[["grade_term", "acc_open_past_24mths", "dti_inv", "fico_mid_sq"]]
     return z
 
-def build_explainer():
-    global explainer_cache
-    if explainer_cache is not None:
-        return explainer_cache
-    sur = load_sur()              
+def surrogate_parts(sur=None):
+    sur = sur if sur is not None else load_sur()
     if hasattr(sur, "calibrated_classifiers_"):
         inner = sur.calibrated_classifiers_[0].estimator
     else:
         inner = getattr(sur, "estimator", sur)
-    pre = inner.named_steps["pre"]
-    clf = inner.named_steps["clf"]
+    return inner.named_steps["pre"], inner.named_steps["clf"]
+
+def transformed_background(pre):
     bg = load_background()
     needed = {"grade_term","acc_open_past_24mths","dti_inv","fico_mid_sq"}
     if not needed.issubset(bg.columns):
@@ -82,12 +124,40 @@ def build_explainer():
             bg = engineer(bg[ui_features])
         else:
             raise ValueError(f"Background columns mismatch; have {bg.columns.tolist()}")
-    bg_trans = pre.transform(bg)
+    return pre.transform(bg)
+
+def build_explainer():
+    global explainer_cache
+    if explainer_cache is not None:
+        return explainer_cache
+    import shap
+    pre, clf = surrogate_parts()
+    bundle = load_artifact_bundle()
+    bg_trans = bundle.background_transformed if bundle else transformed_background(pre)
     masker = shap.maskers.Independent(bg_trans)
     explainer = shap.LinearExplainer(clf, masker)
     explainer_cache = (explainer, pre)
     return explainer_cache
 
+def build_attribution() -> tuple[LinearAttribution, Any]:
+    global attribution_cache
+    if attribution_cache is not None:
+        return attribution_cache
+    bundle = load_artifact_bundle()
+    pre, clf = surrogate_parts()
+    if bundle:
+        attr = bundle.attribution
+    else:
+        attr = build_linear_attribution(clf, transformed_background(pre), extract_feature_names(pre))
+    attribution_cache = (attr, pre)
+    return attribution_cache
+
+def load_attribution() -> LinearAttribution:
+    bundle = load_artifact_bundle()
+    if bundle:
+        return bundle.attribution
+    return build_attribution()[0]
+
 def extract_feature_names(pre):
     if hasattr(pre, "get_feature_names_out"):
         return pre.get_feature_names_out().tolist()
@@ -112,53 +182,25 @@ def map_engineered_to_raw(feature: str) -> str:
     return feature
 
 
-def percentile_lookup(value: float, feature: str) -> float | None:
-    pct_df = load_percentiles()
-    if pct_df.empty:
-        return None
-    row = pct_df[pct_df["feature"] == feature]
-    if row.empty:
-        return None
-    row = row.iloc[0].to_dict()
-    anchors = []
-    for k, v in row.items():
-        if k.startswith("p") and k[1:].isdigit():
-            anchors.append((int(k[1:]), float(v)))
-    if not anchors:
-        return None
-    anchors.sort()
-    if value <= row["min"]:
-        return 0.0
-    if value >= row["max"]:
-        return 1.0
-    prev_q, prev_v = 0, row["min"]
-    for q, v in anchors:
-        if value <= v:
-            if v == prev_v:
-                return q / 100.0
-            frac = (value - prev_v) / (v - prev_v)
-            return (prev_q / 100.0) + frac * ((q - prev_q) / 100.0)
-        prev_q, prev_v = q, v
-    last_q_val = anchors[-1]
-    if value <= row["max"]:
-        q, v = last_q_val
-        if row["max"] == v:
-            return q / 100.0
-        frac = (value - v) / (row["max"] - v)
-        return (q / 100.0) + frac * ((1.0 - q / 100.0))
-    return None
+def percentile_lookup(value, feature: str, index: Optional[PercentileIndex] = None):
+    with timer("percentile_lookup"):
+        return (index or load_percentile_index()).lookup(value, feature)
 
 
 def consolidate_reason(base_feature: str,
                        shap_val: float,
                        raw_row: dict,
-                       eng_row: dict) -> dict:
+                       eng_row: dict,
+                       index: Optional[PercentileIndex] = None) -> dict:
+    index = index or load_percentile_index()
     raw_feature = map_engineered_to_raw(base_feature)
     value = raw_row.get(raw_feature, eng_row.get(base_feature))
     display = user_friendly.get(raw_feature, user_friendly.get(base_feature, raw_feature))
     pct_key, pct_val = None, None
     if isinstance(value, (int, float)):
-        if base_feature == "fico_mid_sq":
+        if raw_feature in index:
+            pct_key, pct_val = raw_feature, float(value)
+        elif base_feature == "fico_mid_sq":
             pct_key, pct_val = "fico_mid_sq", eng_row["fico_mid_sq"] 
         elif base_feature == "dti_inv":
             pct_key, pct_val = "dti_inv", eng_row["dti_inv"]
@@ -166,7 +208,7 @@ def consolidate_reason(base_feature: str,
             pct_key, pct_val = raw_feature, float(value)
     percentile = None
     if pct_key is not None:
-        frac = percentile_lookup(pct_val, pct_key)       
+        frac = percentile_lookup(pct_val, pct_key, index)
         percentile = int(round(frac * 100)) if frac is not None else None
     if base_feature == "dti_inv":
         direction = "↑ risk" if shap_val < 0 else "↓ risk"
@@ -183,58 +225,38 @@ def consolidate_reason(base_feature: str,
         "shap_contribution": float(shap_val)
     }
 
-def local_shap(eng_df: pd.DataFrame,
-               raw_row: dict,
-               max_reasons: int = 5) -> list[dict]:
-    explainer, pre = build_explainer()
-    x_trans = pre.transform(eng_df)
-    shap_vals = explainer.shap_values(x_trans)
-    if isinstance(shap_vals, list):      
-        shap_vals = shap_vals[0]
-    shap_row = np.array(shap_vals)[0]
-
-    feature_names = extract_feature_names(pre)
-
-    if sp.issparse(x_trans):
-        row_values = x_trans.toarray()[0]
-    else:
-        row_values = np.array(x_trans)[0]
-
-    candidates = []
-    for idx, full_name in enumerate(feature_names):
-        if "__" in full_name:
-            base_part = full_name.split("__", 1)[1]
-        else:
-            base_part = full_name
-
-        if base_part.startswith("grade_term_"):
-            if row_values[idx] == 1:
-                candidates.append(("grade_term", shap_row[idx], base_part))
-        else:
-            candidates.append((base_part, shap_row[idx], base_part))
-
-    agg = {}
-    levels = {}
-    for feat, sval, lvl in candidates:
-        if feat not in agg or abs(sval) > abs(agg[feat]):
-            agg[feat] = sval
-            levels[feat] = lvl
+def attribution_matrix(eng_df: pd.DataFrame):
+    attr, pre = build_attribution()
+    contribs, _ = attr.aggregate(pre.transform(eng_df))
+    return contribs, attr.reason_names
 
-    ordered = sorted(agg.items(), key=lambda kv: -abs(kv[1]))
+def reasons_from_contributions(contrib_row: np.ndarray,
+                               names: list[str],
+                               raw_row: dict,
+                               eng_row: dict,
+                               max_reasons: int = 5,
+                               index: Optional[PercentileIndex] = None) -> list[dict]:
+    order = np.argsort(-np.nan_to_num(np.abs(contrib_row), nan=-1.0), kind="stable")
 
     reasons = []
     used_raw = set()
-    eng_row = eng_df.iloc[0].to_dict()
 
-    for feat, sval in ordered:
+    for idx in order:
         if len(reasons) >= max_reasons:
             break
+        sval = contrib_row[idx]
+        if np.isnan(sval):
+            continue
+        feat = names[idx]
         raw_key = map_engineered_to_raw(feat)
         if raw_key in used_raw and raw_key not in ("grade_term",):
             continue
-        reasons.append(consolidate_reason(feat, sval, raw_row, eng_row))
+        reasons.append(consolidate_reason(feat, float(sval), raw_row, eng_row, index))
         used_raw.add(raw_key)
     
+    return assign_magnitudes(reasons)
+
+def assign_magnitudes(reasons: list[dict]) -> list[dict]:
     abs_vals = [abs(r["shap_contribution"]) for r in reasons if r.get("shap_contribution") is not None]
     if abs_vals:
         m = max(abs_vals)
@@ -244,30 +266,164 @@ def local_shap(eng_df: pd.DataFrame,
             r["magnitude"] = "High" if rel >= 0.60 else "Moderate" if rel >= 0.30 else "Low"
     return reasons
 
-def predict_with_explanations(applicant_payload: Dict[str,Any], max_reasons=5):
-    raw_valid = validate_ui_payload(applicant_payload)
-    raw_df = pd.DataFrame([raw_valid], columns=ui_features)
-    eng_df = engineer(raw_df)
-    sur = load_sur()
-    prob = float(sur.predict_proba(eng_df)[0,1])
-    delta = prob - decision_threshold
-    risk = "High" if prob >= decision_threshold else "Low"
-    reasons = local_shap(eng_df, raw_valid, max_reasons=max_reasons)
+def local_shap(eng_df: pd.DataFrame,
+               raw_row: dict,
+               max_reasons: int = 5) -> list[dict]:
+    contribs, names = attribution_matrix(eng_df)
+    eng_row = eng_df.iloc[0].to_dict()
+    return reasons_from_contributions(contribs[0], names, raw_row, eng_row,
+                                      max_reasons=max_reasons)
+
+def local_shap_batch(eng_df: pd.DataFrame,
+                     raw_rows: list[dict],
+                     max_reasons: int = 5) -> list[list[dict]]:
+    if eng_df.empty:
+        return []
+    contribs, names = attribution_matrix(eng_df)
+    eng_rows = eng_df.to_dict(orient="records")
+    return [
+        reasons_from_contributions(contribs[i], names, raw_rows[i], eng_rows[i],
+                                   max_reasons=max_reasons)
+        for i in range(len(raw_rows))
+    ]
+
+def compiled_score(raw_rows: List[Dict[str, Any]], max_reasons: int = 5,
+                   scorer: Optional[CompiledScorer] = None, attr: Optional[LinearAttribution] = None,
+                   index: Optional[PercentileIndex] = None):
+    scorer = scorer or load_compiled_scorer()
+    attr = attr or load_attribution()
+    x = scorer.transform(raw_rows)
+    probs = scorer.predict_proba_transformed(x)[:, 1]
+    eng_rows = scorer.engineered_rows(raw_rows)
+    contribs, _ = attr.aggregate(x)
+    names = attr.reason_names
+    reasons = [
+        reasons_from_contributions(contribs[i], names, raw_rows[i], eng_rows[i],
+                                   max_reasons=max_reasons, index=index)
+        for i in range(len(raw_rows))
+    ]
+    return probs, eng_rows, reasons
+
+def make_bundle(raw_valid: Dict[str, Any], eng_row: Dict[str, Any], prob: float,
+                reasons: list[dict], timestamp: str, engine: str = "surrogate",
+                version: str = model_version, threshold: Optional[float] = None,
+                policy: Optional[str] = None) -> Dict[str, Any]:
+    if threshold is None:
+        cfg = get_threshold_config()
+        threshold, policy = cfg.value, policy or cfg.policy
     return {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "model_version": model_version,
-        "threshold_policy": threshold_policy,
-        "threshold": decision_threshold,
+        "prediction_id": uuid.uuid4().hex,
+        "timestamp": timestamp,
+        "engine": engine,
+        "model_version": version,
+        "threshold_policy": policy,
+        "threshold": threshold,
         "near_threshold_band": near_threshold_band,
         "prob_default": prob,
-        "threshold_delta": delta,
-        "risk_class": risk,
+        "threshold_delta": prob - threshold,
+        "risk_class": "High" if prob >= threshold else "Low",
         "raw_input": raw_valid,
-        "engineered": eng_df.iloc[0].to_dict(),
+        "engineered": eng_row,
         "top_local_shap": reasons
     }
 
-def save_prediction_log(record: Dict[str, Any], path: Path = Path("logs") / "predictions.log"):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a") as f:
-        f.write(json.dumps(record) + "\n")
\ No newline at end of file
+def get_prediction_memo() -> PredictionMemo:
+    global prediction_memo
+    if prediction_memo is None:
+        paths = ([Path(bundle_dir) / "manifest.json"] if bundle_dir
+                 else [sur_path, background_path, percentiles_path, threshold_path])
+        prediction_memo = PredictionMemo(prediction_cache_size, paths, prediction_cache_check)
+    return prediction_memo
+
+def memo_state() -> tuple:
+    return (sur_cache, compiled_cache, attribution_cache, percentile_index_cache,
+            load_artifact_bundle(), get_threshold_config())
+
+def memo_key(raw_valid: Dict[str, Any], max_reasons: int) -> tuple:
+    cfg = get_threshold_config()
+    return (tuple(raw_valid.get(f) for f in ui_features), max_reasons, scoring_mode,
+            model_version, cfg.value, cfg.policy)
+
+def predict_with_explanations(applicant_payload: Dict[str,Any], max_reasons=5):
+    with timer("validate"):
+        raw_valid = validate_ui_payload(applicant_payload)
+    ts = datetime.now(timezone.utc).isoformat()
+    memo = get_prediction_memo()
+    key = memo_key(raw_valid, max_reasons) if memo.max_entries > 0 else None
+    hit = memo.get(key, memo_state()) if key is not None else None
+    if key is not None:
+        inc("aura_prediction_cache_total", result="miss" if hit is None else "hit")
+    if hit is not None:
+        prob, eng_row, reasons = hit
+    elif scoring_mode == "compiled":
+        with timer("compiled_score"):
+            probs, eng_rows, reason_rows = compiled_score([raw_valid], max_reasons=max_reasons)
+        prob, eng_row, reasons = float(probs[0]), eng_rows[0], reason_rows[0]
+    else:
+        with timer("engineer"):
+            raw_df = pd.DataFrame([raw_valid], columns=ui_features)
+            eng_df = engineer(raw_df)
+        sur = load_sur()
+        with timer("predict_proba"):
+            prob = float(sur.predict_proba(eng_df)[0,1])
+        with timer("local_shap"):
+            reasons = local_shap(eng_df, raw_valid, max_reasons=max_reasons)
+        eng_row = eng_df.iloc[0].to_dict()
+    if hit is None and key is not None:
+        memo.put(key, (prob, dict(eng_row), tuple(dict(r) for r in reasons)), memo_state())
+    bundle = make_bundle(raw_valid, dict(eng_row), prob, [dict(r) for r in reasons], ts)
+    with timer("shadow_submit"):
+        submit_shadow(raw_valid, bundle)
+    return bundle
+
+def predict_batch_with_explanations(applicant_payloads: List[Dict[str, Any]],
+                                    max_reasons=5) -> List[Dict[str, Any]]:
+    with timer("batch_validate"):
+        cleaned, errors = validate_batch(applicant_payloads)
+    valid_idx = [i for i, row in enumerate(cleaned) if row is not None]
+    results: List[Dict[str, Any]] = [
+        {"index": i, "error": errors[i]} for i in range(len(applicant_payloads))
+    ]
+    if not valid_idx:
+        return results
+
+    raw_rows = [cleaned[i] for i in valid_idx]
+    for i, bundle in zip(valid_idx, score_raw_rows(raw_rows, max_reasons)):
+        results[i] = {"index": i, **bundle}
+    return results
+
+def predict_frame_with_explanations(frame: pd.DataFrame, max_reasons=5) -> List[Dict[str, Any]]:
+    frame = frame.reset_index(drop=True)
+    with timer("batch_validate"):
+        clean, report = validate_frame(frame)
+    first = report.drop_duplicates("row")
+    results: List[Dict[str, Any]] = [{"index": i} for i in range(len(frame))]
+    for i, msg in zip(first["row"].tolist(), first["error"].tolist()):
+        results[i]["error"] = msg
+    if len(clean):
+        for i, bundle in zip(clean.index.tolist(),
+                             score_raw_rows(clean.to_dict(orient="records"), max_reasons)):
+            results[i].update(bundle)
+    return results
+
+def score_raw_rows(raw_rows: List[Dict[str, Any]], max_reasons=5) -> List[Dict[str, Any]]:
+    if scoring_mode == "compiled":
+        with timer("batch_compiled_score"):
+            probs, eng_rows, reasons = compiled_score(raw_rows, max_reasons=max_reasons)
+    else:
+        with timer("batch_engineer"):
+            raw_df = pd.DataFrame(raw_rows, columns=ui_features)
+            eng_df = engineer(raw_df)
+        sur = load_sur()
+        with timer("batch_predict_proba"):
+            probs = np.asarray(sur.predict_proba(eng_df))[:, 1]
+        with timer("batch_local_shap"):
+            reasons = local_shap_batch(eng_df, raw_rows, max_reasons=max_reasons)
+        eng_rows = eng_df.to_dict(orient="records")
+    ts = datetime.now(timezone.utc).isoformat()
+    return [make_bundle(raw, eng, float(prob), r, ts)
+            for raw, eng, prob, r in zip(raw_rows, eng_rows, probs, reasons)]
+
+def save_prediction_log(record: Dict[str, Any], path: Optional[Path] = None) -> bool:
+    with timer("prediction_log"):
+        return get_audit_log(Path(path or prediction_log_path)).write(record)
\ No newline at end of file
@@ -0,0 +1,235 @@
+from __future__ import annotations
+import os, threading, time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from aura.app.config import (
+    model_version,
+    default_engine,
+    model_registry_dir,
+    model_registry_poll,
+    InputError,
+)
+from aura.models.engines import ScoringEngine, build_bundle_engine, get_engine, sample_payloads
+
+active_file = "ACTIVE"
+warmup_rows = 8
+
+class VersionUnavailable(RuntimeError):
+    pass
+
+@dataclass
+class ModelVersion:
+    name: str
+    path: Path
+    state: str = "loading"
+    engine: Optional[ScoringEngine] = None
+    inflight: int = 0
+    served: int = 0
+    error: Optional[str] = None
+    loaded_at: Optional[float] = None
+    load_seconds: Optional[float] = None
+
+    def describe(self) -> Dict[str, Any]:
+        return {"version": self.name, "path": str(self.path), "state": self.state,
+                "inflight": self.inflight, "served": self.served, "error": self.error,
+                "loaded_at": self.loaded_at, "load_seconds": self.load_seconds}
+
+class ModelRegistry:
+    def __init__(self, root, poll_interval: float = 2.0):
+        self.root = Path(root)
+        self.poll_interval = poll_interval
+        self.versions: Dict[str, ModelVersion] = {}
+        self.active: Optional[ModelVersion] = None
+        self.cond = threading.Condition()
+        self.stopped = threading.Event()
+        self.watcher: Optional[threading.Thread] = None
+        self.active_mtime: Optional[int] = None
+
+    def available(self) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "manifest.json").is_file())
+
+    def load(self, name: str, wait: bool = False, timeout: Optional[float] = None) -> ModelVersion:
+        if name not in self.available():
+            raise InputError(f"Unknown model version '{name}'. Choose from {self.available()}")
+        with self.cond:
+            mv = self.versions.get(name)
+            if mv is None or mv.state in ("unloaded", "failed"):
+                mv = ModelVersion(name=name, path=self.root / name)
+                self.versions[name] = mv
+                threading.Thread(target=self.warm, args=(mv,), name=f"aura-load-{name}",
+                                 daemon=True).start()
+            elif mv.state == "draining":
+                mv.state = "ready"
+        if wait:
+            self.wait_ready(mv, timeout)
+        return mv
+
+    def warm(self, mv: ModelVersion):
+        started = time.perf_counter()
+        try:
+            engine = build_bundle_engine(mv.path, mv.name)
+            engine.predict_batch(sample_payloads(warmup_rows))
+        except Exception as e:
+            with self.cond:
+                mv.state, mv.error = "failed", str(e) or type(e).__name__
+                self.cond.notify_all()
+            return
+        with self.cond:
+            if mv.state == "loading":
+                mv.engine, mv.state = engine, "ready"
+                mv.loaded_at, mv.load_seconds = time.time(), time.perf_counter() - started
+            self.cond.notify_all()
+
+    def wait_ready(self, mv: ModelVersion, timeout: Optional[float] = None) -> ModelVersion:
+        with self.cond:
+            if not self.cond.wait_for(lambda: mv.state != "loading", timeout):
+                raise VersionUnavailable(f"Model version '{mv.name}' is still loading")
+            if mv.state != "ready":
+                raise VersionUnavailable(f"Model version '{mv.name}' is {mv.state}"
+                                         + (f": {mv.error}" if mv.error else ""))
+        return mv
+
+    def activate(self, name: str, timeout: Optional[float] = None) -> ModelVersion:
+        mv = self.load(name, wait=True, timeout=timeout)
+        with self.cond:
+            if mv.state != "ready":
+                raise VersionUnavailable(f"Model version '{name}' is {mv.state}")
+            previous, self.active = self.active, mv
+            if previous is not None and previous is not mv:
+                self.retire(previous)
+        return mv
+
+    def retire(self, mv: ModelVersion):
+        if mv.state == "loading" or mv.inflight == 0:
+            mv.engine, mv.state = None, "unloaded"
+            self.cond.notify_all()
+        else:
+            mv.state = "draining"
+
+    def unload(self, name: str) -> ModelVersion:
+        with self.cond:
+            mv = self.versions.get(name)
+            if mv is None or mv.state in ("unloaded", "failed"):
+                raise VersionUnavailable(f"Model version '{name}' is not loaded")
+            if mv is self.active:
+                raise VersionUnavailable(f"Model version '{name}' is active; activate another first")
+            self.retire(mv)
+        return mv
+
+    @contextmanager
+    def acquire(self, name: Optional[str] = None) -> Iterator[ScoringEngine]:
+        with self.cond:
+            mv = self.active if name is None else self.versions.get(name)
+            if mv is None or mv.state != "ready":
+                if name is None:
+                    raise VersionUnavailable("No active model version")
+                if name not in self.available():
+                    raise InputError(f"Unknown model version '{name}'. Choose from {self.available()}")
+                raise VersionUnavailable(f"Model version '{name}' is "
+                                         f"{mv.state if mv is not None else 'not loaded'}")
+            mv.inflight += 1
+            engine = mv.engine
+        try:
+            yield engine
+        finally:
+            with self.cond:
+                mv.inflight -= 1
+                mv.served += 1
+                if mv.state == "draining" and mv.inflight == 0:
+                    self.retire(mv)
+
+    def read_active(self) -> Optional[str]:
+        try:
+            return (self.root / active_file).read_text(encoding="utf-8").strip() or None
+        except FileNotFoundError:
+            return None
+
+    def write_active(self, name: str):
+        tmp = self.root / f".{active_file}.{os.getpid()}"
+        tmp.write_text(name + "\n", encoding="utf-8")
+        os.replace(tmp, self.root / active_file)
+
+    def initial_version(self) -> Optional[str]:
+        available = self.available()
+        for name in (self.read_active(), model_version):
+            if name in available:
+                return name
+        return available[-1] if available else None
+
+    def poll(self):
+        try:
+            mtime = (self.root / active_file).stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self.active_mtime:
+            return
+        self.active_mtime = mtime
+        name = self.read_active()
+        if name and (self.active is None or self.active.name != name):
+            try:
+                self.activate(name)
+            except (InputError, VersionUnavailable) as e:
+                print(f"Model registry: cannot activate '{name}': {e}", flush=True)
+
+    def watch(self):
+        while not self.stopped.wait(self.poll_interval):
+            self.poll()
+
+    def start(self, timeout: Optional[float] = None):
+        name = self.initial_version()
+        if name is not None:
+            self.activate(name, timeout=timeout)
+        try:
+            self.active_mtime = (self.root / active_file).stat().st_mtime_ns
+        except FileNotFoundError:
+            pass
+        if self.poll_interval > 0 and self.watcher is None:
+            self.watcher = threading.Thread(target=self.watch, name="aura-registry-watch", daemon=True)
+            self.watcher.start()
+
+    def close(self):
+        self.stopped.set()
+        if self.watcher is not None:
+            self.watcher.join(timeout=5)
+            self.watcher = None
+
+    def describe(self) -> Dict[str, Any]:
+        with self.cond:
+            return {"root": str(self.root), "active": self.active.name if self.active else None,
+                    "available": self.available(),
+                    "versions": [mv.describe() for mv in self.versions.values()]}
+
+registry_cache: Optional[ModelRegistry] = None
+registry_pid: Optional[int] = None
+
+def get_model_registry() -> Optional[ModelRegistry]:
+    global registry_cache, registry_pid
+    if not model_registry_dir:
+        return None
+    if registry_cache is None or registry_pid != os.getpid():
+        registry_cache = ModelRegistry(model_registry_dir, model_registry_poll)
+        registry_pid = os.getpid()
+    return registry_cache
+
+def close_model_registry():
+    global registry_cache
+    if registry_cache is not None and registry_pid == os.getpid():
+        registry_cache.close()
+    registry_cache = None
+
+@contextmanager
+def scoring_engine(engine: Optional[str] = None, version: Optional[str] = None) -> Iterator[ScoringEngine]:
+    registry = get_model_registry()
+    name = (engine or default_engine).lower()
+    if registry is not None and name == "surrogate" and (version or registry.active is not None):
+        with registry.acquire(version) as scorer:
+            yield scorer
+        return
+    scorer = get_engine(engine)
+    if version and version != scorer.model_version:
+        raise InputError(f"Model version '{version}' is not available for engine '{scorer.name}'")
+    yield scorer
@@ -0,0 +1,232 @@
+from __future__ import annotations
+import os, queue, random, threading, time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from aura.app.config import (
+    shadow_challengers,
+    shadow_log_path,
+    shadow_queue_max,
+    shadow_batch_size,
+    shadow_sample_rate,
+)
+from aura.utils.audit import get_audit_log
+
+@dataclass
+class AgreementStats:
+    n: int = 0
+    agree: int = 0
+    champion_high_challenger_low: int = 0
+    champion_low_challenger_high: int = 0
+    errors: int = 0
+    delta_sum: float = 0.0
+    abs_delta_sum: float = 0.0
+    max_abs_delta: float = 0.0
+
+    def update(self, delta: float, champion_high: bool, challenger_high: bool):
+        self.n += 1
+        self.agree += champion_high == challenger_high
+        self.champion_high_challenger_low += champion_high and not challenger_high
+        self.champion_low_challenger_high += challenger_high and not champion_high
+        self.delta_sum += delta
+        self.abs_delta_sum += abs(delta)
+        self.max_abs_delta = max(self.max_abs_delta, abs(delta))
+
+    def summary(self) -> Dict[str, Any]:
+        n = max(self.n, 1)
+        return {
+            "n": self.n,
+            "errors": self.errors,
+            "agreement_rate": self.agree / n if self.n else None,
+            "champion_high_challenger_low": self.champion_high_challenger_low,
+            "champion_low_challenger_high": self.champion_low_challenger_high,
+            "mean_pd_delta": self.delta_sum / n if self.n else None,
+            "mean_abs_pd_delta": self.abs_delta_sum / n if self.n else None,
+            "max_abs_pd_delta": self.max_abs_delta if self.n else None
+        }
+
+class ShadowScorer:
+    def __init__(self, challengers: Sequence[str], log_path: Path, max_queue: int = 1000,
+                 batch_size: int = 64, sample_rate: float = 1.0, linger: float = 0.25):
+        self.challengers = list(challengers)
+        self.log_path = Path(log_path)
+        self.batch_size = batch_size
+        self.sample_rate = sample_rate
+        self.linger = linger
+        self._queue: "queue.Queue[Tuple[str, dict, dict]]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._closed = False
+        self.engines: Optional[Dict[str, Any]] = None
+        self.unavailable: Dict[str, str] = {}
+        self.agreement = {name: AgreementStats() for name in self.challengers}
+        from aura.models.engines import payload_kinds
+        self.kinds = {k for name in self.challengers for k in payload_kinds(name)}
+        self.submitted = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.processed = 0
+        self.last_batch_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name="aura-shadow", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: Dict[str, Any], bundle: Dict[str, Any], kind: str = "ui") -> bool:
+        if self._closed:
+            self.dropped += 1
+            return False
+        if kind not in self.kinds:
+            self.skipped += 1
+            return False
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return False
+        champion = {k: bundle.get(k) for k in
+                    ("prediction_id", "engine", "model_version", "prob_default", "risk_class")}
+        try:
+            self._queue.put_nowait((kind, payload, champion))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def _load(self) -> Dict[str, Any]:
+        from aura.models.engines import get_engine, payload_kinds
+        engines = {}
+        for name in self.challengers:
+            try:
+                engines[name] = get_engine(name)
+            except Exception as e:
+                self.unavailable[name] = f"{type(e).__name__}: {e}"
+        self.kinds = {k for name in engines for k in payload_kinds(name)}
+        return engines
+
+    def _score(self, batch: List[Tuple[str, dict, dict]]):
+        t0 = time.perf_counter()
+        if self.engines is None:
+            self.engines = self._load()
+        records = [{"ts": datetime.now(timezone.utc).isoformat(), "kind": kind, "champion": champion,
+                    "challengers": {}} for kind, _, champion in batch]
+        tried = set()
+        for kind in ("ui", "full"):
+            idx = [i for i, item in enumerate(batch) if item[0] == kind]
+            if idx:
+                self._score_kind(kind, idx, batch, records, tried)
+        log = get_audit_log(self.log_path)
+        for i in sorted(tried):
+            log.write(records[i])
+        self.skipped += len(batch) - len(tried)
+        self.processed += len(tried)
+        self.last_batch_seconds = time.perf_counter() - t0
+
+    def _score_kind(self, kind: str, idx: List[int], batch: List[Tuple[str, dict, dict]],
+                    records: List[dict], tried: set):
+        for name, engine in self.engines.items():
+            if kind == "ui" and not engine.ui_payloads:
+                continue
+            stats = self.agreement[name]
+            todo = [i for i in idx
+                    if (records[i]["champion"]["engine"], records[i]["champion"]["model_version"])
+                    != (engine.name, engine.model_version)]
+            if not todo:
+                continue
+            tried.update(todo)
+            rows = [batch[i][1] for i in todo]
+            try:
+                if kind == "ui":
+                    results = engine.predict_batch(rows, max_reasons=0)
+                else:
+                    results = engine.predict_full_batch(rows, max_reasons=0)
+            except Exception:
+                stats.errors += len(todo)
+                continue
+            for i, res in zip(todo, results):
+                if "error" in res:
+                    stats.errors += 1
+                    continue
+                rec = records[i]
+                champ = rec["champion"]
+                delta = res["prob_default"] - champ["prob_default"]
+                stats.update(delta, champ["risk_class"] == "High", res["risk_class"] == "High")
+                rec["challengers"][name] = {
+                    "model_version": res["model_version"],
+                    "prob_default": res["prob_default"],
+                    "risk_class": res["risk_class"],
+                    "pd_delta": delta
+                }
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=0.2)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0.0)))
+                except queue.Empty:
+                    break
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._score(batch)
+
+    def close(self, timeout: Optional[float] = 30.0):
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "challengers": {name: s.summary() for name, s in self.agreement.items()
+                            if name not in self.unavailable},
+            "unavailable": dict(self.unavailable),
+            "queue_depth": self._queue.qsize(),
+            "accepts": sorted(self.kinds),
+            "submitted": self.submitted,
+            "skipped": self.skipped,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "processed": self.processed,
+            "last_batch_seconds": self.last_batch_seconds
+        }
+
+shadow_cache: Optional[ShadowScorer] = None
+shadow_pid = os.getpid()
+shadow_lock = threading.Lock()
+
+def get_shadow_scorer() -> Optional[ShadowScorer]:
+    global shadow_cache, shadow_pid
+    if not shadow_challengers:
+        return None
+    if shadow_cache is not None and shadow_pid == os.getpid():
+        return shadow_cache
+    with shadow_lock:
+        if shadow_pid != os.getpid():
+            shadow_cache = None
+            shadow_pid = os.getpid()
+        if shadow_cache is None:
+            shadow_cache = ShadowScorer(shadow_challengers, Path(shadow_log_path),
+                                        max_queue=shadow_queue_max, batch_size=shadow_batch_size,
+                                        sample_rate=shadow_sample_rate)
+        return shadow_cache
+
+def submit_shadow(payload: Dict[str, Any], bundle: Dict[str, Any], kind: str = "ui") -> bool:
+    scorer = get_shadow_scorer()
+    return scorer.submit(payload, bundle, kind) if scorer is not None else False
+
+def shadow_stats() -> Optional[Dict[str, Any]]:
+    return shadow_cache.stats() if shadow_cache is not None else None
+
+def close_shadow_scorer(timeout: Optional[float] = 30.0):
+    global shadow_cache
+    with shadow_lock:
+        scorer, shadow_cache = shadow_cache, None
+    if scorer is not None:
+        scorer.close(timeout)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+from aura.models.predict import consolidate_reason, assign_magnitudes
+
+other_group = "other"
+derived_raw = {
+    "grade": "grade_term",
+    "term": "grade_term",
+    "dti_inv": "dti",
+    "fico_mid_sq": "fico_mid",
+    "log_loan_sq": "loan_amnt",
+}
+engineered_key = {"dti": "dti_inv", "fico_mid": "fico_mid_sq"}
+
+def lgbm_raw_feature(name: str) -> str:
+    if name.endswith("_missing"):
+        name = name[: -len("_missing")]
+    return derived_raw.get(name, name)
+
+@dataclass
+class TreeExplainer:
+    booster: object
+    feature_names: List[str]
+    groups: np.ndarray
+    group_names: List[str]
+    rank: np.ndarray
+    topk: int = 0
+    num_threads: int = 1
+
+    def in_topk(self, cols: np.ndarray) -> np.ndarray:
+        if self.topk <= 0:
+            return np.ones(len(cols), dtype=bool)
+        return self.rank[cols] < self.topk
+
+    def aggregate(self, contrib: np.ndarray) -> List[Dict[str, float]]:
+        keep = self.in_topk(np.arange(len(self.feature_names)))
+        out = []
+        for row in contrib:
+            agg: Dict[str, float] = {}
+            for j in np.flatnonzero(row):
+                name = self.group_names[self.groups[j]] if keep[j] else other_group
+                agg[name] = agg.get(name, 0.0) + float(row[j])
+            out.append(agg)
+        return out
+
+    def explain(self, x: np.ndarray) -> List[Dict[str, float]]:
+        contrib = self.booster.predict(x, pred_contrib=True, num_threads=self.num_threads)
+        return self.aggregate(np.asarray(contrib)[:, :-1])
+
+def other_reason(value: float) -> Dict[str, Any]:
+    return {
+        "feature": "Other factors",
+        "raw_feature_key": other_group,
+        "engineered_feature_key": other_group,
+        "applicant_value": None,
+        "percentile": None,
+        "direction": "↑ risk" if value > 0 else "↓ risk",
+        "shap_contribution": float(value)
+    }
+
+def reasons_from_groups(contrib: Dict[str, float], raw_row: dict, eng_row: dict,
+                        max_reasons: int = 5) -> List[Dict[str, Any]]:
+    ranked = sorted(((g, v) for g, v in contrib.items() if g != other_group and v != 0.0),
+                    key=lambda gv: -abs(gv[1]))
+    reasons = []
+    for group, value in ranked[:max_reasons]:
+        key = engineered_key.get(group, group)
+        base = key if key in eng_row else group
+        r = consolidate_reason(base, value, raw_row, eng_row)
+        r["direction"] = "↑ risk" if value > 0 else "↓ risk"
+        reasons.append(r)
+    rest = contrib.get(other_group, 0.0) + sum(v for _, v in ranked[max_reasons:])
+    if reasons and rest != 0.0:
+        reasons.append(other_reason(rest))
+    return assign_magnitudes(reasons)
+
+def build_tree_explainer(booster, top_idx: Optional[Sequence[int]] = None, topk: int = 0,
+                         num_threads: int = 1) -> TreeExplainer:
+    names = booster.feature_name()
+    group_names: List[str] = []
+    group_of: Dict[str, int] = {}
+    groups = np.empty(len(names), dtype=np.int64)
+    for j, n in enumerate(names):
+        raw = lgbm_raw_feature(n)
+        if raw not in group_of:
+            group_of[raw] = len(group_names)
+            group_names.append(raw)
+        groups[j] = group_of[raw]
+    rank = np.full(len(names), len(names), dtype=np.int64)
+    if top_idx is not None:
+        for r, j in enumerate(top_idx):
+            rank[int(j)] = min(rank[int(j)], r)
+    elif topk:
+        raise ValueError("topk requires the shap_topidx feature ranking")
+    return TreeExplainer(booster=booster, feature_names=names, groups=groups,
+                         group_names=group_names, rank=rank, topk=topk, num_threads=num_threads)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+zero_threshold = 1e-35
+block_rows = 32
+max_plans = 256
+
+@dataclass
+class TreeEnsemble:
+    feature: np.ndarray
+    threshold: np.ndarray
+    categorical: np.ndarray
+    default_left: np.ndarray
+    missing_type: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    value: np.ndarray
+    count: np.ndarray
+    internal: np.ndarray
+    levels: List[np.ndarray]
+    level_pos: List[np.ndarray]
+    level_weight: List[np.ndarray]
+    cat_table: np.ndarray
+    cat_row: np.ndarray
+    roots: np.ndarray
+    plans: Dict[bytes, tuple] = field(default_factory=dict, repr=False)
+
+    def go_left(self, x: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        xv = x[:, self.feature[nodes]]
+        nan = np.isnan(xv)
+        cat = self.categorical[nodes]
+        mt = self.missing_type[nodes]
+        dl = self.default_left[nodes]
+
+        num = np.where(nan & (mt == 0), 0.0, xv)
+        missing = np.where(mt == 2, nan, np.where(mt == 1, nan | (np.abs(num) <= zero_threshold), False))
+        with np.errstate(invalid="ignore"):
+            num_left = np.where(missing, dl, num <= self.threshold[nodes])
+
+        valid = ~nan & (xv >= 0) & (xv < self.cat_table.shape[1])
+        idx = np.where(valid, xv, 0).astype(np.int64)
+        cat_left = valid & self.cat_table[self.cat_row[nodes], idx]
+        return np.where(cat, cat_left, num_left)
+
+    def plan(self, known_features: np.ndarray) -> Tuple[np.ndarray, List[tuple]]:
+        key = known_features.tobytes()
+        cached = self.plans.get(key)
+        if cached is not None:
+            return cached
+        node_known = np.zeros(len(self.value), dtype=bool)
+        node_known[self.internal] = known_features[self.feature[self.internal]]
+        active = node_known.copy()
+        base = self.value.copy()
+        steps = []
+        for level, wl in zip(self.levels, self.level_weight):
+            lc, rc = self.left[level], self.right[level]
+            active[level] |= active[lc] | active[rc]
+            base[level] = wl * base[lc] + (1.0 - wl) * base[rc]
+            on = active[level]
+            if on.any():
+                kn = node_known[level[on]]
+                steps.append((level[on], lc[on], rc[on], wl[on], kn if kn.any() else None))
+        routed = np.flatnonzero(node_known[self.internal])
+        cached = (self.internal[routed], base, steps)
+        if len(self.plans) >= max_plans:
+            self.plans.clear()
+        self.plans[key] = cached
+        return cached
+
+    def expected_raw(self, x: np.ndarray, known: np.ndarray) -> np.ndarray:
+        if x.shape[0] > block_rows:
+            return np.concatenate([self.expected_raw(x[s:s + block_rows], known[s:s + block_rows])
+                                   for s in range(0, x.shape[0], block_rows)])
+        union = known.any(axis=0)
+        uniform = bool((known == union).all())
+        routed, base, steps = self.plan(union)
+        v = np.broadcast_to(base, (x.shape[0], len(base))).copy()
+        left = np.zeros((x.shape[0], len(self.value)), dtype=bool) if len(routed) else None
+        if left is not None:
+            left[:, routed] = self.go_left(x, routed)
+        for level, lc, rc, wl, kn in steps:
+            vl, vr = v[:, lc], v[:, rc]
+            mixed = wl * vl + (1.0 - wl) * vr
+            if kn is not None:
+                if not uniform:
+                    kn = known[:, self.feature[level]]
+                mixed = np.where(kn, np.where(left[:, level], vl, vr), mixed)
+            v[:, level] = mixed
+        return v[:, self.roots].sum(axis=1)
+
+def compile_trees(booster) -> TreeEnsemble:
+    dump = booster.dump_model()
+    rows: List[Dict[str, Any]] = []
+    roots: List[int] = []
+    cat_sets: List[List[int]] = []
+
+    def add(node: Dict[str, Any]) -> int:
+        k = len(rows)
+        rows.append({})
+        if "leaf_index" in node or "leaf_value" in node:
+            rows[k] = {"leaf": True, "value": float(node["leaf_value"]),
+                       "count": float(node.get("leaf_count", 0))}
+            return k
+        cat = node["decision_type"] == "=="
+        row = {"leaf": False, "feature": int(node["split_feature"]),
+               "categorical": cat, "default_left": bool(node["default_left"]),
+               "missing_type": {"None": 0, "Zero": 1, "NaN": 2}[node["missing_type"]],
+               "count": float(node["internal_count"]), "threshold": np.nan, "cat_row": -1}
+        if cat:
+            row["cat_row"] = len(cat_sets)
+            cat_sets.append([int(c) for c in str(node["threshold"]).split("||")])
+        else:
+            row["threshold"] = float(node["threshold"])
+        rows[k] = row
+        row["left"] = add(node["left_child"])
+        row["right"] = add(node["right_child"])
+        return k
+
+    for tree in dump["tree_info"]:
+        roots.append(add(tree["tree_structure"]))
+
+    n = len(rows)
+    def col(key, default, dtype):
+        return np.array([r.get(key, default) for r in rows], dtype=dtype)
+    is_leaf = col("leaf", True, bool)
+    left, right = col("left", -1, np.int64), col("right", -1, np.int64)
+
+    height = np.zeros(n, dtype=np.int64)
+    for k in range(n - 1, -1, -1):
+        if not is_leaf[k]:
+            height[k] = 1 + max(height[left[k]], height[right[k]])
+    internal = np.flatnonzero(~is_leaf)
+    hs = range(1, int(height.max()) + 1)
+    level_pos = [np.flatnonzero(height[internal] == h) for h in hs]
+    levels = [internal[j] for j in level_pos]
+    count = col("count", 0.0, float)
+    level_weight = [count[left[lv]] / np.maximum(count[left[lv]] + count[right[lv]], 1.0)
+                    for lv in levels]
+
+    width = max((max(s) for s in cat_sets), default=-1) + 1
+    cat_table = np.zeros((max(len(cat_sets), 1), max(width, 1)), dtype=bool)
+    for r, s in enumerate(cat_sets):
+        cat_table[r, s] = True
+
+    return TreeEnsemble(
+        feature=col("feature", 0, np.int64),
+        threshold=col("threshold", np.nan, float),
+        categorical=col("categorical", False, bool),
+        default_left=col("default_left", False, bool),
+        missing_type=col("missing_type", 0, np.int64),
+        left=left,
+        right=right,
+        value=col("value", 0.0, float),
+        count=count,
+        internal=internal,
+        levels=levels,
+        level_pos=level_pos,
+        level_weight=level_weight,
+        cat_table=cat_table,
+        cat_row=col("cat_row", -1, np.int64),
+        roots=np.array(roots, dtype=np.int64)
+    )
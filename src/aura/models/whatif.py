@@ -0,0 +1,123 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from aura.app.config import (
+    model_version,
+    ui_features,
+    valid_grades,
+    valid_terms,
+    fico_min,
+    fico_max,
+    get_threshold_config,
+    validate_one,
+    InputError,
+)
+from aura.models import predict as predict_mod
+from aura.models.compiled import CompiledScorer
+from aura.models.engines import BundleEngine, ScoringEngine
+from aura.utils.metrics import timer
+
+sweep_ranges: Dict[str, Tuple[float, float, float]] = {
+    "fico_mid": (fico_min, fico_max, 1),
+    "dti": (0.0, 60.0, 0.1),
+    "acc_open_past_24mths": (0, 30, 1),
+}
+sweep_levels: Dict[str, List[Any]] = {
+    "grade": sorted(valid_grades),
+    "term": sorted(valid_terms),
+}
+integer_features = {"fico_mid", "acc_open_past_24mths", "term"}
+max_grid_points = 20000
+
+def feature_grid(feature: str, spec: Optional[Sequence[float]] = None) -> np.ndarray:
+    if feature in sweep_levels:
+        if spec is not None:
+            raise InputError(f"'{feature}' is categorical; ranges are not supported")
+        return np.asarray(sweep_levels[feature], dtype=object)
+    if feature not in sweep_ranges:
+        raise InputError(f"Cannot sweep '{feature}'. Choose from {sorted(ui_features)}")
+    if spec is None:
+        lo, hi, step = sweep_ranges[feature]
+    else:
+        if len(spec) != 3:
+            raise InputError(f"Range for '{feature}' must be [min, max, step]")
+        lo, hi, step = (float(v) for v in spec)
+        if not (step > 0 and hi > lo):
+            raise InputError(f"Range for '{feature}' needs min < max and step > 0")
+        validate_one(feature, int(lo) if feature in integer_features else lo)
+        validate_one(feature, int(hi) if feature in integer_features else hi)
+        if feature in integer_features:
+            step = max(1.0, round(step))
+    n = int(np.floor((hi - lo) / step + 1e-9)) + 1
+    if n > max_grid_points:
+        raise InputError(f"Grid for '{feature}' has {n} points; the limit is {max_grid_points}")
+    grid = lo + step * np.arange(n)
+    return np.round(grid).astype(int) if feature in integer_features else np.round(grid, 6)
+
+def surrogate_settings(engine: Optional[ScoringEngine] = None) -> Tuple[CompiledScorer, float, str, str]:
+    if isinstance(engine, BundleEngine):
+        return engine.bundle.scorer, engine.threshold, engine.threshold_policy, engine.model_version
+    if engine is not None and engine.name != "surrogate":
+        raise InputError(f"What-if analysis is only available for the surrogate, not '{engine.name}'")
+    cfg = get_threshold_config()
+    return predict_mod.load_compiled_scorer(), cfg.value, cfg.policy, model_version
+
+def flip_point(feature: str, current: Any, values: np.ndarray, probs: np.ndarray,
+               threshold: float, high: bool) -> Optional[Dict[str, Any]]:
+    flipped = np.nonzero((probs >= threshold) != high)[0]
+    if not len(flipped):
+        return None
+    if feature in sweep_levels:
+        levels = sweep_levels[feature]
+        dist = np.array([abs(levels.index(values[i]) - levels.index(current)) for i in flipped], dtype=float)
+        scale = len(levels) - 1
+    else:
+        dist = np.abs(values[flipped].astype(float) - float(current))
+        scale = float(values[-1] - values[0]) or 1.0
+    j = int(np.argmin(dist))
+    i = int(flipped[j])
+    to = values[i].item() if hasattr(values[i], "item") else values[i]
+    return {
+        "feature": feature,
+        "from": current,
+        "to": to,
+        "change": None if feature in sweep_levels else round(to - current, 6),
+        "relative_change": float(dist[j] / scale),
+        "prob_default": float(probs[i]),
+        "risk_class": "High" if probs[i] >= threshold else "Low",
+    }
+
+def what_if(applicant: Dict[str, Any], features: Optional[Sequence[str]] = None,
+            ranges: Optional[Dict[str, Sequence[float]]] = None,
+            engine: Optional[ScoringEngine] = None) -> Dict[str, Any]:
+    scorer, threshold, policy, version = surrogate_settings(engine)
+    features = list(dict.fromkeys(features or ui_features))
+    ranges = ranges or {}
+    unknown = sorted(set(ranges) - set(features))
+    if unknown:
+        raise InputError(f"Ranges given for features that are not swept: {unknown}")
+    grids = {f: feature_grid(f, ranges.get(f)) for f in features}
+    with timer("what_if"):
+        rows = [applicant]
+        for f, grid in grids.items():
+            rows.extend({**applicant, f: v} for v in grid.tolist())
+        probs = scorer.predict_proba(rows)[:, 1]
+    base, probs = float(probs[0]), probs[1:]
+    high = base >= threshold
+    curves, flips, start = {}, {}, 0
+    for f, grid in grids.items():
+        p = probs[start:start + len(grid)]
+        start += len(grid)
+        curves[f] = {"values": grid.tolist(), "prob_default": p.tolist()}
+        flips[f] = flip_point(f, applicant[f], grid, p, threshold, high)
+    found = [v for v in flips.values() if v is not None]
+    return {
+        "model_version": version,
+        "threshold": threshold,
+        "threshold_policy": policy,
+        "prob_default": base,
+        "risk_class": "High" if high else "Low",
+        "curves": curves,
+        "flips": flips,
+        "minimal_flip": min(found, key=lambda v: v["relative_change"]) if found else None,
+    }
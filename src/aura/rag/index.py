@@ -0,0 +1,216 @@
+from __future__ import annotations
+import json, re, threading, time, zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from aura.app.config import (
+    rag_index_dir,
+    rag_top_k,
+    rag_cache_size,
+    rag_snippet_chars,
+    rag_chunk_words,
+    rag_chunk_overlap,
+    rag_index_check,
+)
+from aura.models.memo import file_stamp
+
+index_format = "aura-bm25-v1"
+doc_suffixes = (".txt", ".md")
+token_re = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+stopwords = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was "
+    "were will with which any such may shall not no all".split()
+)
+
+factor_terms: Dict[str, str] = {
+    "grade_term": "loan grade term pricing creditworthiness",
+    "grade": "loan grade creditworthiness",
+    "term": "loan term repayment period",
+    "dti": "debt-to-income ratio ability to repay income obligations",
+    "fico_mid": "credit score credit history",
+    "acc_open_past_24mths": "recently opened credit accounts credit history inquiries",
+}
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in token_re.findall(text.lower()) if t not in stopwords and len(t) > 1]
+
+def term_hash(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8"))
+
+def chunk_text(text: str, chunk_words: int = 120, overlap: int = 30) -> List[str]:
+    words = text.split()
+    if not words:
+        return []
+    step = max(chunk_words - overlap, 1)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + chunk_words]))
+        if start + chunk_words >= len(words):
+            break
+    return chunks
+
+def iter_documents(docs_dir: Path) -> Iterator[Tuple[str, str]]:
+    docs_dir = Path(docs_dir)
+    for path in sorted(p for p in docs_dir.rglob("*") if p.suffix.lower() in doc_suffixes):
+        yield str(path.relative_to(docs_dir)), path.read_text(encoding="utf-8", errors="ignore")
+
+def build_index(docs_dir: Path, out_dir: Path, chunk_words: int = rag_chunk_words,
+                overlap: int = rag_chunk_overlap, k1: float = 1.2, b: float = 0.75) -> Dict[str, Any]:
+    passages: List[Dict[str, Any]] = []
+    doc_terms: List[Dict[int, int]] = []
+    for source, text in iter_documents(docs_dir):
+        for i, chunk in enumerate(chunk_text(text, chunk_words, overlap)):
+            tf: Dict[int, int] = {}
+            for tok in tokenize(chunk):
+                h = term_hash(tok)
+                tf[h] = tf.get(h, 0) + 1
+            if not tf:
+                continue
+            passages.append({"source": source, "chunk": i, "text": chunk})
+            doc_terms.append(tf)
+    if not passages:
+        raise ValueError(f"No .txt/.md documents with text under {docs_dir}")
+
+    n = len(passages)
+    dl = np.array([sum(tf.values()) for tf in doc_terms], dtype=np.float64)
+    avgdl = float(dl.mean())
+    term_col = np.fromiter((h for tf in doc_terms for h in tf), dtype=np.uint32)
+    doc_col = np.repeat(np.arange(n, dtype=np.int32), [len(tf) for tf in doc_terms])
+    tf_col = np.fromiter((c for tf in doc_terms for c in tf.values()), dtype=np.float64)
+
+    order = np.lexsort((doc_col, term_col))
+    term_col, doc_col, tf_col = term_col[order], doc_col[order], tf_col[order]
+    terms, starts, df = np.unique(term_col, return_index=True, return_counts=True)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    norm = k1 * (1.0 - b + b * dl[doc_col] / avgdl)
+    weight = np.repeat(idf, df) * tf_col * (k1 + 1.0) / (tf_col + norm)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.save(out_dir / "terms.npy", terms.astype(np.uint32))
+    np.save(out_dir / "term_ptr.npy", np.append(starts, len(term_col)).astype(np.int64))
+    np.save(out_dir / "postings_doc.npy", doc_col.astype(np.int32))
+    np.save(out_dir / "postings_weight.npy", weight.astype(np.float32))
+    with open(out_dir / "passages.jsonl", "w", encoding="utf-8") as f:
+        for p in passages:
+            f.write(json.dumps(p, ensure_ascii=False) + "\n")
+    manifest = {
+        "format": index_format,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "n_passages": n,
+        "n_terms": int(len(terms)),
+        "n_postings": int(len(term_col)),
+        "avgdl": avgdl,
+        "k1": k1,
+        "b": b,
+        "chunk_words": chunk_words,
+        "chunk_overlap": overlap,
+        "sources": sorted({p["source"] for p in passages})
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+class RegIndex:
+    def __init__(self, index_dir: Path, cache_size: int = 1024, snippet_chars: int = 600):
+        index_dir = Path(index_dir)
+        self.manifest = json.loads((index_dir / "manifest.json").read_text(encoding="utf-8"))
+        if self.manifest.get("format") != index_format:
+            raise ValueError(f"Unsupported index format '{self.manifest.get('format')}'")
+        self.terms = np.load(index_dir / "terms.npy", mmap_mode="r")
+        self.term_ptr = np.load(index_dir / "term_ptr.npy", mmap_mode="r")
+        self.postings_doc = np.load(index_dir / "postings_doc.npy", mmap_mode="r")
+        self.postings_weight = np.load(index_dir / "postings_weight.npy", mmap_mode="r")
+        with open(index_dir / "passages.jsonl", encoding="utf-8") as f:
+            self.passages = [json.loads(line) for line in f]
+        self.cache_size = cache_size
+        self.snippet_chars = snippet_chars
+        self._cache: "OrderedDict[Tuple[Tuple[int, ...], int], Tuple[Tuple[int, float], ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.last_query_seconds = 0.0
+
+    def rank(self, hashes: Tuple[int, ...], k: int) -> Tuple[Tuple[int, float], ...]:
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        q = np.array(hashes, dtype=np.uint32)
+        pos = np.searchsorted(self.terms, q)
+        found = pos < len(self.terms)
+        found[found] = self.terms[pos[found]] == q[found]
+        for p in pos[found]:
+            s, e = self.term_ptr[p], self.term_ptr[p + 1]
+            np.add.at(scores, self.postings_doc[s:e], self.postings_weight[s:e])
+        k = min(k, int((scores > 0).sum()))
+        if k <= 0:
+            return ()
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return tuple((int(i), float(scores[i])) for i in top)
+
+    def search(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
+        t0 = time.perf_counter()
+        hashes = tuple(sorted({term_hash(t) for t in tokenize(query)}))
+        key = (hashes, k)
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if hit is None:
+            hit = self.rank(hashes, k) if hashes else ()
+            with self._lock:
+                self.misses += 1
+                self._cache[key] = hit
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        self.last_query_seconds = time.perf_counter() - t0
+        return [{**self.passages[i], "text": self.passages[i]["text"][:self.snippet_chars],
+                 "score": score} for i, score in hit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "n_passages": len(self.passages),
+            "cache_entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "last_query_seconds": self.last_query_seconds,
+            "built_at": self.manifest.get("built_at")
+        }
+
+def bundle_query(pred_bundle: Dict[str, Any]) -> str:
+    parts = ["credit decision"]
+    if pred_bundle.get("risk_class") == "High":
+        parts.append("adverse action notice principal reasons denial")
+    for r in pred_bundle.get("top_local_shap") or []:
+        key = r.get("raw_feature_key")
+        parts.append(str(r.get("feature") or ""))
+        parts.append(factor_terms.get(key, ""))
+    return " ".join(p for p in parts if p)
+
+reg_index_cache: Optional[RegIndex] = None
+reg_index_stamp: Optional[Tuple[Any, ...]] = None
+reg_index_checked = 0.0
+reg_index_lock = threading.Lock()
+
+def load_reg_index(index_dir: Optional[Path] = None) -> Optional[RegIndex]:
+    global reg_index_cache, reg_index_stamp, reg_index_checked
+    now = time.monotonic()
+    if reg_index_stamp is not None and now - reg_index_checked < rag_index_check:
+        return reg_index_cache
+    with reg_index_lock:
+        path = Path(index_dir or rag_index_dir)
+        stamp = file_stamp([path / "manifest.json"])
+        if stamp != reg_index_stamp:
+            exists = stamp[0][1] is not None
+            reg_index_cache = (RegIndex(path, cache_size=rag_cache_size, snippet_chars=rag_snippet_chars)
+                               if exists else None)
+            reg_index_stamp = stamp
+        reg_index_checked = now
+    return reg_index_cache
+
+def retrieve_for_bundle(pred_bundle: Dict[str, Any], k: int = rag_top_k) -> List[Dict[str, Any]]:
+    index = load_reg_index()
+    if index is None or k <= 0:
+        return []
+    return index.search(bundle_query(pred_bundle), k)
@@ -129,14 +129,7 @@ if st.button("Reset form", key="reset_top"):
     st.session_state["force_blank"] = True
     st.rerun()
 
-if st.session_state.get("last_result") and st.session_state.get("just_finished"):
-    res = st.session_state["last_result"]
-    st.session_state.just_finished = False 
-
-    pd, thr, delta = res["pd"], res["thr"], res["delta"]
-    policy, near = res["policy"], res["near"]
-    pred_rc = res["rc"]
-
+def render_assessment(pd, thr, delta, policy, near, pred_rc):
     st.subheader("Risk Assessment")
     c1,c2,c3 = st.columns(3)
     c1.metric("Probability of Default", f"{pd:.2%}")
@@ -153,6 +146,27 @@ if st.session_state.get("last_result") and st.session_state.get("just_finished")
         st.info("Applicant is near the policy threshold — consider manual review.")
     st.caption(f"Policy: **{policy}** · Near-threshold: **{near}**")
 
+def iter_sse(resp):
+    event, data = "message", []
+    for line in resp.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
+
+if st.session_state.get("last_result") and st.session_state.get("just_finished"):
+    res = st.session_state["last_result"]
+    st.session_state.just_finished = False 
+
+    render_assessment(res["pd"], res["thr"], res["delta"],
+                      res["policy"], res["near"], res["rc"])
+
     st.subheader("Explanation")
     exp = res["exp"]
     if exp:
@@ -183,11 +197,11 @@ if st.session_state.should_run:
     rid = uuid.uuid4().hex
     t0 = time.perf_counter()
     try:
-        with st.spinner("Scoring and generating explanation…"):
-            r = sess.post(f"{API_URL}/predict_explain",
-                          json=payload, headers={"X-Request-ID":rid},
-                          timeout=(5,60))
-        elapsed = time.perf_counter()-t0
+        with st.spinner("Scoring…"):
+            r = sess.post(f"{API_URL}/predict_explain/stream",
+                          json=payload, headers={"X-Request-ID":rid,
+                                                 "Accept":"text/event-stream"},
+                          timeout=(5,60), stream=True)
 
         if r.status_code==400:
             st.error(f"Input error: {r.json().get('detail',r.text)}"); halt()
@@ -196,9 +210,24 @@ if st.session_state.should_run:
         if not (200<=r.status_code<300):
             st.error(f"API error {r.status_code}: {r.text[:800]}"); halt()
 
-        data = r.json()
-        pred = data.get("prediction")
-        exp = (data.get("explanation") or {}).get("narrative")
+        pred, exp, parts = None, None, []
+        narrative_slot = None
+        for event, data in iter_sse(r):
+            if event == "prediction":
+                pred = data
+                render_assessment(float(pred["prob_default"]), float(pred["threshold"]),
+                                  float(pred["threshold_delta"]), pred["threshold_policy"],
+                                  bool(pred["near_threshold_flag"]), pred["risk_class"].lower())
+                st.subheader("Explanation")
+                narrative_slot = st.empty()
+                narrative_slot.caption("Generating explanation…")
+            elif event == "narrative" and narrative_slot is not None:
+                parts.append(data.get("text", ""))
+                narrative_slot.markdown("".join(parts) + "▌")
+            elif event == "done":
+                exp = data.get("narrative") or "".join(parts)
+        elapsed = time.perf_counter()-t0
+
         if not pred: st.error("API response missing 'prediction'."); halt()
 
         pd = float(pred["prob_default"])
@@ -0,0 +1,283 @@
+from __future__ import annotations
+import atexit, gzip, json, logging, os, queue, shutil, threading, time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from aura.app.config import (
+    audit_batch_size,
+    audit_flush_interval,
+    audit_max_bytes,
+    audit_rotate_seconds,
+    audit_compression,
+    audit_fsync,
+    audit_queue_max,
+    audit_max_retries,
+    audit_retry_delay,
+)
+from aura.utils.metrics import inc, set_gauge
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+fsync_policies = ("never", "batch", "always")
+_stop = object()
+logger = logging.getLogger(__name__)
+
+class AuditLog:
+    def __init__(self, path: Path, batch_size: int = 256, flush_interval: float = 1.0,
+                 max_bytes: int = 64 * 1024 * 1024, rotate_seconds: float = 0.0,
+                 compression: str = "gzip", fsync: str = "batch", max_queue: int = 100_000,
+                 max_retries: int = 3, retry_delay: float = 0.2):
+        if fsync not in fsync_policies:
+            raise ValueError(f"fsync must be one of {fsync_policies}. Got '{fsync}'")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compression = compression
+        self.fsync = fsync
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._file = None
+        self._lock_file = None
+        self._opened_at = 0.0
+        self._started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name=f"audit-{self.path.name}", daemon=True)
+        self._closed = False
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.batches = 0
+        self.rotations = 0
+        self.errors = 0
+        self.retries = 0
+        self.lost = 0
+        self.last_flush_seconds = 0.0
+        self._thread.start()
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        if self._closed or self._queue.qsize() >= self.max_queue:
+            self.dropped += 1
+            return False
+        self._queue.put(record)
+        self.enqueued += 1
+        return True
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._opened_at = time.time()
+
+    @contextmanager
+    def _locked(self, exclusive: bool = False):
+        if fcntl is None:
+            yield
+            return
+        if self._lock_file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._lock_file = open(self.path.with_name(self.path.name + ".lock"), "ab")
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _stale(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _should_rotate(self) -> bool:
+        if self._file is None:
+            return False
+        if self.max_bytes and os.fstat(self._file.fileno()).st_size >= self.max_bytes:
+            return True
+        return bool(self.rotate_seconds) and time.time() - self._opened_at >= self.rotate_seconds
+
+    def _rotate(self):
+        with self._locked(exclusive=True):
+            if self._stale():
+                self._close_file()
+                return
+            self._close_file()
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            segment = self.path.with_name(f"{self.path.name}.{stamp}")
+            os.replace(self.path, segment)
+        compress_segment(segment, self.compression)
+        self.rotations += 1
+
+    def _flush(self, batch: List[Dict[str, Any]]):
+        t0 = time.perf_counter()
+        data = "".join(json.dumps(r, default=str) + "\n" for r in batch).encode("utf-8")
+        with self._locked():
+            if self._file is not None and self._stale():
+                self._close_file()
+            if self._file is None:
+                self._open()
+            if self.fsync == "always":
+                for line in data.splitlines(keepends=True):
+                    self._file.write(line)
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+            else:
+                self._file.write(data)
+                self._file.flush()
+                if self.fsync == "batch":
+                    os.fsync(self._file.fileno())
+        self.written += len(batch)
+        self.bytes_written += len(data)
+        self.batches += 1
+        self.last_flush_seconds = time.perf_counter() - t0
+
+    def _failed(self, what: str):
+        self.errors += 1
+        inc("aura_audit_errors_total", log=self.path.name)
+        logger.exception("Audit log %s: %s failed", self.path, what)
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._flush(batch)
+                return
+            except Exception:
+                self._failed(f"write of {len(batch)} records (attempt {attempt + 1})")
+            if attempt < self.max_retries:
+                self.retries += 1
+                time.sleep(self.retry_delay * 2 ** attempt)
+        self.lost += len(batch)
+        inc("aura_audit_lost_records_total", len(batch), log=self.path.name)
+        logger.error("Audit log %s: lost %d records after %d attempts",
+                     self.path, len(batch), self.max_retries + 1)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+            if item is _stop:
+                stopping = True
+            elif item is not None:
+                batch.append(item)
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _stop:
+                    stopping = True
+                    continue
+                batch.append(item)
+            set_gauge("aura_audit_queue_depth", self._queue.qsize(), log=self.path.name)
+            if batch:
+                self._write(batch)
+            try:
+                if self._should_rotate():
+                    self._rotate()
+            except Exception:
+                self._failed("rotation")
+        self._close_file()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def close(self, timeout: Optional[float] = 10.0):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_stop)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        uptime = max(time.time() - self._started_at, 1e-9)
+        return {
+            "path": str(self.path),
+            "queue_depth": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "bytes_written": self.bytes_written,
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "errors": self.errors,
+            "retries": self.retries,
+            "lost": self.lost,
+            "records_per_second": self.written / uptime,
+            "last_flush_seconds": self.last_flush_seconds
+        }
+
+def compress_segment(segment: Path, compression: str) -> Path:
+    if compression == "zstd" and zstandard is not None:
+        target = segment.with_name(segment.name + ".zst")
+        with open(segment, "rb") as src, open(target, "wb") as dst:
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+    elif compression in ("gzip", "zstd"):
+        target = segment.with_name(segment.name + ".gz")
+        with open(segment, "rb") as src, gzip.open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+    else:
+        return segment
+    segment.unlink()
+    return target
+
+audit_logs: Dict[str, AuditLog] = {}
+audit_pid = os.getpid()
+audit_lock = threading.Lock()
+
+def get_audit_log(path: Path) -> AuditLog:
+    global audit_pid
+    key = str(Path(path))
+    log = audit_logs.get(key)
+    if log is not None and audit_pid == os.getpid():
+        return log
+    with audit_lock:
+        if audit_pid != os.getpid():
+            audit_logs.clear()
+            audit_pid = os.getpid()
+        log = audit_logs.get(key)
+        if log is None:
+            log = AuditLog(Path(path), batch_size=audit_batch_size,
+                           flush_interval=audit_flush_interval, max_bytes=audit_max_bytes,
+                           rotate_seconds=audit_rotate_seconds, compression=audit_compression,
+                           fsync=audit_fsync, max_queue=audit_queue_max,
+                           max_retries=audit_max_retries, retry_delay=audit_retry_delay)
+            audit_logs[key] = log
+        return log
+
+def close_audit_logs(timeout: Optional[float] = 10.0):
+    with audit_lock:
+        logs = list(audit_logs.values())
+        audit_logs.clear()
+    for log in logs:
+        log.close(timeout)
+
+def audit_stats() -> List[Dict[str, Any]]:
+    return [log.stats() for log in list(audit_logs.values())]
+
+atexit.register(close_audit_logs)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+import bisect, json, os, threading, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from aura.app.config import metrics_dir, metrics_flush_interval
+
+default_buckets = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+metric_help: Dict[str, str] = {
+    "aura_stage_seconds": "Latency of internal scoring/explanation stages",
+    "aura_request_seconds": "HTTP request latency by route",
+    "aura_requests_total": "HTTP requests by route, method and status",
+    "aura_llm_calls_total": "LLM completion attempts by outcome",
+    "aura_llm_retries_total": "LLM attempts retried after an error or invalid output",
+    "aura_llm_fallbacks_total": "Explanations that fell back after all LLM attempts failed",
+    "aura_narrative_cache_total": "Narrative cache lookups by result",
+    "aura_audit_errors_total": "Failed audit log writes and rotations by log",
+    "aura_audit_lost_records_total": "Audit records discarded after all write retries failed",
+    "aura_audit_queue_depth": "Audit records waiting to be written by log",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class MetricsRegistry:
+    def __init__(self, buckets: Iterable[float] = default_buckets):
+        self.buckets = tuple(buckets)
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        self.histograms: Dict[Tuple[str, LabelKey], List[Any]] = {}
+        self.gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str):
+        with self._lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = float(value)
+
+    def observe(self, name: str, seconds: float, **labels: str):
+        self.observe_key((name, tuple(sorted(labels.items()))), seconds)
+
+    def observe_key(self, key: Tuple[str, LabelKey], seconds: float):
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            h = self.histograms.get(key)
+            if h is None:
+                h = self.histograms[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            h[0][i] += 1
+            h[1] += seconds
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.gauges.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "buckets": list(self.buckets),
+                "counters": [[n, dict(l), v] for (n, l), v in self.counters.items()],
+                "gauges": [[n, dict(l), v] for (n, l), v in self.gauges.items()],
+                "histograms": [[n, dict(l), list(h[0]), h[1]] for (n, l), h in self.histograms.items()]
+            }
+
+    def merge(self, snap: Dict[str, Any], gauges: bool = True):
+        if tuple(snap.get("buckets", self.buckets)) != self.buckets:
+            return
+        for name, labels, value in snap["counters"]:
+            self.inc(name, value, **labels)
+        for name, labels, value in snap.get("gauges", []) if gauges else []:
+            key = (name, tuple(sorted(labels.items())))
+            with self._lock:
+                self.gauges[key] = self.gauges.get(key, 0.0) + value
+        for name, labels, counts, total in snap["histograms"]:
+            key = (name, tuple(sorted(labels.items())))
+            with self._lock:
+                h = self.histograms.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+                h[0] = [a + b for a, b in zip(h[0], counts)]
+                h[1] += total
+
+    def render(self) -> str:
+        lines: List[str] = []
+        seen = set()
+        def header(name: str, kind: str):
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {metric_help.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+        with self._lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            histograms = sorted((k, (list(h[0]), h[1])) for k, h in self.histograms.items())
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        for (name, labels), value in gauges:
+            header(name, "gauge")
+            lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        for (name, labels), (counts, total) in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for le, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', format_value(le)),))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {format_value(total)}")
+            lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+def format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')
+                                     .replace("\n", "\\n")) for k, v in labels)
+    return "{" + body + "}"
+
+def format_value(v: float) -> str:
+    v = float(v)
+    if v == float("inf"):
+        return "+Inf"
+    return str(int(v)) if v.is_integer() and abs(v) < 1e15 else repr(v)
+
+registry = MetricsRegistry()
+last_flush = 0.0
+
+class timer:
+    __slots__ = ("key", "t0")
+
+    def __init__(self, stage: str):
+        self.key = ("aura_stage_seconds", (("stage", stage),))
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        registry.observe_key(self.key, time.perf_counter() - self.t0)
+        return False
+
+def inc(name: str, value: float = 1.0, **labels: str):
+    registry.inc(name, value, **labels)
+
+def observe(name: str, seconds: float, **labels: str):
+    registry.observe(name, seconds, **labels)
+
+def set_gauge(name: str, value: float, **labels: str):
+    registry.set_gauge(name, value, **labels)
+
+def snapshot_path(directory: Path, pid: Optional[int] = None) -> Path:
+    return Path(directory) / f"metrics-{pid or os.getpid()}.json"
+
+def snapshot_pid_running(path: Path) -> bool:
+    try:
+        pid = int(path.stem.split("-", 1)[1])
+    except (IndexError, ValueError):
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def flush_snapshot(directory: Optional[str] = None):
+    global last_flush
+    directory = directory or metrics_dir
+    if not directory:
+        return
+    path = snapshot_path(Path(directory))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(registry.snapshot()), encoding="utf-8")
+    os.replace(tmp, path)
+    last_flush = time.monotonic()
+
+def maybe_flush():
+    if metrics_dir and time.monotonic() - last_flush >= metrics_flush_interval:
+        flush_snapshot()
+
+def render_metrics(directory: Optional[str] = None) -> str:
+    directory = directory or metrics_dir
+    if not directory:
+        return registry.render()
+    flush_snapshot(directory)
+    merged = MetricsRegistry(registry.buckets)
+    for path in sorted(Path(directory).glob("metrics-*.json")):
+        try:
+            merged.merge(json.loads(path.read_text(encoding="utf-8")),
+                         gauges=snapshot_pid_running(path))
+        except (OSError, ValueError):
+            continue
+    return merged.render()
+
+os.register_at_fork(after_in_child=registry.reset)
@@ -7,6 +7,7 @@ ROOT = Path(os.getenv("AURA_ROOT", Path(__file__).resolve().parents[3]))
 DATA_DIR  = ROOT / "data"
 PROCESSED_DIR = DATA_DIR / "processed"
 REG_DOCS_DIR = DATA_DIR / "reg_docs"
+REG_INDEX_DIR = DATA_DIR / "reg_index"
 
 CHROMA_DIR = ROOT / "chroma_store"
 LOG_DIR = ROOT / "logs"
@@ -30,6 +30,7 @@ def dummy_percentiles_df(monkeypatch):
     def fake_load():
         return df
     monkeypatch.setattr(predict_mod, "load_percentiles", fake_load)
+    monkeypatch.setattr(predict_mod, "percentile_index_cache", None)
     return df
 
 @pytest.fixture
@@ -64,14 +65,62 @@ def mock_explainer(monkeypatch):
 
 @pytest.fixture
 def mock_llm_raise(monkeypatch):
-    from src.explain import explainer as exp_mod
+    from aura.explain import explainer as exp_mod
     def boom(*args, **kwargs):
         raise RuntimeError("LLM down")
     monkeypatch.setattr(exp_mod, "call_llm", boom)
 
 @pytest.fixture
 def mock_llm_ok(monkeypatch):
-    from src.explain import explainer as exp_mod
+    from aura.explain import explainer as exp_mod
     def ok(prompt, temperature=0.25, max_tokens=1000):
         return "Fake narrative. (Model-version: v1)"
-    monkeypatch.setattr(exp_mod, "call_llm", ok)
\ No newline at end of file
+    monkeypatch.setattr(exp_mod, "call_llm", ok)
+
+@pytest.fixture
+def llm_tier(monkeypatch):
+    from aura.explain import explainer as exp_mod
+    monkeypatch.setattr(exp_mod, "narrative_tiering", False)
+
+@pytest.fixture(autouse=True)
+def isolated_narrative_cache(monkeypatch):
+    from aura.explain import explainer as exp_mod
+    from aura.explain.cache import NarrativeCache
+    cache = NarrativeCache(max_entries=16, ttl_seconds=3600, db_path=None)
+    monkeypatch.setattr(exp_mod, "narrative_cache", cache)
+    return cache
+
+@pytest.fixture(autouse=True)
+def isolated_prediction_memo(monkeypatch):
+    from aura.models.memo import PredictionMemo
+    memo = PredictionMemo(max_entries=16)
+    monkeypatch.setattr(predict_mod, "prediction_memo", memo)
+    return memo
+
+@pytest.fixture(autouse=True)
+def isolated_job_store(monkeypatch, tmp_path):
+    from aura.api import server
+    path = tmp_path / "explain_jobs.sqlite"
+    monkeypatch.setattr(server, "explain_jobs_path", str(path))
+    return path
+
+@pytest.fixture(autouse=True)
+def isolated_audit_logs(monkeypatch, tmp_path):
+    from aura.explain import explainer as exp_mod
+    from aura.models import shadow as shadow_mod
+    from aura.utils.audit import close_audit_logs
+    monkeypatch.setattr(predict_mod, "prediction_log_path", str(tmp_path / "predictions.log"))
+    monkeypatch.setattr(exp_mod, "explanation_log_path", str(tmp_path / "explanations.log"))
+    monkeypatch.setattr(shadow_mod, "shadow_log_path", str(tmp_path / "shadow.log"))
+    monkeypatch.setattr(shadow_mod, "shadow_challengers", [])
+    yield tmp_path
+    shadow_mod.close_shadow_scorer()
+    close_audit_logs()
+
+@pytest.fixture(autouse=True)
+def isolated_reg_index(monkeypatch, tmp_path):
+    from aura.rag import index as rag_mod
+    monkeypatch.setattr(rag_mod, "rag_index_dir", str(tmp_path / "reg_index"))
+    monkeypatch.setattr(rag_mod, "rag_index_check", 0.0)
+    monkeypatch.setattr(rag_mod, "reg_index_cache", None)
+    monkeypatch.setattr(rag_mod, "reg_index_stamp", None)
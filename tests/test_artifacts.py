@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from aura.app import config as config_mod
+from aura.models import artifacts as artifacts_mod
+from aura.models import predict as p
+from aura.models.artifacts import build_bundle, load_bundle
+
+
+def _applicants():
+    return [{"grade": g, "term": t, "acc_open_past_24mths": i, "dti": 5.0 + 3 * i, "fico_mid": 600 + 20 * i}
+            for i, (g, t) in enumerate((g, t) for g in "ABCDEFG" for t in (36, 60))]
+
+
+def _use_bundle(monkeypatch, path):
+    monkeypatch.setattr(artifacts_mod, "bundle_dir", str(path))
+    monkeypatch.setattr(artifacts_mod, "artifact_bundle_cache", None)
+    monkeypatch.setattr(config_mod, "bundle_dir", str(path))
+    monkeypatch.setattr(config_mod, "threshold_cache", None)
+    for name in ("sur_cache", "background_cache", "attribution_cache", "percentiles_cache",
+                 "percentile_index_cache", "compiled_cache", "explainer_cache"):
+        monkeypatch.setattr(p, name, None)
+
+
+def test_bundle_matches_legacy_loaders(tmp_path):
+    manifest = build_bundle(tmp_path)
+    bundle = load_bundle(tmp_path)
+    assert manifest["format"] == "aura-bundle-v1"
+    assert isinstance(bundle.scorer.coef, np.memmap)
+    assert isinstance(bundle.background_transformed, np.memmap)
+
+    rows = _applicants()
+    legacy = p.load_compiled_scorer()
+    np.testing.assert_array_equal(bundle.scorer.predict_proba(rows), legacy.predict_proba(rows))
+    attr, pre = p.build_attribution()
+    x = legacy.transform(rows)
+    np.testing.assert_array_equal(bundle.attribution.aggregate(x)[0], attr.aggregate(x)[0])
+    assert bundle.attribution.reason_names == attr.reason_names
+    index = p.load_percentile_index()
+    for feat in index.anchors:
+        np.testing.assert_array_equal(bundle.percentiles.anchors[feat].xp, index.anchors[feat].xp)
+    np.testing.assert_array_equal(bundle.background_transformed, p.transformed_background(pre).toarray())
+    assert manifest["threshold"]["value"] == config_mod.get_threshold_config().value
+
+
+@pytest.mark.parametrize("mode", ["sklearn", "compiled"])
+def test_predictions_from_bundle_match_legacy(tmp_path, monkeypatch, mode):
+    monkeypatch.setattr(p, "scoring_mode", mode)
+    rows = _applicants()
+    reference = p.predict_batch_with_explanations(rows)
+    build_bundle(tmp_path)
+    _use_bundle(monkeypatch, tmp_path)
+    out = p.predict_batch_with_explanations(rows)
+    strip = lambda b: {k: v for k, v in b.items() if k not in ("prediction_id", "timestamp")}
+    assert [strip(b) for b in out] == [strip(b) for b in reference]
+    assert p.compiled_cache is None or p.compiled_cache is artifacts_mod.artifact_bundle_cache.scorer
+
+
+def test_tampered_bundle_is_rejected(tmp_path):
+    build_bundle(tmp_path)
+    with open(tmp_path / "attribution_coef.npy", "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError, match="checksum"):
+        load_bundle(tmp_path)
+    load_bundle(tmp_path, verify=False)
@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from aura.api import server
+from aura.explain import explainer as exp_mod
+
+
+class FakeAsyncClient:
+    def __init__(self, delay=0.01, text="Async narrative."):
+        self.delay = delay
+        self.text = text
+        self.in_flight = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        msg = SimpleNamespace(content=self.text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg)])
+
+    async def close(self):
+        pass
+
+
+def _bundle(i):
+    prob = 0.1 + i / 1000
+    return {
+        "timestamp": "2025-01-01T00:00:00Z", "model_version": "v1",
+        "threshold_policy": "profit", "threshold": 0.115, "near_threshold_band": 0.02,
+        "prob_default": prob, "threshold_delta": prob - 0.115, "risk_class": "High",
+        "raw_input": {}, "engineered": {}, "top_local_shap": []
+    }
+
+
+def test_llm_concurrency_is_bounded(monkeypatch):
+    fake = FakeAsyncClient(delay=0.02)
+    monkeypatch.setattr(exp_mod, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(exp_mod, "async_client", fake)
+    monkeypatch.setattr(exp_mod, "save_explanation_log", lambda record: None)
+
+    async def run():
+        monkeypatch.setattr(exp_mod, "llm_semaphore", asyncio.Semaphore(3))
+        return await asyncio.gather(*(exp_mod.agenerate_explanation(_bundle(i)) for i in range(12)))
+
+    results = asyncio.run(run())
+    assert all(r["narrative"].startswith("Async narrative.") for r in results)
+    assert fake.peak == 3
+
+
+def test_predict_explain_async_path(valid_payload, mock_model, mock_explainer, monkeypatch, llm_tier):
+    async def fake_acall(prompt, temperature=0.25, max_tokens=1000):
+        return "Narrative from async client."
+    monkeypatch.setattr(exp_mod, "acall_llm", fake_acall)
+    monkeypatch.setattr(exp_mod, "save_explanation_log", lambda record: None)
+    with TestClient(server.app) as client:
+        r = client.post("/predict_explain", json=valid_payload)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["explanation"]["narrative"] == "Narrative from async client."
+    assert body["prediction"]["risk_class"] == "High"
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from aura.models import predict as p
+
+
+def _applicants():
+    return pd.DataFrame([
+        {"grade": "B", "term": 36, "acc_open_past_24mths": 1, "dti": 10.0, "fico_mid": 700},
+        {"grade": "G", "term": 36, "acc_open_past_24mths": 20, "dti": 50.0, "fico_mid": 600},
+        {"grade": "A", "term": 60, "acc_open_past_24mths": 0, "dti": 0.0, "fico_mid": 850},
+        {"grade": "E", "term": 60, "acc_open_past_24mths": 7, "dti": 33.3, "fico_mid": 300},
+    ])
+
+
+def test_linear_attribution_matches_shap():
+    explainer, pre = p.build_explainer()
+    attr, _ = p.build_attribution()
+    x = pre.transform(p.engineer(_applicants()))
+    expected = np.asarray(explainer.shap_values(x))
+    np.testing.assert_allclose(attr.shap_values(x), expected, rtol=1e-10, atol=1e-12)
+    assert np.isclose(attr.expected_value, float(explainer.expected_value))
+
+
+def test_aggregate_picks_active_grade_term():
+    explainer, pre = p.build_explainer()
+    attr, _ = p.build_attribution()
+    x = pre.transform(p.engineer(_applicants()))
+    dense = x.toarray()
+    expected = np.asarray(explainer.shap_values(x))
+    contribs, level = attr.aggregate(x)
+    assert attr.reason_names[-1] == "grade_term"
+    np.testing.assert_allclose(contribs[:, :-1], expected[:, attr.numeric_idx])
+    for i in range(len(dense)):
+        col = attr.one_hot_idx[level[i]]
+        assert dense[i, col] == 1
+        assert np.isclose(contribs[i, -1], expected[i, col])
+
+
+def test_batch_reasons_match_single_row():
+    raw = _applicants()
+    eng = p.engineer(raw)
+    rows = raw.to_dict(orient="records")
+    batch = p.local_shap_batch(eng, rows)
+    for i, row in enumerate(rows):
+        assert batch[i] == p.local_shap(eng.iloc[[i]], row)
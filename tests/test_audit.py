@@ -0,0 +1,87 @@
+import gzip, json
+from aura.utils.audit import AuditLog, close_audit_logs
+from aura.models.predict import save_prediction_log
+from aura.explain import explainer as exp_mod
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def test_audit_log_batches_and_drains(tmp_path):
+    log = AuditLog(tmp_path / "a.log", batch_size=4, flush_interval=0.05, fsync="never")
+    for i in range(10):
+        assert log.write({"i": i})
+    log.close()
+    assert [r["i"] for r in read_lines(tmp_path / "a.log")] == list(range(10))
+    stats = log.stats()
+    assert stats["written"] == 10 and stats["queue_depth"] == 0 and stats["batches"] >= 3
+    assert not log.write({"i": 10})
+    assert log.stats()["dropped"] == 1
+
+def test_audit_log_rotates_and_compresses(tmp_path):
+    log = AuditLog(tmp_path / "r.log", batch_size=1, flush_interval=0.05,
+                   max_bytes=64, compression="gzip")
+    for i in range(5):
+        log.write({"i": i, "pad": "x" * 80})
+    log.close()
+    segments = sorted(tmp_path.glob("r.log.*.gz"))
+    assert len(segments) == log.stats()["rotations"] == 5
+    rows = [json.loads(gzip.decompress(p.read_bytes())) for p in segments]
+    assert sorted(r["i"] for r in rows) == list(range(5))
+
+def test_explanation_log_references_prediction(isolated_audit_logs):
+    bundle = {"prediction_id": "abc", "model_version": "v1", "prob_default": 0.2,
+              "risk_class": "High", "top_local_shap": [{"feature": "x"}]}
+    save_prediction_log(bundle)
+    exp_mod.log_narrative(bundle, "Narrative.", "key", cached=False)
+    close_audit_logs()
+    pred = read_lines(isolated_audit_logs / "predictions.log")
+    expl = read_lines(isolated_audit_logs / "explanations.log")
+    assert pred[0]["prediction_id"] == expl[0]["prediction_id"] == "abc"
+    assert "prediction" not in expl[0] and "top_local_shap" not in expl[0]
+
+def test_failed_writes_are_retried_then_counted(tmp_path, monkeypatch, caplog):
+    from aura.utils import metrics as metrics_mod
+    from aura.utils.metrics import MetricsRegistry
+    monkeypatch.setattr(metrics_mod, "registry", MetricsRegistry())
+    log = AuditLog(tmp_path / "t.log", batch_size=10, flush_interval=0.05, fsync="never",
+                   max_retries=2, retry_delay=0)
+    flush, calls = log._flush, []
+    def flaky(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        flush(batch)
+    monkeypatch.setattr(log, "_flush", flaky)
+    for i in range(3):
+        log.write({"i": i})
+    log.close()
+    assert [r["i"] for r in read_lines(tmp_path / "t.log")] == [0, 1, 2]
+    assert log.stats()["errors"] == 1 and log.stats()["retries"] == 1 and log.stats()["lost"] == 0
+    assert "disk full" in caplog.text
+
+    blocked = tmp_path / "not-a-dir"
+    blocked.write_text("")
+    bad = AuditLog(blocked / "b.log", flush_interval=0.05, max_retries=2, retry_delay=0)
+    bad.write({"i": 0})
+    bad.close()
+    stats = bad.stats()
+    assert stats["errors"] == 3 and stats["lost"] == 1 and stats["written"] == 0
+    text = metrics_mod.registry.render()
+    assert 'aura_audit_errors_total{log="b.log"} 3' in text
+    assert 'aura_audit_lost_records_total{log="b.log"} 1' in text
+    assert 'aura_audit_queue_depth{log="b.log"} 0' in text
+    assert "lost 1 records after 3 attempts" in caplog.text
+
+def test_writers_sharing_a_file_survive_rotation(tmp_path):
+    path = tmp_path / "s.log"
+    rotating = AuditLog(path, batch_size=1, flush_interval=0.01, max_bytes=200, compression="gzip")
+    other = AuditLog(path, batch_size=1, flush_interval=0.01, max_bytes=0)
+    for i in range(30):
+        (rotating if i % 2 else other).write({"i": i, "pad": "x" * 40})
+    rotating.close()
+    other.close()
+    rows = read_lines(path) if path.exists() else []
+    for seg in tmp_path.glob("s.log.*.gz"):
+        rows += [json.loads(line) for line in gzip.decompress(seg.read_bytes()).splitlines()]
+    assert rotating.stats()["rotations"] >= 2 and other.stats()["written"] == 15
+    assert sorted(r["i"] for r in rows) == list(range(30))
@@ -0,0 +1,64 @@
+import json
+import numpy as np
+from fastapi.testclient import TestClient
+
+from aura.models import predict as predict_mod
+from aura.api import server
+
+
+def _patch_batch(monkeypatch):
+    class DummyModel:
+        def predict_proba(self, X):
+            p = np.linspace(0.05, 0.30, len(X))
+            return np.column_stack([1 - p, p])
+
+    def fake_local_shap_batch(eng_df, raw_rows, max_reasons=5):
+        return [[{"feature": "FICO Score", "applicant_value": r["fico_mid"],
+                  "shap_contribution": -0.1, "magnitude": "High"}] for r in raw_rows]
+
+    monkeypatch.setattr(predict_mod, "load_sur", lambda: DummyModel())
+    monkeypatch.setattr(predict_mod, "local_shap_batch", fake_local_shap_batch)
+
+
+def test_batch_keeps_order_and_reports_errors(valid_payload, monkeypatch):
+    _patch_batch(monkeypatch)
+    bad = dict(valid_payload, fico_mid=900)
+    out = predict_mod.predict_batch_with_explanations([valid_payload, bad, valid_payload])
+    assert [o["index"] for o in out] == [0, 1, 2]
+    assert "FICO" in out[1]["error"]
+    assert out[0]["raw_input"] == valid_payload
+    assert out[2]["prob_default"] > out[0]["prob_default"]
+
+
+def test_predict_batch_streams_ndjson(valid_payload, monkeypatch):
+    _patch_batch(monkeypatch)
+    client = TestClient(server.app)
+    applicants = [valid_payload] * 5 + [{"grade": "Z"}]
+    r = client.post("/predict_batch", json={"applicants": applicants, "chunk_size": 2})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(l) for l in r.text.splitlines()]
+    assert [l["index"] for l in lines] == list(range(6))
+    assert all("prediction" in l for l in lines[:5])
+    assert "error" in lines[5]
+
+
+def test_predict_batch_rejects_oversized_requests(valid_payload, monkeypatch):
+    _patch_batch(monkeypatch)
+    client = TestClient(server.app)
+    limit = server.batch_max_rows
+    r = client.post("/predict_batch", json={"applicants": [valid_payload] * (limit + 1)})
+    assert r.status_code == 422
+
+
+def test_batch_validation_matches_single_payload_rules(valid_payload):
+    from aura.app.config import validate_batch
+    rows = [valid_payload, dict(valid_payload, term="60 months", fico_mid="700"),
+            {"grade": "A"}, dict(valid_payload, extra=1), "nope", dict(valid_payload, dti=-1)]
+    cleaned, errors = validate_batch(rows)
+    assert cleaned[0] == valid_payload and errors[0] is None
+    assert cleaned[1]["term"] == 60 and cleaned[1]["fico_mid"] == 700
+    assert errors[2].startswith("Missing required features")
+    assert errors[3] == "Unexpected feature 'extra'"
+    assert errors[4] == "Applicant must be a JSON object"
+    assert cleaned[5] is None and errors[5]
@@ -0,0 +1,38 @@
+from aura.app.config import validate_ui_payload
+from aura.models.bench import background_applicants, compare_to_baseline, run_benchmarks
+
+
+def test_background_applicants_are_valid():
+    rows = background_applicants(50, seed=3)
+    assert len(rows) == 50
+    for r in rows:
+        validate_ui_payload(r, require_all=True)
+
+
+def test_run_benchmarks_reports_percentiles():
+    out = run_benchmarks(sizes=[1, 4], cases=["engineer", "build_explainer_warm",
+                                              "predict_with_explanations"], repeats=3)
+    keys = {(r["case"], r["batch_size"]) for r in out["results"]}
+    assert keys == {("engineer", 1), ("engineer", 4), ("build_explainer_warm", 1),
+                    ("predict_with_explanations", 1), ("predict_with_explanations", 4)}
+    for r in out["results"]:
+        assert r["repeats"] == 3
+        assert r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"]
+        assert r["rows_per_s"] > 0 and r["peak_mem_mb"] >= 0
+    assert out["meta"]["model_version"]
+
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = {"results": [{"case": "engineer", "batch_size": 1, "p50_ms": 1.0},
+                            {"case": "local_shap", "batch_size": 1, "p50_ms": 2.0}]}
+    current = {"results": [{"case": "engineer", "batch_size": 1, "p50_ms": 1.5},
+                           {"case": "local_shap", "batch_size": 1, "p50_ms": 2.1},
+                           {"case": "new_case", "batch_size": 1, "p50_ms": 9.0}]}
+    rows = {r["case"]: r for r in compare_to_baseline(current, baseline, tolerance=0.25)}
+    assert rows["engineer"]["regression"] and not rows["local_shap"]["regression"]
+    assert "new_case" not in rows
+
+
+def test_percentile_lookup_case_hits_the_index():
+    out = run_benchmarks(sizes=[3], cases=["percentile_lookup"], repeats=1)
+    assert [(r["case"], r["batch_size"]) for r in out["results"]] == [("percentile_lookup", 3)]
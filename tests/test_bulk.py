@@ -0,0 +1,40 @@
+import json
+import numpy as np
+import pandas as pd
+
+from aura.models import predict as predict_mod
+from aura.models.bulk import score_file
+
+
+def _patch_model(monkeypatch):
+    class DummyModel:
+        def predict_proba(self, X):
+            p = np.full(len(X), 0.2)
+            return np.column_stack([1 - p, p])
+
+    def fake_local_shap_batch(eng_df, raw_rows, max_reasons=5):
+        return [[{"feature": "FICO Score", "applicant_value": r["fico_mid"],
+                  "shap_contribution": -0.1}] for r in raw_rows]
+
+    monkeypatch.setattr(predict_mod, "load_sur", lambda: DummyModel())
+    monkeypatch.setattr(predict_mod, "local_shap_batch", fake_local_shap_batch)
+
+
+def test_score_file_chunks_and_reports_errors(valid_payload, monkeypatch, tmp_path):
+    _patch_model(monkeypatch)
+    rows = [dict(valid_payload, fico_mid=700 + i) for i in range(7)]
+    rows[4]["fico_mid"] = 900
+    src = tmp_path / "applicants.csv"
+    pd.DataFrame(rows).to_csv(src, index=False)
+    out = tmp_path / "scored.parquet"
+
+    stats = score_file(src, out, chunk_size=3, workers=1)
+    assert stats == {"rows": 7, "errors": 1, "chunks": 3}
+
+    df = pd.read_parquet(out)
+    assert df["row_index"].tolist() == list(range(7))
+    assert "FICO" in df.loc[4, "error"] and pd.isna(df.loc[4, "prob_default"])
+    ok = df.drop(index=4)
+    assert ok["error"].isna().all() and (ok["risk_class"] == "High").all()
+    assert ok.iloc[0]["raw_input"]["grade"] == "A"
+    assert json.loads(ok.iloc[0]["top_local_shap"])[0]["applicant_value"] == 700
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from aura.models import predict as p
+
+
+def _random_applicants(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{
+        "grade": str(rng.choice(list("ABCDEFG"))),
+        "term": int(rng.choice([36, 60])),
+        "acc_open_past_24mths": int(rng.integers(0, 60)),
+        "dti": float(rng.uniform(0, 100)),
+        "fico_mid": int(rng.integers(300, 851)),
+    } for _ in range(n)]
+
+
+def test_compiled_matches_sklearn_pipeline():
+    rows = _random_applicants(2000)
+    rows[0]["dti"] = 0.0
+    sur = p.load_sur()
+    scorer = p.load_compiled_scorer()
+    eng = p.engineer(pd.DataFrame(rows, columns=p.ui_features))
+    expected = sur.predict_proba(eng)
+    np.testing.assert_allclose(scorer.predict_proba(rows), expected, rtol=0, atol=1e-12)
+    pre, _ = p.surrogate_parts()
+    np.testing.assert_array_equal(scorer.transform(rows), pre.transform(eng).toarray())
+    assert scorer.engineered_rows(rows[:3]) == eng.head(3).to_dict(orient="records")
+
+
+def test_compiled_mode_bundle_matches_sklearn_mode(monkeypatch):
+    rows = _random_applicants(50, seed=1)
+    reference = [p.predict_with_explanations(r) for r in rows]
+    monkeypatch.setattr(p, "scoring_mode", "compiled")
+    for r, ref in zip(rows, reference):
+        out = p.predict_with_explanations(r)
+        assert abs(out["prob_default"] - ref["prob_default"]) < 1e-12
+        assert out["risk_class"] == ref["risk_class"]
+        assert out["engineered"] == ref["engineered"]
+        assert [x["feature"] for x in out["top_local_shap"]] == [x["feature"] for x in ref["top_local_shap"]]
+        assert [x["percentile"] for x in out["top_local_shap"]] == [x["percentile"] for x in ref["top_local_shap"]]
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("lightgbm")
+
+from aura.app.config import InputError
+from aura.models.engines import ScoringEngine, get_engine, load_lgbm_engine
+from aura.api import server
+
+
+def _random_rows(engine, n, seed=0):
+    rng = np.random.default_rng(seed)
+    names = engine.feature_names
+    x = rng.normal(size=(n, len(names)))
+    for j, levels in engine.categories.items():
+        x[:, j] = rng.integers(0, len(levels), n)
+    x[rng.random(x.shape) < 0.05] = np.nan
+    return x
+
+
+def _marginal(node, x, known):
+    if "leaf_value" in node:
+        return node["leaf_value"]
+    f = node["split_feature"]
+    left, right = node["left_child"], node["right_child"]
+    if known[f]:
+        go_left = x[f] <= node["threshold"] if node["decision_type"] == "<=" else \
+            not np.isnan(x[f]) and int(x[f]) in {int(c) for c in node["threshold"].split("||")}
+        return _marginal(left if go_left else right, x, known)
+    cl = left.get("internal_count", left.get("leaf_count"))
+    cr = right.get("internal_count", right.get("leaf_count"))
+    return (cl * _marginal(left, x, known) + cr * _marginal(right, x, known)) / (cl + cr)
+
+
+def test_lgbm_engine_matches_calibrated_model():
+    import joblib
+    from aura.app.config import lgbm_path
+    engine = load_lgbm_engine()
+    x = _random_rows(engine, 300)
+    df = pd.DataFrame(x, columns=engine.feature_names)
+    for j, levels in engine.categories.items():
+        codes = np.nan_to_num(x[:, j], nan=-1).astype(int)
+        df[engine.feature_names[j]] = pd.Categorical.from_codes(codes, list(levels))
+    expected = joblib.load(lgbm_path).predict_proba(df)[:, 1]
+    np.testing.assert_allclose(engine.predict_proba_matrix(x), expected, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(engine.trees.expected_raw(x, np.ones(x.shape, bool)),
+                               engine.raw_score(x), rtol=0, atol=1e-9)
+
+
+def test_expected_raw_integrates_out_unknown_features():
+    engine = load_lgbm_engine()
+    x = np.nan_to_num(_random_rows(engine, 4, seed=1))
+    known = np.random.default_rng(2).random(x.shape) < 0.3
+    trees = engine.booster.dump_model()["tree_info"]
+    expected = [sum(_marginal(t["tree_structure"], x[i], known[i]) for t in trees) for i in range(4)]
+    np.testing.assert_allclose(engine.trees.expected_raw(x, known), expected, rtol=0, atol=1e-9)
+
+
+def test_lgbm_full_payload_validation():
+    engine = load_lgbm_engine()
+    full = engine.benchmark_payloads(1)[0]
+    missing = dict(full)
+    del missing["fico_mid"]
+    out = engine.predict_full_batch([
+        {**full, "grade": "B", "dti": None},
+        {**full, "purpose": "not-a-purpose"},
+        {**full, "unknown_feature": 1},
+        {**full, "dti": "abc"},
+        missing,
+        {"grade": "A"},
+    ])
+    assert out[0]["engine"] == "lgbm" and out[0]["raw_input"]["grade"] == "B"
+    assert out[0]["raw_input"]["dti"] is None and 0.0 <= out[0]["prob_default"] <= 1.0
+    assert out[1]["error"] == "Unknown category 'not-a-purpose' for 'purpose'"
+    assert "Unexpected feature" in out[2]["error"]
+    assert "numeric" in out[3]["error"]
+    assert out[4]["error"] == "Missing required features: ['fico_mid']"
+    assert out[5]["error"].startswith("Missing required features:") and "more" in out[5]["error"]
+    with pytest.raises(InputError):
+        engine.predict({"grade": "A", "term": 36, "acc_open_past_24mths": 1, "dti": 10, "fico_mid": 700})
+    with pytest.raises(InputError):
+        get_engine("nope")
+    with pytest.raises(TypeError):
+        ScoringEngine()
+
+
+def test_predict_endpoint_selects_engine(valid_payload):
+    with TestClient(server.app) as client:
+        lgbm = client.post("/predict", params={"engine": "lgbm"}, json=valid_payload)
+        assert lgbm.status_code == 422 and "/predict_full" in lgbm.json()["detail"]
+        batch = client.post("/predict_batch", json={"engine": "lgbm", "applicants": [valid_payload]})
+        assert batch.status_code == 422
+        assert client.post("/predict", params={"engine": "nope"}, json=valid_payload).status_code == 422
+        partial = client.post("/predict_full", json={"engine": "lgbm", "features": {"grade": "A"}})
+        assert partial.status_code == 422
+        features = load_lgbm_engine().benchmark_payloads(1)[0]
+        full = client.post("/predict_full", json={"engine": "lgbm", "features": features})
+        assert full.status_code == 200 and 0.0 <= full.json()["prob_default"] <= 1.0
+        assert full.json()["engine"] == "lgbm" and full.json()["model_version"] == "lgbm-v1"
+        names = [e["engine"] for e in client.get("/engines").json()["engines"]]
+        assert names == ["surrogate", "lgbm", "logreg"]
@@ -1,7 +1,11 @@
+import asyncio
+
+from aura.explain import explainer as exp_mod
 from aura.explain.explainer import generate_explanation
+from aura.explain.template import review_sentence
 
-def test_llm_fallback(valid_payload, mock_model, mock_explainer, mock_llm_raise):
-    fake_bundle = {
+def _bundle(valid_payload):
+    return {
         "timestamp": "2025-01-01T00:00:00Z",
         "model_version": "v1",
         "threshold_policy": "profit",
@@ -21,5 +25,33 @@ def test_llm_fallback(valid_payload, mock_model, mock_explainer, mock_llm_raise)
         }]
     }
 
-    result = generate_explanation(fake_bundle, retries=1)
-    assert "Explanation unavailable" in result["narrative"]
\ No newline at end of file
+
+def test_llm_fallback(valid_payload, mock_model, mock_explainer, mock_llm_raise, llm_tier):
+    result = generate_explanation(_bundle(valid_payload), retries=1)
+    assert result["error"] == "LLM down"
+    assert "**FICO Score**: 750, 80th pct, ↓ risk, High magnitude" in result["narrative"]
+    assert result["narrative"].endswith(review_sentence + "\n\n(Model version: v1)")
+
+
+def test_no_sleep_after_the_final_attempt(valid_payload, monkeypatch, llm_tier):
+    sleeps, calls = [], []
+    def failing(prompt, **kw):
+        calls.append(prompt)
+        raise RuntimeError("LLM down")
+    async def afailing(prompt, **kw):
+        return failing(prompt)
+    async def asleep(delay):
+        sleeps.append(delay)
+    monkeypatch.setattr(exp_mod, "call_llm", failing)
+    monkeypatch.setattr(exp_mod, "acall_llm", afailing)
+    monkeypatch.setattr(exp_mod.time, "sleep", sleeps.append)
+    monkeypatch.setattr(exp_mod.asyncio, "sleep", asleep)
+
+    assert generate_explanation(_bundle(valid_payload), retries=2)["error"] == "LLM down"
+    assert len(calls) == 3 and sleeps == [exp_mod.retry_delay] * 2
+    assert calls[1].endswith(exp_mod.retry_suffix) and not calls[0].endswith(exp_mod.retry_suffix)
+
+    calls.clear()
+    sleeps.clear()
+    out = asyncio.run(exp_mod.agenerate_explanation(_bundle(valid_payload), retries=1))
+    assert out["error"] == "LLM down" and len(calls) == 2 and len(sleeps) == 1
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+
+heavy_modules = ["shap", "openai", "sklearn", "scipy", "joblib", "lightgbm"]
+import_budget_us = {"aura.app.config": 100_000, "aura.app.main": 600_000}
+
+
+def _import(module, tmp_path, code=""):
+    env = {**os.environ, "models": str(tmp_path / "models")}
+    probe = (f"import sys, json, {module}\n{code}\n"
+             f"print(json.dumps(sorted(m for m in {heavy_modules!r} if m in sys.modules)))")
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=tmp_path, env=env,
+                         capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in out.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cum, name = line.split("|")
+            if cum.strip().isdigit():
+                cumulative[name.strip()] = int(cum)
+    return cumulative, json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_cli_import_skips_heavy_modules_and_stays_in_budget(tmp_path):
+    for module, budget in import_budget_us.items():
+        cumulative, loaded = _import(module, tmp_path)
+        assert loaded == [], f"{module} imported {loaded}"
+        assert cumulative[module] < budget, f"{module} took {cumulative[module] / 1e3:.0f} ms"
+
+
+def test_scoring_modules_defer_heavy_imports(tmp_path):
+    for module in ("aura.models.predict", "aura.explain.explainer", "aura.api.server"):
+        _, loaded = _import(module, tmp_path)
+        assert loaded == [], f"{module} imported {loaded}"
+
+
+def test_config_import_has_no_filesystem_side_effects(tmp_path):
+    _import("aura.app.config", tmp_path,
+            "from aura.app import config\nassert config.decision_threshold == config.default_threshold_value")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from aura.api import server
+from aura.explain import jobs as jobs_mod
+
+
+def _bundle(delta):
+    return {"threshold_delta": delta, "near_threshold_band": 0.02,
+            "prob_default": 0.115 + delta, "risk_class": "High"}
+
+
+def test_near_threshold_jobs_run_first(tmp_path, monkeypatch):
+    order = []
+    async def fake_generate(bundle):
+        order.append(bundle["threshold_delta"])
+        return {"narrative": f"delta {bundle['threshold_delta']}"}
+    monkeypatch.setattr(jobs_mod, "agenerate_explanation", fake_generate)
+
+    async def run():
+        q = jobs_mod.ExplanationQueue(jobs_mod.JobStore(tmp_path / "jobs.sqlite"), workers=0)
+        await q.start()
+        ids = [await q.submit(_bundle(d)) for d in (0.3, -0.25, 0.01, 0.2, -0.015)]
+        q._tasks.append(asyncio.create_task(q._worker()))
+        await q.join()
+        await q.stop()
+        return q, ids, await q.get(ids[0])
+
+    q, ids, first = asyncio.run(run())
+    assert order[:2] == [0.01, -0.015]
+    assert first["status"] == "done"
+    assert q.stats()["completed"] == 5
+
+
+def test_queued_jobs_survive_restart(tmp_path, monkeypatch):
+    async def fake_generate(bundle):
+        return {"narrative": "recovered"}
+    monkeypatch.setattr(jobs_mod, "agenerate_explanation", fake_generate)
+    path = tmp_path / "jobs.sqlite"
+
+    store = jobs_mod.JobStore(path)
+    store.insert("a", 1, _bundle(0.3))
+    store.insert("b", 0, _bundle(0.0))
+    store.update("b", "running")
+    store.close()
+
+    async def run():
+        q = jobs_mod.ExplanationQueue(jobs_mod.JobStore(path), workers=2)
+        await q.start()
+        await q.join()
+        await q.stop()
+        return await q.get("a"), await q.get("b")
+
+    a, b = asyncio.run(run())
+    assert a["narrative"] == "recovered"
+    assert b["status"] == "done"
+
+
+def test_queue_rejects_when_full(tmp_path):
+    async def run():
+        q = jobs_mod.ExplanationQueue(jobs_mod.JobStore(tmp_path / "jobs.sqlite"),
+                                      workers=0, max_pending=2)
+        await q.start()
+        await q.submit(_bundle(0.1))
+        await q.submit(_bundle(0.1))
+        try:
+            await q.submit(_bundle(0.1))
+        except jobs_mod.QueueFull:
+            return q
+        raise AssertionError("expected QueueFull")
+
+    assert asyncio.run(run()).stats()["rejected"] == 1
+
+
+def test_restart_leaves_live_workers_jobs_alone(tmp_path, monkeypatch):
+    path = tmp_path / "jobs.sqlite"
+    live = jobs_mod.JobStore(path)
+    for job_id in ("live", "dead", "expired", "queued"):
+        live.insert(job_id, 1, _bundle(0.3))
+    assert live.claim("live")["status"] == "running"
+    assert live.claim("live") is None
+    live.claim("dead")
+    live.claim("expired")
+    with live._lock:
+        live._conn.execute("UPDATE jobs SET owner = 2147483646 WHERE id = 'dead'")
+        live._conn.execute("UPDATE jobs SET lease_until = 0 WHERE id = 'expired'")
+        live._conn.commit()
+    monkeypatch.setattr(jobs_mod.os, "getpid", lambda: 1)
+
+    restarted = jobs_mod.JobStore(path)
+    requeued = {job_id for job_id, _ in restarted.requeue_incomplete()}
+    assert requeued == {"dead", "expired", "queued"}
+    assert restarted.get("live")["status"] == "running"
+    assert restarted.claim("dead")["status"] == "running" and live.claim("dead") is None
+
+
+def test_job_endpoints(valid_payload, mock_model, mock_explainer, monkeypatch):
+    async def fake_generate(bundle):
+        return {"narrative": "Queued narrative."}
+    monkeypatch.setattr(jobs_mod, "agenerate_explanation", fake_generate)
+    with TestClient(server.app) as client:
+        r = client.post("/explain/jobs", json=valid_payload)
+        assert r.status_code == 202
+        job_id = r.json()["job_id"]
+        assert r.json()["prediction"]["risk_class"] == "High"
+        for _ in range(50):
+            job = client.get(f"/explain/jobs/{job_id}").json()
+            if job["status"] == "done":
+                break
+            time.sleep(0.02)
+        assert job["narrative"] == "Queued narrative."
+        assert client.get("/explain/jobs/does-not-exist").status_code == 404
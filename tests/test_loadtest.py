@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+from openai import AsyncOpenAI
+
+from aura.api import server
+from aura.explain import explainer as exp_mod
+from aura.loadtest.fake_llm import FakeLLMConfig, create_fake_llm_app
+from aura.loadtest.loadgen import parse_metrics, run_load
+from aura.utils import metrics as metrics_mod
+from aura.utils.metrics import MetricsRegistry
+
+
+def _use_fake_llm(monkeypatch, **config):
+    fake_app = create_fake_llm_app(FakeLLMConfig(latency_ms=1, latency_dist="fixed", seed=0, **config))
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_app))
+    client = AsyncOpenAI(api_key="test-key", base_url="http://fake-llm/v1",
+                         http_client=http_client, max_retries=0)
+    monkeypatch.setattr(exp_mod, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(exp_mod, "async_client", client)
+    monkeypatch.setattr(exp_mod, "llm_semaphore", None)
+    monkeypatch.setattr(exp_mod, "retry_delay", 0)
+    return fake_app.state.fake
+
+
+def _bundle():
+    return {
+        "timestamp": "2025-01-01T00:00:00Z", "model_version": "v1",
+        "threshold_policy": "profit", "threshold": 0.115, "near_threshold_band": 0.02,
+        "prob_default": 0.2, "threshold_delta": 0.085, "risk_class": "High",
+        "raw_input": {}, "engineered": {}, "top_local_shap": []
+    }
+
+
+def test_fake_llm_completion_and_stream(monkeypatch):
+    fake = _use_fake_llm(monkeypatch)
+
+    async def run():
+        narrative = await exp_mod.acall_llm("prompt")
+        parts = [d async for d in exp_mod.astream_llm("prompt")]
+        return narrative, "".join(parts)
+
+    narrative, streamed = asyncio.run(run())
+    assert narrative.startswith("The applicant's estimated probability")
+    assert streamed == narrative
+    assert fake.requests == 2 and fake.streams == 1
+
+
+def test_malformed_output_exhausts_retries_then_falls_back(monkeypatch, llm_tier):
+    fake = _use_fake_llm(monkeypatch, malformed_rate=1.0)
+    out = asyncio.run(exp_mod.agenerate_explanation(_bundle(), retries=2))
+    assert out["narrative"].endswith("(Model version: v1)") and "error" in out
+    assert fake.requests == 3 and fake.malformed == 3
+
+
+def test_upstream_errors_are_retried(monkeypatch, llm_tier):
+    fake = _use_fake_llm(monkeypatch, error_rate=1.0)
+    out = asyncio.run(exp_mod.agenerate_explanation(_bundle(), retries=1))
+    assert "error" in out
+    assert fake.errors == 2
+
+
+def test_loadgen_reports_throughput_and_saturation(monkeypatch, llm_tier):
+    _use_fake_llm(monkeypatch)
+    monkeypatch.setattr(metrics_mod, "registry", MetricsRegistry())
+    payloads = [
+        {"grade": g, "term": 36, "acc_open_past_24mths": 2, "dti": 15.0, "fico_mid": 700}
+        for g in "ABC"
+    ]
+
+    async def run():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://aura") as client:
+            return await run_load(client, payloads, concurrency=3, requests=6)
+
+    report = asyncio.run(run())
+    assert report["completed"] == 6
+    assert report["statuses"] == {"200": 6}
+    assert report["fallback_rate"] == 0.0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+    assert report["server"]["executor_wait"]["calls"] == 6
+    assert report["server"]["llm_calls"] == 3
+
+
+def test_parse_metrics_reads_labels():
+    text = 'aura_stage_seconds_bucket{stage="executor_wait",le="0.001"} 4\naura_llm_retries_total 2\n'
+    parsed = parse_metrics(text)
+    assert parsed[("aura_stage_seconds_bucket", (("le", "0.001"), ("stage", "executor_wait")))] == 4
+    assert parsed[("aura_llm_retries_total", ())] == 2
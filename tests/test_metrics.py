@@ -0,0 +1,59 @@
+import json, os
+from fastapi.testclient import TestClient
+
+from aura.utils import metrics as metrics_mod
+from aura.utils.metrics import MetricsRegistry, render_metrics
+from aura.api import server
+
+
+def test_histogram_render_is_cumulative():
+    reg = MetricsRegistry(buckets=(0.01, 0.1))
+    for v in (0.005, 0.05, 0.5):
+        reg.observe("aura_stage_seconds", v, stage="engineer")
+    reg.inc("aura_llm_retries_total", 2)
+    text = reg.render()
+    assert 'aura_stage_seconds_bucket{stage="engineer",le="0.01"} 1' in text
+    assert 'aura_stage_seconds_bucket{stage="engineer",le="0.1"} 2' in text
+    assert 'aura_stage_seconds_bucket{stage="engineer",le="+Inf"} 3' in text
+    assert 'aura_stage_seconds_count{stage="engineer"} 3' in text
+    assert "# TYPE aura_llm_retries_total counter" in text
+    assert "aura_llm_retries_total 2" in text
+
+
+def test_multi_worker_snapshots_are_summed(tmp_path, monkeypatch):
+    other = MetricsRegistry()
+    other.inc("aura_requests_total", 3, route="/predict", method="POST", status="200")
+    (tmp_path / "metrics-999999.json").write_text(json.dumps(other.snapshot()))
+    local = MetricsRegistry()
+    local.inc("aura_requests_total", 2, route="/predict", method="POST", status="200")
+    monkeypatch.setattr(metrics_mod, "registry", local)
+    text = render_metrics(str(tmp_path))
+    assert 'aura_requests_total{method="POST",route="/predict",status="200"} 5' in text
+
+
+def test_dead_worker_gauges_are_not_merged(tmp_path, monkeypatch):
+    for pid, depth in ((999999, 7), (os.getppid(), 2)):
+        snap = MetricsRegistry()
+        snap.inc("aura_audit_errors_total", 1, log="predictions.log")
+        snap.set_gauge("aura_audit_queue_depth", depth, log="predictions.log")
+        (tmp_path / f"metrics-{pid}.json").write_text(json.dumps(snap.snapshot()))
+    monkeypatch.setattr(metrics_mod, "registry", MetricsRegistry())
+    text = render_metrics(str(tmp_path))
+    assert 'aura_audit_errors_total{log="predictions.log"} 2' in text
+    assert 'aura_audit_queue_depth{log="predictions.log"} 2' in text
+
+
+def test_metrics_endpoint_reports_stages(monkeypatch, valid_payload, mock_llm_raise, llm_tier):
+    from aura.explain import explainer as exp_mod
+    monkeypatch.setattr(exp_mod, "retry_delay", 0)
+    monkeypatch.setattr(metrics_mod, "registry", MetricsRegistry())
+    with TestClient(server.app) as client:
+        assert client.post("/predict_explain", json=valid_payload).status_code == 200
+        resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain")
+    text = resp.text
+    for stage in ("validate", "engineer", "predict_proba", "local_shap", "llm_call", "executor_wait"):
+        assert f'stage="{stage}"' in text
+    assert "aura_llm_retries_total 2" in text
+    assert "aura_llm_fallbacks_total 1" in text
+    assert 'aura_requests_total{method="POST",route="/predict_explain",status="200"} 1' in text
@@ -0,0 +1,96 @@
+import asyncio, sqlite3, threading, time
+
+from aura.explain import explainer as exp_mod
+from aura.explain.cache import NarrativeCache, cache_key
+
+
+def _bundle(prob=0.2, ts="2025-01-01T00:00:00Z", pct=80):
+    return {
+        "timestamp": ts,
+        "model_version": "v1",
+        "threshold_policy": "profit",
+        "threshold": 0.115,
+        "near_threshold_band": 0.02,
+        "prob_default": prob,
+        "threshold_delta": prob - 0.115,
+        "risk_class": "High",
+        "raw_input": {"grade": "A", "term": 36, "acc_open_past_24mths": 2,
+                      "dti": 15.0, "fico_mid": 750},
+        "engineered": {},
+        "top_local_shap": [{"feature": "FICO Score", "applicant_value": 750,
+                            "percentile": pct, "direction": "↓ risk", "magnitude": "High"}]
+    }
+
+
+def test_key_ignores_timestamp_and_rounds_pd():
+    a = exp_mod.prompt_payload(_bundle(0.20001, ts="2025-01-01T00:00:00Z"))
+    b = exp_mod.prompt_payload(_bundle(0.20004, ts="2026-06-01T12:00:00Z"))
+    c = exp_mod.prompt_payload(_bundle(0.2100))
+    assert cache_key(a) == cache_key(b)
+    assert cache_key(a) != cache_key(c)
+    assert cache_key(exp_mod.prompt_payload(_bundle(pct=81)), pct_step=5) == \
+        cache_key(exp_mod.prompt_payload(_bundle(pct=79)), pct_step=5)
+
+
+def test_lru_eviction_and_ttl():
+    cache = NarrativeCache(max_entries=2, ttl_seconds=0.05)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] >= 1
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    db = tmp_path / "narratives.sqlite"
+    NarrativeCache(db_path=db).put("k", "narrative text")
+    fresh = NarrativeCache(db_path=db)
+    assert fresh.get("k") == "narrative text"
+    assert fresh.stats()["disk_hits"] == 1
+    assert fresh.get("k") == "narrative text"
+    assert fresh.stats()["hits"] == 1
+
+
+def test_generate_explanation_reuses_cached_narrative(monkeypatch, isolated_narrative_cache, llm_tier):
+    calls = []
+    def fake_llm(prompt, temperature=0.25, max_tokens=1000):
+        calls.append(prompt)
+        return "Cached narrative."
+    monkeypatch.setattr(exp_mod, "call_llm", fake_llm)
+    monkeypatch.setattr(exp_mod, "save_explanation_log", lambda record: None)
+    first = exp_mod.generate_explanation(_bundle(ts="t1"))
+    second = exp_mod.generate_explanation(_bundle(ts="t2"))
+    assert first == second == {"narrative": "Cached narrative."}
+    assert len(calls) == 1
+    assert isolated_narrative_cache.stats()["hits"] == 1
+
+
+def test_async_paths_touch_the_cache_off_the_event_loop(monkeypatch, tmp_path, llm_tier):
+    cache = NarrativeCache(db_path=tmp_path / "narratives.sqlite")
+    monkeypatch.setattr(exp_mod, "narrative_cache", cache)
+    threads = []
+    for name in ("get", "put"):
+        method = getattr(cache, name)
+        def traced(*args, _method=method):
+            threads.append(threading.get_ident())
+            return _method(*args)
+        monkeypatch.setattr(cache, name, traced)
+    async def fake_llm(prompt, **kw):
+        return "Async narrative."
+    monkeypatch.setattr(exp_mod, "acall_llm", fake_llm)
+
+    async def run():
+        loop_thread = threading.get_ident()
+        first = await exp_mod.agenerate_explanation(_bundle())
+        events = [e async for e in exp_mod.astream_explanation(_bundle())]
+        return loop_thread, first, events
+    loop_thread, first, events = asyncio.run(run())
+    assert first == {"narrative": "Async narrative."} and events[-1]["cached"] is True
+    assert len(threads) == 3 and loop_thread not in threads
+    indexes = sqlite3.connect(tmp_path / "narratives.sqlite").execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+    assert ("narratives_created_at",) in indexes
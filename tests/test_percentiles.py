@@ -1,4 +1,11 @@
+import numpy as np
+import pandas as pd
+import pytest
+
 from aura.models import predict as p
+from aura.app.config import percentiles_path
+from aura.models.compiled import dti_epsilon
+from aura.models.percentiles import build_percentile_index
 
 def test_percentile_edges(dummy_percentiles_df):
  
@@ -8,4 +15,68 @@ def test_percentile_edges(dummy_percentiles_df):
 
 def test_engineered_mapping(dummy_percentiles_df):
     val = p.percentile_lookup(700**2, "fico_mid_sq")
-    assert 0.0 <= val <= 1.0
\ No newline at end of file
+    assert 0.0 <= val <= 1.0
+
+def test_array_lookup_matches_scalar(dummy_percentiles_df):
+    vals = np.array([-1, 0, 2.5, 5, 7, 10, 15, 20, 35, 50, 60])
+    arr = p.percentile_lookup(vals, "acc_open_past_24mths")
+    assert arr.shape == vals.shape
+    for v, a in zip(vals, arr):
+        assert a == pytest.approx(p.percentile_lookup(float(v), "acc_open_past_24mths"))
+
+
+def test_unknown_feature_and_nan(dummy_percentiles_df):
+    assert p.percentile_lookup(1.0, "not_a_feature") is None
+    assert p.percentile_lookup(float("nan"), "fico_mid_sq") is None
+    assert np.isnan(p.percentile_lookup(np.array([1.0]), "not_a_feature")).all()
+
+
+def test_ecdf_anchors_from_background():
+    bg = pd.DataFrame({"fico_mid_sq": np.array([600, 650, 700, 750, 800], dtype=float) ** 2,
+                       "dti_inv": 1.0 / (np.array([5, 10, 15, 20, 25], dtype=float) + dti_epsilon)})
+    idx = build_percentile_index(pd.DataFrame(), background=bg)
+    assert "fico_mid" in idx and "dti" in idx
+    assert idx.lookup(600, "fico_mid") == 0.0
+    assert idx.lookup(800, "fico_mid") == 1.0
+    assert idx.lookup(700, "fico_mid") == pytest.approx(0.6)
+    assert idx.lookup(15.0, "dti") == pytest.approx(0.6)
+
+
+def legacy_lookup(row, value):
+    anchors = sorted((int(k[1:]), float(v)) for k, v in row.items()
+                     if k.startswith("p") and k[1:].isdigit())
+    if value <= row["min"]:
+        return 0.0
+    if value >= row["max"]:
+        return 1.0
+    prev_q, prev_v = 0, row["min"]
+    for q, v in anchors:
+        if value <= v:
+            if v == prev_v:
+                return q / 100.0
+            return prev_q / 100.0 + (value - prev_v) / (v - prev_v) * ((q - prev_q) / 100.0)
+        prev_q, prev_v = q, v
+    q, v = anchors[-1]
+    return q / 100.0 + (value - v) / (row["max"] - v) * (1.0 - q / 100.0)
+
+
+real_rows = pd.read_csv(percentiles_path).to_dict(orient="records")
+
+
+@pytest.mark.parametrize("row", real_rows, ids=[r["feature"] for r in real_rows])
+def test_index_matches_legacy_interpolation(row):
+    idx = build_percentile_index(pd.DataFrame([row]))
+    anchors = [row["min"]] + [row[k] for k in row if k.startswith("p") and k[1:].isdigit()] + [row["max"]]
+    mids = [(a + b) / 2 for a, b in zip(anchors, anchors[1:])]
+    span = row["max"] - row["min"]
+    rng = np.random.default_rng(0)
+    values = np.array(anchors + mids + [row["min"] - span, row["max"] + span]
+                      + list(rng.uniform(row["min"], row["max"], 200)), dtype=float)
+    expected = [legacy_lookup(row, v) for v in values]
+    assert [idx.lookup(v, row["feature"]) for v in values] == pytest.approx(expected, abs=1e-12)
+    np.testing.assert_allclose(idx.lookup(values, row["feature"]), expected, rtol=0, atol=1e-12)
+    xp = np.array(anchors, dtype=float)
+    if np.all(np.diff(xp) > 0):
+        fp = [0.0] + [int(k[1:]) / 100 for k in row if k.startswith("p") and k[1:].isdigit()] + [1.0]
+        np.testing.assert_allclose(idx.lookup(values, row["feature"]), np.interp(values, xp, fp),
+                                   rtol=0, atol=1e-12)
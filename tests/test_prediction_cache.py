@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from aura.models import predict as p
+from aura.models.memo import PredictionMemo
+
+applicant = {"grade": "C", "term": "60 months", "acc_open_past_24mths": 4, "dti": 18, "fico_mid": 690}
+
+
+def _strip(bundle):
+    return {k: v for k, v in bundle.items() if k not in ("prediction_id", "timestamp")}
+
+
+@pytest.mark.parametrize("mode", ["sklearn", "compiled"])
+def test_repeat_requests_skip_scoring(isolated_prediction_memo, monkeypatch, mode):
+    memo = isolated_prediction_memo
+    monkeypatch.setattr(p, "scoring_mode", mode)
+    first = p.predict_with_explanations(applicant)
+
+    def boom(*args, **kwargs):
+        raise AssertionError("scoring should be skipped on a cache hit")
+    for name in ("engineer", "compiled_score", "local_shap"):
+        monkeypatch.setattr(p, name, boom)
+    same = {**applicant, "term": 60, "dti": 18.0, "grade": " c"}
+    second = p.predict_with_explanations(same)
+    assert _strip(second) == _strip(first)
+    assert second["prediction_id"] != first["prediction_id"]
+    second["top_local_shap"][0]["feature"] = "mutated"
+    assert p.predict_with_explanations(applicant)["top_local_shap"] == first["top_local_shap"]
+    assert memo.stats()["hits"] == 2 and memo.stats()["misses"] == 1
+
+
+def test_reloaded_artifacts_invalidate(isolated_prediction_memo, monkeypatch):
+    memo = isolated_prediction_memo
+    p.predict_with_explanations(applicant)
+    monkeypatch.setattr(p, "sur_cache", None)
+    monkeypatch.setattr(p, "attribution_cache", None)
+    p.predict_with_explanations(applicant)
+    stats = memo.stats()
+    assert stats["misses"] == 2 and stats["invalidations"] == 1 and stats["size"] == 1
+
+
+def test_lru_eviction_and_file_changes(tmp_path):
+    artifact = tmp_path / "surrogate.joblib"
+    artifact.write_bytes(b"v1")
+    memo = PredictionMemo(max_entries=2, paths=[artifact], check_interval=0)
+    state = (object(),)
+    for k in "abc":
+        memo.put(k, k.upper(), state)
+    assert memo.get("a", state) is None and memo.get("c", state) == "C"
+    assert memo.stats()["evictions"] == 1
+    artifact.write_bytes(b"v2-longer")
+    os.utime(artifact, ns=(0, 0))
+    assert memo.get("c", state) is None
+    assert memo.stats()["invalidations"] == 1 and memo.stats()["size"] == 0
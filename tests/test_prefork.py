@@ -0,0 +1,45 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+
+import httpx
+
+from aura.api.prefork import child_pids, memory_report, wait_healthy
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_memory_report_reads_proc():
+    report = memory_report(os.getpid())
+    assert report["processes"] >= 1
+    assert report["total"]["rss_mb"] > 0
+    assert report["total"]["pss_mb"] <= report["total"]["rss_mb"] + 1e-6
+
+
+def test_preforked_workers_share_socket_and_stop_cleanly(tmp_path):
+    port = _free_port()
+    env = {**os.environ, "metrics_dir": str(tmp_path / "metrics"), "shadow_challengers": "",
+           "prediction_log_path": str(tmp_path / "predictions.log"),
+           "explanation_log_path": str(tmp_path / "explanations.log"),
+           "shadow_log_path": str(tmp_path / "shadow.log"),
+           "explain_jobs_path": str(tmp_path / "explain_jobs.sqlite"),
+           "narrative_cache_path": str(tmp_path / "narrative_cache.sqlite"),
+           "rag_index_dir": str(tmp_path / "reg_index")}
+    proc = subprocess.Popen([sys.executable, "-m", "aura.app.main", "serve", "--host", "127.0.0.1",
+                             "--port", str(port), "--workers", "2", "--log-level", "warning"], env=env)
+    try:
+        wait_healthy(f"http://127.0.0.1:{port}", timeout=90)
+        assert len(child_pids(proc.pid)) == 2
+        payload = {"grade": "B", "term": 36, "acc_open_past_24mths": 2, "dti": 12.0, "fico_mid": 710}
+        for _ in range(4):
+            resp = httpx.post(f"http://127.0.0.1:{port}/predict", json=payload, timeout=30)
+            assert resp.status_code == 200
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=60) == 0
@@ -0,0 +1,83 @@
+import json
+import numpy as np
+
+from aura.rag import index as rag_mod
+from aura.rag.index import RegIndex, build_index, chunk_text
+from aura.app.config import rag_index_dir
+from aura.explain.explainer import build_user_prompt, narrative_cache_key
+from aura.utils.pathing import REG_INDEX_DIR
+
+
+def _docs(tmp_path):
+    docs = tmp_path / "reg_docs"
+    (docs / "ecoa").mkdir(parents=True)
+    (docs / "ecoa" / "adverse_action.md").write_text(
+        "A creditor must provide a statement of specific reasons for adverse action. "
+        "Principal reasons may include insufficient income or excessive obligations "
+        "relative to income, such as a high debt-to-income ratio.", encoding="utf-8")
+    (docs / "tila.txt").write_text(
+        "Disclosures must state the annual percentage rate, finance charge, and the "
+        "loan term and payment schedule before consummation.", encoding="utf-8")
+    return docs
+
+
+def test_chunk_text_overlaps():
+    words = " ".join(str(i) for i in range(10))
+    assert chunk_text(words, chunk_words=4, overlap=1) == ["0 1 2 3", "3 4 5 6", "6 7 8 9"]
+
+
+def test_build_and_search_index(tmp_path):
+    manifest = build_index(_docs(tmp_path), tmp_path / "idx", chunk_words=50, overlap=10)
+    assert manifest["n_passages"] == 2
+    idx = RegIndex(tmp_path / "idx", cache_size=2)
+    assert isinstance(idx.postings_weight, np.memmap)
+    hits = idx.search("debt-to-income ratio adverse action", k=2)
+    assert hits[0]["source"].endswith("adverse_action.md")
+    assert hits[0]["score"] >= hits[-1]["score"] > 0
+    assert idx.search("income ratio debt-to-income action adverse", k=2) == hits
+    assert idx.stats()["hits"] == 1
+    assert idx.search("zzz unknown", k=2) == []
+
+
+def _bundle():
+    return {
+        "risk_class": "High", "prob_default": 0.3, "threshold": 0.115,
+        "threshold_delta": 0.185, "near_threshold_band": 0.02, "threshold_policy": "profit",
+        "raw_input": {"dti": 38.0}, "timestamp": "t", "model_version": "v1",
+        "top_local_shap": [{"feature": "Debt-to-Income Ratio", "raw_feature_key": "dti",
+                            "applicant_value": 38.0, "direction": "↑ risk"}],
+    }
+
+
+def test_user_prompt_includes_snippets(tmp_path, monkeypatch):
+    build_index(_docs(tmp_path), tmp_path / "idx")
+    monkeypatch.setattr(rag_mod, "rag_index_dir", str(tmp_path / "idx"))
+    payload = json.loads(build_user_prompt(_bundle()))
+    assert payload["regulatory_context"][0]["source"].endswith("adverse_action.md")
+
+
+def test_narrative_cache_key_tracks_retrieved_passages(tmp_path, monkeypatch):
+    ungrounded = narrative_cache_key(_bundle())
+    docs = _docs(tmp_path)
+    build_index(docs, tmp_path / "idx")
+    monkeypatch.setattr(rag_mod, "rag_index_dir", str(tmp_path / "idx"))
+    grounded = narrative_cache_key(_bundle())
+    assert grounded != ungrounded and narrative_cache_key(_bundle()) == grounded
+    (docs / "ecoa" / "adverse_action.md").write_text(
+        "Adverse action notices must list the principal reasons, such as debt-to-income.",
+        encoding="utf-8")
+    build_index(docs, tmp_path / "idx")
+    assert narrative_cache_key(_bundle()) not in (grounded, ungrounded)
+
+
+def test_index_dir_does_not_depend_on_cwd():
+    assert rag_index_dir == str(REG_INDEX_DIR)
+
+
+def test_index_built_after_startup_is_picked_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_mod, "rag_index_check", 60.0)
+    assert rag_mod.retrieve_for_bundle(_bundle()) == []
+    build_index(_docs(tmp_path), tmp_path / "reg_index")
+    assert rag_mod.retrieve_for_bundle(_bundle()) == []
+    monkeypatch.setattr(rag_mod, "reg_index_checked", rag_mod.reg_index_checked - 61.0)
+    assert rag_mod.retrieve_for_bundle(_bundle())[0]["source"].endswith("adverse_action.md")
@@ -0,0 +1,94 @@
+import time
+from dataclasses import replace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from aura.api import server
+from aura.app import config as config_mod
+from aura.models import registry as registry_mod
+from aura.models.artifacts import build_bundle
+from aura.models.registry import ModelRegistry, VersionUnavailable
+
+applicant = {"grade": "B", "term": 36, "acc_open_past_24mths": 2, "dti": 12.0, "fico_mid": 710}
+
+
+@pytest.fixture(scope="module")
+def root(tmp_path_factory):
+    root = tmp_path_factory.mktemp("registry")
+    cfg = config_mod.get_threshold_config()
+    build_bundle(root / "v1", threshold_cfg=cfg)
+    build_bundle(root / "v2", threshold_cfg=replace(cfg, value=0.5, policy="manual"))
+    return root
+
+
+def test_load_pin_and_activate(root):
+    reg = ModelRegistry(root, poll_interval=0)
+    assert reg.available() == ["v1", "v2"]
+    reg.activate("v1")
+    reg.load("v2", wait=True)
+    with reg.acquire() as active, reg.acquire("v2") as pinned:
+        assert active.predict(applicant)["model_version"] == "v1"
+        bundle = pinned.predict(applicant)
+        assert bundle["model_version"] == "v2" and bundle["threshold"] == 0.5
+    reg.activate("v2")
+    with reg.acquire() as active:
+        assert active.model_version == "v2"
+    assert reg.versions["v1"].state == "unloaded"
+    with pytest.raises(VersionUnavailable):
+        with reg.acquire("v1"):
+            pass
+
+
+def test_previous_version_drains_before_unload(root):
+    reg = ModelRegistry(root, poll_interval=0)
+    reg.activate("v1")
+    with reg.acquire() as old:
+        reg.activate("v2")
+        assert reg.versions["v1"].state == "draining"
+        assert old.predict(applicant)["model_version"] == "v1"
+    assert reg.versions["v1"].state == "unloaded"
+    assert reg.versions["v1"].engine is None
+    with pytest.raises(VersionUnavailable, match="active"):
+        reg.unload("v2")
+
+
+def test_active_file_watch_switches_version(root):
+    reg = ModelRegistry(root, poll_interval=0.05)
+    reg.write_active("v1")
+    reg.start()
+    try:
+        assert reg.active.name == "v1"
+        reg.write_active("v2")
+        deadline = time.monotonic() + 30
+        while reg.active.name != "v2" and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert reg.active.name == "v2"
+    finally:
+        reg.close()
+        (root / "ACTIVE").unlink()
+
+
+def test_admin_endpoints_and_pinned_requests(root, monkeypatch):
+    monkeypatch.setattr(registry_mod, "model_registry_dir", str(root))
+    monkeypatch.setattr(registry_mod, "registry_cache", None)
+    monkeypatch.setattr(server, "admin_token", "secret")
+    auth = {"X-Admin-Token": "secret"}
+    with TestClient(server.app) as client:
+        assert client.get("/admin/models").status_code == 403
+        listing = client.get("/admin/models", headers=auth).json()
+        assert listing["active"] == config_mod.model_version == "v1"
+        assert client.post("/predict", json=applicant, params={"version": "v2"}).status_code == 409
+        assert client.post("/admin/models/v2/load", headers=auth).status_code == 202
+        assert client.post("/admin/models/v2/activate", headers=auth).json()["state"] == "ready"
+        active = client.post("/predict", json=applicant).json()
+        assert active["model_version"] == "v2" and active["threshold"] == 0.5
+        assert client.post("/predict", json=applicant, params={"version": "v1"}).status_code == 409
+        reg = registry_mod.get_model_registry()
+        reg.wait_ready(reg.load("v1"), timeout=30)
+        assert client.post("/predict", json=applicant, params={"version": "v1"}).json()["model_version"] == "v1"
+        assert client.post("/predict", json=applicant, params={"version": "v9"}).status_code == 422
+        assert client.post("/admin/models/v1/unload", headers=auth).json()["state"] == "unloaded"
+        assert client.post("/admin/models/v2/unload", headers=auth).status_code == 409
+    assert (root / "ACTIVE").read_text().strip() == "v2"
+    (root / "ACTIVE").unlink()
@@ -0,0 +1,74 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+from aura.models import shadow as shadow_mod
+from aura.models.engines import load_lgbm_engine
+from aura.models.predict import predict_with_explanations
+from aura.models.shadow import ShadowScorer, AgreementStats
+from aura.utils.audit import close_audit_logs
+from aura.api import server
+
+
+def test_agreement_stats():
+    s = AgreementStats()
+    s.update(0.02, True, True)
+    s.update(-0.10, True, False)
+    out = s.summary()
+    assert out["n"] == 2 and out["agreement_rate"] == 0.5
+    assert out["champion_high_challenger_low"] == 1
+    assert out["mean_pd_delta"] == pytest.approx(-0.04)
+    assert out["max_abs_pd_delta"] == pytest.approx(0.10)
+
+
+def test_shadow_scores_challengers_off_path(monkeypatch, isolated_audit_logs, valid_payload):
+    pytest.importorskip("lightgbm")
+    monkeypatch.setattr(shadow_mod, "shadow_challengers", ["surrogate", "lgbm", "nope"])
+    for grade in "ABC":
+        predict_with_explanations({**valid_payload, "grade": grade})
+    lgbm = load_lgbm_engine()
+    features = {**lgbm.benchmark_payloads(1)[0], **valid_payload, "term": " 36 months"}
+    champion = lgbm.predict_full_batch([features], max_reasons=0)[0]
+    shadow_mod.submit_shadow(features, champion, kind="full")
+    scorer = shadow_mod.get_shadow_scorer()
+    assert scorer.stats()["submitted"] == 4 and scorer.stats()["dropped"] == 0
+    shadow_mod.close_shadow_scorer()
+    close_audit_logs()
+    lines = [json.loads(l) for l in (isolated_audit_logs / "shadow.log").read_text().splitlines()]
+    assert len(lines) == 1 and lines[0]["kind"] == "full"
+    assert list(lines[0]["challengers"]) == ["surrogate"]
+    rec = lines[0]["challengers"]["surrogate"]
+    assert rec["pd_delta"] == pytest.approx(rec["prob_default"] - champion["prob_default"])
+    stats = scorer.stats()
+    assert stats["skipped"] == 3 and stats["processed"] == 1
+    assert stats["challengers"]["lgbm"]["errors"] == 0 and stats["challengers"]["lgbm"]["n"] == 0
+    assert stats["challengers"]["surrogate"]["n"] == 1 and "nope" in stats["unavailable"]
+
+
+def test_ui_traffic_is_not_queued_without_a_ui_challenger(monkeypatch, isolated_audit_logs,
+                                                          valid_payload):
+    monkeypatch.setattr(shadow_mod, "shadow_challengers", ["lgbm", "logreg"])
+    predict_with_explanations(valid_payload)
+    scorer = shadow_mod.get_shadow_scorer()
+    stats = scorer.stats()
+    assert stats["accepts"] == ["full"]
+    assert stats["skipped"] == 1 and stats["submitted"] == 0 and stats["queue_depth"] == 0
+    shadow_mod.close_shadow_scorer()
+    close_audit_logs()
+    assert not (isolated_audit_logs / "shadow.log").exists()
+
+
+def test_shadow_drops_instead_of_blocking(isolated_audit_logs):
+    scorer = ShadowScorer(["nope"], isolated_audit_logs / "shadow.log", max_queue=1)
+    scorer.close()
+    assert scorer.submit({"grade": "A"}, {"prob_default": 0.1}) is False
+    stats = scorer.stats()
+    assert stats["dropped"] == 1 and stats["submitted"] == 0
+
+
+def test_shadow_stats_endpoint(monkeypatch, valid_payload):
+    monkeypatch.setattr(shadow_mod, "shadow_challengers", ["surrogate"])
+    with TestClient(server.app) as client:
+        assert client.post("/predict", json=valid_payload).status_code == 200
+        body = client.get("/shadow/stats").json()
+    assert body["submitted"] >= 1 and body["dropped"] == 0
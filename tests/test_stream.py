@@ -0,0 +1,70 @@
+import json
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from aura.api import server
+from aura.explain import explainer as exp_mod
+
+
+class FakeStreamingClient:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        assert kwargs.get("stream") is True
+        pieces = self.pieces
+
+        async def gen():
+            for p in pieces:
+                delta = SimpleNamespace(content=p)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+        return gen()
+
+    async def close(self):
+        pass
+
+
+def _events(text):
+    out = []
+    for block in text.strip().split("\n\n"):
+        lines = block.splitlines()
+        event = lines[0][len("event: "):]
+        data = json.loads(lines[1][len("data: "):])
+        out.append((event, data))
+    return out
+
+
+def _stream(monkeypatch, valid_payload, pieces):
+    monkeypatch.setattr(exp_mod, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(exp_mod, "async_client", FakeStreamingClient(pieces))
+    monkeypatch.setattr(exp_mod, "init_async_llm", lambda *a, **k: None)
+    monkeypatch.setattr(exp_mod, "retry_delay", 0)
+    logged = []
+    monkeypatch.setattr(exp_mod, "save_explanation_log", logged.append)
+    client = TestClient(server.app)
+    r = client.post("/predict_explain/stream", json=valid_payload)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    return _events(r.text), logged
+
+
+def test_stream_emits_prediction_first_then_narrative(valid_payload, mock_model,
+                                                      mock_explainer, monkeypatch, llm_tier):
+    pieces = ["The applicant ", "presents ", "a High ", "risk profile."]
+    events, logged = _stream(monkeypatch, valid_payload, pieces)
+    assert events[0][0] == "prediction"
+    assert events[0][1]["risk_class"] == "High"
+    assert events[-1][0] == "done"
+    streamed = "".join(d["text"] for e, d in events if e == "narrative")
+    assert streamed == events[-1][1]["narrative"] == "".join(pieces)
+    assert logged[-1]["narrative"] == "".join(pieces)
+
+
+def test_stream_rejects_json_output(valid_payload, mock_model, mock_explainer, monkeypatch, llm_tier):
+    events, logged = _stream(monkeypatch, valid_payload, ['{"narrative": ', '"x"}'])
+    assert [e for e, _ in events] == ["prediction", "done"]
+    assert "error" in events[-1][1]
+    assert events[-1][1]["narrative"] == logged[-1]["narrative"]
+    assert "error" in logged[-1]
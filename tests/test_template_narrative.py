@@ -0,0 +1,62 @@
+import asyncio
+
+from aura.app.config import regulation_whitelist
+from aura.explain import explainer as exp_mod
+from aura.explain.template import render_narrative, review_sentence
+
+
+def _bundle(prob):
+    return {
+        "timestamp": "2025-01-01T00:00:00Z", "model_version": "v1",
+        "threshold_policy": "profit", "threshold": 0.115, "near_threshold_band": 0.02,
+        "prob_default": prob, "threshold_delta": prob - 0.115,
+        "risk_class": "High" if prob >= 0.115 else "Low",
+        "raw_input": {"grade": "C", "term": 60, "acc_open_past_24mths": 4, "dti": 18.0, "fico_mid": 690},
+        "engineered": {},
+        "top_local_shap": [
+            {"feature": "grade_term", "raw_feature_key": "grade_term", "applicant_value": "C_ 60 months",
+             "percentile": None, "direction": "↑ risk", "magnitude": "High"},
+            {"feature": "FICO Score", "raw_feature_key": "fico_mid", "applicant_value": 690,
+             "percentile": 48, "direction": "↑ risk", "magnitude": "Low"},
+            {"feature": "Debt-to-Income Ratio", "raw_feature_key": "dti", "applicant_value": 18.25,
+             "percentile": 51, "direction": "↓ risk", "magnitude": "Moderate"},
+        ],
+    }
+
+
+def test_render_covers_decision_factors_and_citation():
+    text = render_narrative(_bundle(0.382))
+    assert text == render_narrative(_bundle(0.382))
+    assert text.startswith("The estimated probability of default is 38.2% against a decision "
+                           "threshold of 11.5% (profit policy), 26.7 pp above the threshold")
+    assert "**Loan Grade and Term**: grade C, 60-month term, ↑ risk, High magnitude" in text
+    assert "**FICO Score**: 690, 48th pct, ↑ risk, Low magnitude" in text
+    assert "**Debt-to-Income Ratio**: 18.25, 51st pct, ↓ risk, Moderate magnitude" in text
+    assert f"[{regulation_whitelist[0]}]" in text and "Adverse Action" in text
+    assert review_sentence in text and text.endswith("(Model version: v1)")
+    assert "grade_term" not in text and "shap" not in text.lower()
+
+    low = render_narrative(_bundle(0.10))
+    assert "1.5 pp below the threshold" in low and "(borderline)" in low
+    assert "Adverse Action" not in low
+
+
+def test_only_near_threshold_cases_reach_the_llm(monkeypatch):
+    calls, logged = [], []
+    monkeypatch.setattr(exp_mod, "call_llm", lambda prompt, **kw: calls.append(prompt) or "LLM narrative.")
+    monkeypatch.setattr(exp_mod, "save_explanation_log", logged.append)
+
+    far = exp_mod.generate_explanation(_bundle(0.382))
+    assert far == {"narrative": render_narrative(_bundle(0.382))}
+    assert not calls and logged[-1]["tier"] == "template"
+
+    near = exp_mod.generate_explanation(_bundle(0.125))
+    assert near == {"narrative": "LLM narrative."}
+    assert len(calls) == 1 and logged[-1]["tier"] == "llm"
+
+    async def stream():
+        return [e async for e in exp_mod.astream_explanation(_bundle(0.03))]
+    events = asyncio.run(stream())
+    assert [e["event"] for e in events] == ["narrative", "done"]
+    assert events[1]["narrative"] == events[0]["text"] == render_narrative(_bundle(0.03))
+    assert len(calls) == 1
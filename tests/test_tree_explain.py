@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("lightgbm")
+
+from aura.models.engines import load_lgbm_engine, load_shap_topidx
+from aura.models.tree_explain import build_tree_explainer, lgbm_raw_feature, other_group
+
+
+def _full_rows(engine, n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(n, len(engine.feature_names)))
+    for j, levels in engine.categories.items():
+        x[:, j] = rng.integers(0, len(levels), n)
+    return x
+
+
+def test_lgbm_raw_feature_mapping():
+    assert lgbm_raw_feature("dti_inv") == "dti"
+    assert lgbm_raw_feature("fico_mid_sq") == "fico_mid"
+    assert lgbm_raw_feature("grade") == "grade_term"
+    assert lgbm_raw_feature("next_pymnt_d_missing") == "next_pymnt_d"
+
+
+def test_complete_rows_sum_to_raw_score():
+    engine = load_lgbm_engine()
+    x = _full_rows(engine, 5)
+    known = np.ones(x.shape, dtype=bool)
+    base = engine.trees.expected_raw(x, np.zeros_like(known))
+    for topk in (0, 10):
+        explainer = build_tree_explainer(engine.booster, load_shap_topidx(), topk=topk)
+        contrib = explainer.explain(x)
+        np.testing.assert_allclose([sum(c.values()) for c in contrib], engine.raw_score(x) - base,
+                                   rtol=0, atol=1e-9)
+        if topk:
+            assert all(len(c) <= topk + 1 and other_group in c for c in contrib)
+
+
+def test_lgbm_bundle_has_reasons():
+    engine = load_lgbm_engine()
+    bundle = engine.predict_full_batch(engine.benchmark_payloads(1), max_reasons=2)[0]
+    reasons = bundle["top_local_shap"]
+    assert len([r for r in reasons if r["raw_feature_key"] != other_group]) == 2
+    assert reasons[-1]["raw_feature_key"] == other_group
+    for r in reasons:
+        assert r["direction"] == ("↑ risk" if r["shap_contribution"] > 0 else "↓ risk")
+        assert r["magnitude"] in ("High", "Moderate", "Low")
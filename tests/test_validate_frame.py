@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from aura.app.config import InputError, ui_features, validate_frame, validate_one
+from aura.models.bulk import iter_input_chunks
+
+base = {"grade": "A", "term": 36, "acc_open_past_24mths": 1, "dti": 1.0, "fico_mid": 700}
+samples = {
+    "grade": ["A", " b ", "g", "H", "", None, float("nan"), 1, "AA", "c\n", True, 2.5],
+    "term": [36, 60, "36 months", " 60 ", "60months", "", None, 36.0, "036", "+60", "1_0",
+             True, 2**70, float("nan"), 48, np.int64(60), "abc", "٣٦"],
+    "acc_open_past_24mths": [0, 3, -1, "4", " 5 ", "2.5", 2.7, -0.5, float("nan"), float("inf"),
+                             None, "", "abc", True, 2**70, -2**70, 1e30, "-0", np.float64(3.9)],
+    "dti": [0, 15, -1, 15.2, "15", " 15.2 ", "1e3", "nan", "-inf", float("nan"), -0.0, None, "",
+            "abc", "1_000.5", ".5", True, 10**400, np.float64(-2.0)],
+    "fico_mid": [300, 850, 299, 851, "700", " 720 ", "700.0", 700.9, float("nan"), None, "x",
+                 2**70, "0700", -0.0, 1e30],
+}
+
+
+def _expected(feature, value):
+    try:
+        return "ok", validate_one(feature, value)
+    except InputError as e:
+        return "error", str(e)
+
+
+def _frames(feature, values):
+    yield pd.DataFrame({f: pd.Series([v if f == feature else base[f] for v in values], dtype=object)
+                        for f in ui_features})
+    for kind in (int, float):
+        typed = [v for v in values if type(v) is float or (type(v) is int and abs(v) < 2**62)]
+        arr = np.array([v for v in typed if kind is float or type(v) is int], dtype=kind)
+        yield pd.DataFrame({f: arr if f == feature else np.repeat(base[f], len(arr)) for f in ui_features})
+
+
+@pytest.mark.parametrize("feature", list(samples))
+def test_agrees_with_validate_one(feature):
+    for frame in _frames(feature, samples[feature]):
+        clean, report = validate_frame(frame)
+        errors = report[report["field"] == feature].set_index("row")["error"]
+        for i, value in enumerate(frame[feature]):
+            kind, expected = _expected(feature, value)
+            if kind == "error":
+                assert errors.get(i) == expected, (value, frame[feature].dtype)
+            else:
+                got = clean.loc[i, feature]
+                assert i not in errors.index
+                assert got == expected or (math.isnan(expected) and math.isnan(got)), value
+
+
+def test_report_lists_every_failing_field():
+    frame = pd.DataFrame([base, {"grade": "Z", "term": "48 months", "acc_open_past_24mths": 2,
+                                 "dti": -1, "fico_mid": 900}, base], index=[10, 11, 12])
+    clean, report = validate_frame(frame)
+    assert clean.index.tolist() == [10, 12]
+    assert clean.dtypes[["term", "acc_open_past_24mths", "fico_mid"]].tolist() == [np.int64] * 3
+    assert report["row"].tolist() == [11] * 4
+    assert report["field"].tolist() == ["grade", "term", "dti", "fico_mid"]
+    assert report["error"].iloc[1] == "Term must be 36 or 60. Got '48'"
+
+    clean, report = validate_frame(frame.drop(columns="dti").assign(zip_code="123"))
+    assert clean.empty
+    assert report.groupby("row").size().tolist() == [2, 5, 2]
+    assert {"Missing required features: ['dti']", "Unexpected feature 'zip_code'"} <= set(report["error"])
+    _, report = validate_frame(frame.assign(zip_code="123"), allow_extra=True)
+    assert set(report["field"]) == {"grade", "term", "dti", "fico_mid"}
+
+
+def test_parquet_nulls_are_validated_as_none(tmp_path):
+    rows = [base, dict(base, dti=None), dict(base, fico_mid=None)]
+    pq.write_table(pa.Table.from_pylist(rows), tmp_path / "in.parquet")
+    frame = next(iter_input_chunks(tmp_path / "in.parquet"))
+    _, report = validate_frame(frame)
+    assert report["error"].tolist() == [_expected("dti", None)[1], _expected("fico_mid", None)[1]]
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from aura.api import server
+from aura.app.config import ui_features, validate_ui_payload
+from aura.models import predict as p
+from aura.models.whatif import what_if
+
+applicant = {"grade": "A", "term": 36, "acc_open_past_24mths": 2, "dti": 10.0, "fico_mid": 760}
+
+
+def test_curves_match_surrogate_and_flip_is_minimal():
+    out = what_if(validate_ui_payload(applicant))
+    assert out["risk_class"] == "Low"
+    curve = out["curves"]["fico_mid"]
+    assert curve["values"][0] == 300 and curve["values"][-1] == 850
+    rows = [{**applicant, "fico_mid": v} for v in curve["values"][::50]]
+    expected = p.load_sur().predict_proba(p.engineer(pd.DataFrame(rows, columns=ui_features)))[:, 1]
+    np.testing.assert_allclose(curve["prob_default"][::50], expected, atol=1e-9)
+
+    flip = out["flips"]["fico_mid"]
+    assert flip["to"] < applicant["fico_mid"] and flip["risk_class"] == "High"
+    probs = dict(zip(curve["values"], curve["prob_default"]))
+    assert all(probs[v] < out["threshold"] for v in range(flip["to"] + 1, applicant["fico_mid"] + 1))
+    assert out["flips"]["grade"]["to"] == "B"
+    assert out["minimal_flip"] == min((f for f in out["flips"].values() if f),
+                                      key=lambda f: f["relative_change"])
+
+
+def test_what_if_endpoint():
+    with TestClient(server.app) as client:
+        resp = client.post("/what_if", json={"applicant": applicant, "features": ["dti", "fico_mid"],
+                                             "ranges": {"dti": [0, 40, 0.5]}})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert set(body["curves"]) == {"dti", "fico_mid"}
+        assert len(body["curves"]["dti"]["values"]) == 81
+        assert body["minimal_flip"]["feature"] == "fico_mid"
+        assert client.post("/what_if", json={"applicant": applicant, "features": ["income"]}).status_code == 422
+        bad = {"applicant": applicant, "ranges": {"fico_mid": [200, 900, 1]}}
+        assert client.post("/what_if", json=bad).status_code == 422